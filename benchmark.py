@@ -0,0 +1,375 @@
+"""
+Day-Night Transition Simulation
+Benchmarks for the per-frame Python hot paths, run without a display
+
+Simulation updates and entity draws are timed against a CountingBackend,
+which accepts draw calls without drawing, at several multiples of the
+configured star, firefly, cloud and snowflake counts. Results are written
+as JSON. The stored baseline holds only the deterministic draw-call and
+vertex counts, which --check gates on; timings are machine-specific and
+are compared, for information only, against an earlier run's JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.scene import Scene
+from src.render import CountingBackend
+from src.config import GL_CALL_BUDGETS
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+# Slowdown (current / earlier) reported as slower in timing comparisons
+DEFAULT_THRESHOLD = 1.25
+# Slowdowns smaller than this many microseconds per call are timer noise
+DEFAULT_MIN_DELTA_US = 20.0
+# Deterministic per-call counts stored in the baseline and gated on
+COUNTS = ("draw_calls", "vertices")
+# Benchmark scenes: a summer morning and a winter evening, each far enough
+# from the end of its arc that timing loops stay in the same part of the cycle
+DAY_HOUR = 10
+NIGHT_HOUR = 20
+# Modules whose import time is measured; all but the GL backend must import
+# without loading PyOpenGL
+IMPORT_MODULES = (
+    "src.config", "src.lighting", "src.scene", "src.render", "src.offscreen",
+    "src.timelapse", "src.render.gl",
+)
+GL_MODULES = ("src.render.gl",)
+
+
+def parse_scales(text):
+    """Parse a comma-separated list of count multipliers"""
+    try:
+        scales = [float(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected comma-separated numbers, got {text!r}")
+    return scales
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark simulation and draw hot paths")
+    parser.add_argument("--scales", type=parse_scales, default=[1.0, 4.0, 16.0],
+                        help="Multipliers for STAR/FIREFLY/CLOUD/SNOWFLAKE_COUNT (default 1,4,16)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timing repeats; the fastest is kept (default 3)")
+    parser.add_argument("--filter", default="",
+                        help="Only run benchmarks whose name contains this text")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help=f"Baseline of draw-call and vertex counts (default {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these counts as the new baseline")
+    parser.add_argument("--timings",
+                        help="Earlier -o output from this machine to compare timings against "
+                             "(advisory; never fails --check)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Timing ratio reported as slower (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA_US,
+                        help="Smallest slowdown in microseconds per call reported as slower "
+                             f"(default {DEFAULT_MIN_DELTA_US:g})")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if draw-call or vertex counts grew, a GL "
+                             "call budget is exceeded or a GL-free module loads OpenGL")
+    return parser
+
+
+def measure(func, repeat, setup=None):
+    """Fastest mean time per call of func, in seconds
+
+    setup, if given, runs before every timing loop (outside the timing).
+    """
+    timer = timeit.Timer(func, setup or (lambda: None))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def cases(scale):
+    """(name, callable, backend or None, setup or None) for every benchmark
+
+    Draw cases use a summer morning (sun, clouds, shadows) and a winter
+    night (moon, stars, fireflies, snowfall) that are never advanced.
+    Simulation cases run copies of those scenes, seeked back to their start
+    before every timing loop so they stay in the same part of the cycle.
+    """
+    def scenes():
+        return (Scene(hour=DAY_HOUR, season="summer", seed=0, particle_scale=scale),
+                Scene(hour=NIGHT_HOUR, season="winter", seed=0, particle_scale=scale))
+
+    day, night = scenes()
+    day_sim, night_sim = scenes()
+    toggled = Scene(hour=12, seed=0, particle_scale=scale)
+    backend = CountingBackend()
+
+    def draws(name, draw):
+        return name, draw, backend, None
+
+    def day_update(name, update):
+        return name, update, None, lambda: day_sim.seek(DAY_HOUR)
+
+    def night_update(name, update):
+        return name, update, None, lambda: night_sim.seek(NIGHT_HOUR)
+
+    def draw_clouds():
+        for cloud in day.clouds:
+            cloud.draw(backend)
+
+    def update_clouds():
+        for cloud in day_sim.clouds:
+            cloud.update()
+
+    return [
+        day_update("scene.time_elapse[day]", day_sim.time_elapse),
+        night_update("scene.time_elapse[night]", night_sim.time_elapse),
+        draws("scene.render[day]", lambda: day.render(backend)),
+        draws("scene.render[night]", lambda: night.render(backend)),
+        draws("background.draw", lambda: day.background.draw(backend)),
+        draws("ground.draw", lambda: night.ground.draw(backend)),
+        draws("sun.draw", lambda: day.sun.draw(backend)),
+        draws("moon.draw", lambda: night.moon.draw(backend)),
+        draws("stars.draw", lambda: night.stars.draw(backend)),
+        draws("clouds.draw", draw_clouds),
+        draws("snowfall.draw", lambda: night.snowfall.draw(backend)),
+        draws("fireflies.draw", lambda: night.fireflies.draw(backend)),
+        draws("tree.draw", lambda: day.tree.draw(backend, day.sun)),
+        draws("house.draw", lambda: day.house.draw(backend, day.sun)),
+        night_update("snowfall.update", night_sim.snowfall.update),
+        night_update("fireflies.fly", night_sim.fireflies.fly),
+        night_update("stars.twinkle", night_sim.stars.twinkle),
+        day_update("clouds.update", update_clouds),
+        ("scene.toggle_season", toggled.toggle_season, None, None),
+    ]
+
+
+def run(scales, repeat, name_filter=""):
+    """Time every benchmark at every scale
+
+    Returns:
+        {name@scale: {"us": microseconds per call, and for draw benchmarks
+        "draw_calls" and "vertices" issued per call}}
+    """
+    results = {}
+    for scale in scales:
+        for name, func, backend, setup in cases(scale):
+            key = f"{name}@{scale:g}x"
+            if name_filter not in key:
+                continue
+            entry = {"us": measure(func, repeat, setup) * 1e6}
+            if backend is not None:
+                backend.reset()
+                func()
+                entry["draw_calls"] = backend.total_calls
+                entry["vertices"] = sum(backend.vertices.values())
+            results[key] = entry
+            print(f"{key:<36} {entry['us']:>10.1f} us", flush=True)
+    return results
+
+
+def gl_call_counts():
+    """GL calls of a steady-state frame per budgeted scenario
+
+    Frames go through the window's CommandBuffer(GLBackend()) path with
+    GL recorded by GLCallRecorder, so the counts need no context and are
+    identical on every machine.
+    """
+    from src.render.commands import CommandBuffer
+    from src.render.gl import GLBackend
+    from src.render.recorder import GLCallRecorder
+
+    scenarios = {
+        "summer day": Scene(hour=DAY_HOUR, season="summer", seed=0),
+        "winter night": Scene(hour=NIGHT_HOUR, season="winter", seed=0),
+    }
+    counts = {}
+    recorder = GLCallRecorder()
+    with recorder.installed():
+        for name, scene in scenarios.items():
+            backend = CommandBuffer(GLBackend())
+            # The first frame builds the cached layers and HUD
+            recorder.record_frame(scene, backend)
+            recorder.record_frame(scene, backend)
+            counts[name] = {"gl_calls": recorder.total, "by_entity": dict(recorder.by_owner())}
+    return counts
+
+
+def import_time(module, repeat):
+    """Fastest cold import of a module in a fresh interpreter
+
+    Returns:
+        {"ms": cumulative import time, "opengl": whether PyOpenGL was loaded}
+
+    Raises:
+        RuntimeError: if -X importtime did not report the module
+    """
+    code = f"import sys, {module}; print('OpenGL' in sys.modules)"
+    best = None
+    for _ in range(repeat):
+        done = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              capture_output=True, text=True, check=True)
+        # Lines read "import time: self [us] | cumulative | <indented name>"
+        cumulative = None
+        for line in done.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1]) / 1000
+        if cumulative is None:
+            raise RuntimeError(f"-X importtime reported no import of {module}")
+        best = cumulative if best is None else min(best, cumulative)
+    return {"ms": best, "opengl": done.stdout.strip() == "True"}
+
+
+def import_times(repeat):
+    """Import time of every module in IMPORT_MODULES, printed as it goes"""
+    print(f"\n{'import':<36} {'ms':>10}  OpenGL")
+    times = {}
+    for module in IMPORT_MODULES:
+        times[module] = entry = import_time(module, repeat)
+        print(f"{module:<36} {entry['ms']:>10.1f}  {'yes' if entry['opengl'] else 'no'}")
+    return times
+
+
+def check_budgets(counts, budgets):
+    """Print GL calls against their budgets; return the scenarios over budget"""
+    over = []
+    print(f"\n{'GL calls per frame':<36} {'budget':>10} {'calls':>10}")
+    for name, entry in counts.items():
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and entry["gl_calls"] > budget:
+            flag = "  OVER BUDGET"
+            over.append(name)
+        print(f"{name:<36} {budget if budget is not None else '-':>10} {entry['gl_calls']:>10}{flag}")
+    return over
+
+
+def compare_counts(results, baseline):
+    """Print draw-call and vertex counts against the baseline
+
+    Counts depend only on the code, never on the machine, so any growth is
+    a real change in the work a frame does.
+
+    Returns:
+        Names of the benchmarks whose counts grew
+    """
+    grown = []
+    print(f"\n{'counts per call':<36} {'baseline':>17} {'current':>17}")
+    for key, entry in results.items():
+        if "draw_calls" not in entry:
+            continue
+        current = tuple(entry[name] for name in COUNTS)
+        before = baseline.get(key)
+        if before is None:
+            print(f"{key:<36} {'-':>17} {'%d / %d' % current:>17}")
+            continue
+        before = tuple(before[name] for name in COUNTS)
+        flag = ""
+        if any(now > then for now, then in zip(current, before)):
+            flag = "  GREW"
+            grown.append(key)
+        elif current != before:
+            flag = "  fewer; update the baseline"
+        print(f"{key:<36} {'%d / %d' % before:>17} {'%d / %d' % current:>17}{flag}")
+    return grown
+
+
+def compare_times(results, earlier, threshold, min_delta):
+    """Print current vs earlier times, for information only
+
+    A benchmark is only called slower when it is both `threshold` times
+    and `min_delta` microseconds slower per call, so that timer noise in
+    the microsecond-scale draws is not mistaken for a regression.
+
+    Returns:
+        Names of the benchmarks reported as slower
+    """
+    slower = []
+    print(f"\n{'timing (us)':<36} {'earlier':>10} {'current':>10} {'ratio':>7}")
+    for key, entry in results.items():
+        before = earlier.get(key)
+        if before is None or "us" not in before:
+            print(f"{key:<36} {'-':>10} {entry['us']:>10.1f}")
+            continue
+        ratio = entry["us"] / before["us"]
+        flag = ""
+        if ratio > threshold and entry["us"] - before["us"] > min_delta:
+            flag = "  slower"
+            slower.append(key)
+        elif ratio < 1 / threshold and before["us"] - entry["us"] > min_delta:
+            flag = "  faster"
+        print(f"{key:<36} {before['us']:>10.1f} {entry['us']:>10.1f} {ratio:>7.2f}{flag}")
+    return slower
+
+
+def metadata():
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def write_json(path, report):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    """Entry point for the benchmark suite"""
+    args = build_parser().parse_args()
+    results = run(args.scales, args.repeat, args.filter)
+    gl_calls = gl_call_counts()
+    over_budget = check_budgets(gl_calls, GL_CALL_BUDGETS)
+    imports = import_times(args.repeat)
+    gl_imports = [m for m, entry in imports.items() if entry["opengl"] and m not in GL_MODULES]
+
+    if args.output:
+        write_json(args.output, {"meta": metadata(), "benchmarks": results,
+                                 "gl_calls": gl_calls, "imports": imports})
+        print(f"\nWrote {args.output}")
+    if args.save_baseline:
+        # Only what is identical on every machine; timings stay out of the repo
+        counts = {key: {name: entry[name] for name in COUNTS}
+                  for key, entry in results.items() if "draw_calls" in entry}
+        write_json(args.baseline, {"benchmarks": counts, "gl_calls": gl_calls})
+        print(f"\nStored baseline in {args.baseline}")
+        return
+
+    if args.timings:
+        with open(args.timings, encoding="utf-8") as f:
+            slower = compare_times(results, json.load(f)["benchmarks"], args.threshold,
+                                   args.min_delta)
+        if slower:
+            print(f"\n{len(slower)} benchmark(s) slower than {args.timings} "
+                  f"(advisory; rerun with a higher --repeat to confirm)")
+
+    grown = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        grown = compare_counts(results, baseline)
+        if grown:
+            print(f"\n{len(grown)} benchmark(s) issue more draw calls or vertices than the baseline")
+    else:
+        print(f"\nNo baseline at {args.baseline}; store one with --save-baseline")
+    if over_budget:
+        print(f"\n{len(over_budget)} scenario(s) over their GL call budget")
+    if gl_imports:
+        print(f"\nOpenGL is loaded by importing {', '.join(gl_imports)}")
+    if args.check and (grown or over_budget or gl_imports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
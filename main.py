@@ -2,39 +2,99 @@
 Day-Night Transition Simulation
 Main entry point for the OpenGL application
 """
+import argparse
+from time import perf_counter
+
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 
 from src.scene import Scene
-from src.config import WINDOW_SIZE, WINDOW_POSITION, WINDOW_TITLE
+from src.trace import FrameTracer, NULL_TRACER
+from src.quality import QualityGovernor
+from src.framecache import Playback
+from src.render.commands import CommandBuffer
+from src.render.gl import GLBackend, RenderTarget
+from src.config import (
+    WINDOW_SIZE, WINDOW_POSITION, WINDOW_TITLE, TARGET_FPS, HUD_FPS_INTERVAL, TRACE_FRAMES,
+    QUALITY, QUALITY_PRESETS, ADAPTIVE_QUALITY, RENDER_SCALE, KEEP_ASPECT,
+)
+
+
+def fit_viewport(window, scene, keep_aspect=KEEP_ASPECT):
+    """Viewport (x, y, width, height) showing the scene in a window
+
+    With keep_aspect the scene is scaled uniformly and centred, leaving
+    bars on two sides; otherwise it is stretched over the whole window.
+    """
+    width, height = window
+    if not keep_aspect:
+        return 0, 0, width, height
+    scale = min(width / scene[0], height / scene[1])
+    fit_w, fit_h = round(scene[0] * scale), round(scene[1] * scale)
+    return (width - fit_w) // 2, (height - fit_h) // 2, fit_w, fit_h
 
 
 class Application:
     """OpenGL Application for Day-Night Simulation"""
     
-    def __init__(self, window_size=WINDOW_SIZE, window_position=WINDOW_POSITION, hour=12):
+    def __init__(self, window_size=WINDOW_SIZE, window_position=WINDOW_POSITION, hour=12,
+                 target_fps=TARGET_FPS, trace=None, trace_frames=TRACE_FRAMES,
+                 quality=QUALITY, adaptive_quality=ADAPTIVE_QUALITY,
+                 render_scale=RENDER_SCALE, keep_aspect=KEEP_ASPECT, playback=False):
         """Initialize application with window settings
         
         Args:
             window_size: Window dimensions (width, height)
             window_position: Window position (x, y)
             hour: Initial hour to display (0-23)
+            target_fps: Frames per second the scheduler paces redraws to
+            trace: Optional path of a Chrome trace-event JSON file to record
+            trace_frames: Number of frames to trace before writing the file
+            quality: Starting preset from QUALITY_PRESETS
+            adaptive_quality: Step between presets to keep frames within budget
+            render_scale: Internal resolution as a fraction of the window's
+            keep_aspect: Letterbox the scene instead of stretching it
+            playback: Show the precomputed frame cache instead of simulating
         """
         self.window_size = window_size
         self.window_position = window_position
         self.scene = None
+        self.renderer = None
         self.initial_hour = hour
         self.time_input_buffer = ""  # Buffer for two-digit time input
+        self.frame_interval = 1.0 / target_fps
+        self._next_frame = None
+        self._timer_armed = False
+        # Frames drawn since the FPS figure was last updated, and when
+        self._fps_frames = 0
+        self._fps_since = None
+        self.trace = trace
+        self.trace_frames = trace_frames
+        self.quality = quality
+        self.adaptive_quality = adaptive_quality
+        self.governor = None
+        self.render_scale = render_scale
+        self.keep_aspect = keep_aspect
+        # Offscreen target for render_scale < 1, created with the window
+        self.target = None
+        self.playback = playback
 
     
     def refresh_2d(self, width, height):
-        """Set up 2D orthographic projection"""
-        glViewport(0, 0, width, height)
+        """Set up a 2D projection fitting the scene into a width x height window"""
+        scene_width, scene_height = WINDOW_SIZE
+        glViewport(*fit_viewport((width, height), WINDOW_SIZE, self.keep_aspect))
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        glOrtho(0.0, width, height, 0, 0.0, 1.0)
+        # Scene coordinates stay in WINDOW_SIZE pixels whatever the window size
+        glOrtho(0.0, scene_width, scene_height, 0, 0.0, 1.0)
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
+
+    def reshape(self, width, height):
+        """Window resize callback: refit the projection; the scene is untouched"""
+        self.window_size = (width, height)
+        self.refresh_2d(width, height)
     
     def keyboard(self, key, x, y):
         """Handle keyboard input"""
@@ -46,12 +106,16 @@ class Application:
             print("="*50)
           
             print("S - Toggle season (summer/winter)")
+            print("P - Pause/resume the day-night cycle")
             print("00-23 - Jump to hour (type 2 digits: 00=midnight, 06=sunrise, 12=noon, 18=sunset, 23=late night)")
             print("="*50 + "\n")
         elif key == b's' or key == b'S':
             # Toggle season in the scene
             self.scene.toggle_season()
             print(f"\r✓ Season toggled. Now: {self.scene.season.capitalize()}")
+        elif key == b'p' or key == b'P':
+            paused = self.scene.toggle_pause()
+            print(f"\r✓ Simulation {'paused' if paused else 'resumed'}")
         elif key == b'\r' or key == b'\n':  # Enter key - process buffer
             if self.time_input_buffer:
                 self._process_time_input()
@@ -66,6 +130,9 @@ class Application:
             # Auto-process when we have 2 digits
             if len(self.time_input_buffer) == 2:
                 self._process_time_input()
+        
+        # Input may have changed the scene; make sure a frame is on its way
+        self._schedule_frame()
     
     def _process_time_input(self):
         """Process the buffered time input"""
@@ -92,28 +159,102 @@ class Application:
     
     def draw(self):
         """Main drawing callback"""
+        start = perf_counter()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
-        self.refresh_2d(*self.window_size)
-        self.scene.draw()
-        glutSwapBuffers()
+        if self.target is None:
+            self.scene.draw(self.renderer)
+        else:
+            self.target.begin()
+            glClear(GL_COLOR_BUFFER_BIT)
+            self.scene.draw(self.renderer, hud=False)
+            self.target.present()
+            self.scene.render_hud(self.renderer)
+        # Swapping waits for vsync, so only the work before it is budgeted
+        if self.governor is not None:
+            changed = self.governor.record(perf_counter() - start)
+            if changed:
+                print(f"\r✓ Quality: {changed}")
+        with self.scene.tracer.span("swap", "render"):
+            glutSwapBuffers()
+        self._count_frame()
+        if self.scene.tracer.finished:
+            print(f"\r✓ Trace of {self.scene.tracer.frame_count} frames written to {self.trace}")
+            self.scene.tracer = NULL_TRACER
+    
+    def _count_frame(self):
+        """Update the scene's FPS figure every HUD_FPS_INTERVAL seconds
+        
+        Refreshing it at a fixed interval, rather than every frame, keeps
+        the HUD text (and so its cached overlay) unchanged in between.
+        """
+        now = perf_counter()
+        if self._fps_since is None:
+            self._fps_since = now
+            return
+        self._fps_frames += 1
+        elapsed = now - self._fps_since
+        if elapsed >= HUD_FPS_INTERVAL:
+            self.scene.fps = self._fps_frames / elapsed
+            self._fps_frames = 0
+            self._fps_since = now
+    
+    def _schedule_frame(self):
+        """Arm the frame timer for the next frame deadline
+        
+        GLUT sleeps in its event loop until the timer fires, so pacing costs
+        no CPU. If we fell more than a frame behind, the schedule restarts
+        from now instead of bursting to catch up.
+        """
+        if self._timer_armed:
+            return
+        now = perf_counter()
+        if self._next_frame is None or self._next_frame < now - self.frame_interval:
+            self._next_frame = now
+        delay_ms = max(0, int((self._next_frame - now) * 1000))
+        self._timer_armed = True
+        glutTimerFunc(delay_ms, self._on_frame_timer, 0)
+    
+    def _on_frame_timer(self, value):
+        """Frame timer callback: redraw if needed and re-arm the timer
+        
+        A paused scene with nothing new to show lets the timer lapse; the
+        next keyboard event re-arms it.
+        """
+        self._timer_armed = False
+        if self.scene.needs_redraw:
+            glutPostRedisplay()
+            self._next_frame += self.frame_interval
+            self._schedule_frame()
     
     def run(self):
         """Initialize GLUT and start main loop"""
         # Create scene with initial hour
-        self.scene = Scene(hour=self.initial_hour)
+        if self.playback:
+            # Cached frames stand in for the simulation; they have no presets
+            self.scene = Playback(hour=self.initial_hour)
+        else:
+            self.scene = Scene(hour=self.initial_hour, quality=self.quality)
+        if self.adaptive_quality and not self.playback:
+            self.governor = QualityGovernor(self.scene, budget=self.frame_interval)
+        if self.trace:
+            self.scene.tracer = FrameTracer(self.trace, self.trace_frames)
         
         # Initialize GLUT
         glutInit()
-        glutInitDisplayMode(GLUT_RGBA | GLUT_DEPTH)
+        glutInitDisplayMode(GLUT_RGBA | GLUT_DOUBLE | GLUT_DEPTH)
         glutInitWindowSize(*self.window_size)
         glutInitWindowPosition(*self.window_position)
         glutCreateWindow(WINDOW_TITLE)
+        self.renderer = CommandBuffer(GLBackend())
+        if self.render_scale < 1:
+            self.target = RenderTarget(self.render_scale)
         
         # Register callbacks
+        glutReshapeFunc(self.reshape)
         glutDisplayFunc(self.draw)
-        glutIdleFunc(self.draw)
         glutKeyboardFunc(self.keyboard)
+        self._schedule_frame()
         
         # Convert to 12-hour format for display
         hour_12 = self.initial_hour % 12 or 12
@@ -127,6 +268,7 @@ class Application:
         print("\nPress a key while the window is active:")
        
         print("  S - Toggle season (summer/winter)")
+        print("  P - Pause/resume the day-night cycle")
         print("  00-23 - Type 2 digits to jump to hour")
         
         print("="*50 + "\n")
@@ -153,8 +295,44 @@ def get_user_time():
             print("Invalid input. Please enter a valid number.")
 
 
+def parse_render_scale(text):
+    """Parse an internal render scale in (0, 1]"""
+    try:
+        scale = float(text)
+    except ValueError:
+        scale = None
+    if scale is None or not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError(f"Expected a scale in (0, 1], got {text!r}")
+    return scale
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Day-night transition simulation")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record per-entity frame timings to a Chrome trace-event JSON "
+                             "file (open in Perfetto or chrome://tracing)")
+    parser.add_argument("--trace-frames", type=int, default=TRACE_FRAMES, metavar="N",
+                        help=f"Number of frames to trace (default {TRACE_FRAMES})")
+    parser.add_argument("--quality", choices=list(QUALITY_PRESETS), default=QUALITY,
+                        help=f"Starting quality preset (default {QUALITY})")
+    parser.add_argument("--fixed-quality", dest="adaptive_quality", action="store_false",
+                        default=ADAPTIVE_QUALITY,
+                        help="Keep the starting preset instead of adapting it to the frame time")
+    parser.add_argument("--render-scale", type=parse_render_scale, default=RENDER_SCALE, metavar="S",
+                        help="Render the scene at S times the window resolution and upscale "
+                             f"it (0 < S <= 1, default {RENDER_SCALE:g})")
+    parser.add_argument("--stretch", dest="keep_aspect", action="store_false",
+                        default=KEEP_ASPECT,
+                        help="Stretch the scene over resized windows instead of letterboxing")
+    parser.add_argument("--playback", action="store_true",
+                        help="Play the frame cache built by `render.py --build-cache` "
+                             "instead of running the simulation")
+    return parser.parse_args(argv)
+
+
 def main():
     """Entry point for the application"""
+    args = parse_args()
     print("\n" + "="*50)
     print("DAY-NIGHT TRANSITION SIMULATION")
     print("="*50)
@@ -162,7 +340,10 @@ def main():
     # Get time input from user
     hour = get_user_time()
     
-    app = Application(hour=hour)
+    app = Application(hour=hour, trace=args.trace, trace_frames=args.trace_frames,
+                      quality=args.quality, adaptive_quality=args.adaptive_quality,
+                      render_scale=args.render_scale, keep_aspect=args.keep_aspect,
+                      playback=args.playback)
     app.run()
 
 
@@ -0,0 +1,143 @@
+"""
+Day-Night Transition Simulation
+Headless entry point: renders scene stills to PNG without opening a window
+"""
+import argparse
+import os
+
+from src.offscreen import PLATFORMS, DEFAULT_PLATFORM, use_platform
+
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT string"""
+    try:
+        width, height = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def parse_scale(text):
+    """Parse an internal render scale in (0, 1]"""
+    try:
+        scale = float(text)
+    except ValueError:
+        scale = None
+    if scale is None or not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError(f"Expected a scale in (0, 1], got {text!r}")
+    return scale
+
+
+def build_parser():
+    from src.config import (
+        WINDOW_SIZE, SEASON, RENDER_SCALE, EXPORT_FPS, FRAME_CACHE_DIR, FRAME_CACHE_FRAMES,
+        FRAME_CACHE_SIZE,
+    )
+
+    parser = argparse.ArgumentParser(description="Render day-night scene stills offscreen")
+    parser.add_argument("--hour", type=int, default=12, choices=range(24), metavar="0-23",
+                        help="hour of day to render (default 12)")
+    parser.add_argument("--minute", type=int, default=0, choices=range(60), metavar="0-59",
+                        help="minute within the hour (default 0)")
+    parser.add_argument("--seed", type=int, help="seed for star, cloud and particle layout")
+    parser.add_argument("--season", choices=("summer", "winter"), default=SEASON,
+                        help=f"season to render (default {SEASON})")
+    parser.add_argument("--size", type=parse_size,
+                        help="output size as WIDTHxHEIGHT (default %dx%d, %dx%d for "
+                             "--build-cache)" % (WINDOW_SIZE + FRAME_CACHE_SIZE))
+    parser.add_argument("--render-scale", type=parse_scale, default=RENDER_SCALE, metavar="S",
+                        help="render at S times the output size and upscale "
+                             "(0 < S <= 1, default %(default)g)")
+    parser.add_argument("--platform", choices=PLATFORMS, default=DEFAULT_PLATFORM,
+                        help="offscreen GL platform, or 'software' for the NumPy "
+                             "rasterizer (default %(default)s)")
+    parser.add_argument("-o", "--output", help="PNG path (default images/<season>_<hour>.png)")
+
+    timelapse = parser.add_argument_group("time-lapse")
+    timelapse.add_argument("--timelapse", type=int, metavar="FRAMES",
+                           help="render FRAMES frames from --start to --end in parallel")
+    timelapse.add_argument("--start", type=float, default=0.0, help="first hour (default 0)")
+    timelapse.add_argument("--end", type=float, default=24.0, help="end hour, exclusive (default 24)")
+    timelapse.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    timelapse.add_argument("--output-dir", default="timelapse",
+                           help="directory for numbered frames (default %(default)s)")
+    timelapse.add_argument("--animation", metavar="PATH",
+                           help="write one animation instead of numbered frames; "
+                                "the type follows the extension: .apng, .webp or .gif")
+    timelapse.add_argument("--fps", type=float, default=EXPORT_FPS,
+                           help="animation frame rate (default %(default)g)")
+
+    cache = parser.add_argument_group("frame cache")
+    cache.add_argument("--build-cache", nargs="*", choices=("summer", "winter"), metavar="SEASON",
+                       help="render a full day per season (default both) into the "
+                            "memory-mapped cache played by `main.py --playback`")
+    cache.add_argument("--cache-frames", type=int, default=FRAME_CACHE_FRAMES,
+                       help="frames per cached day (default %(default)s)")
+    cache.add_argument("--cache-dir", default=FRAME_CACHE_DIR,
+                       help="cache directory (default %(default)s)")
+    return parser
+
+
+def render_timelapse(args):
+    """Render a numbered PNG sequence or an animation using the process pool
+
+    Frames are encoded by a background FrameWriter while the pool renders.
+    """
+    from src.timelapse import frame_times, render_timelapse
+    from src.export import FrameWriter
+
+    output = args.animation or os.path.join(args.output_dir, args.season + "_{:05d}.png")
+    times = frame_times(args.start * 60, args.end * 60, args.timelapse)
+    seed = 0 if args.seed is None else args.seed
+    frames = render_timelapse(times, season=args.season, seed=seed, size=args.size,
+                              workers=args.workers, platform=args.platform,
+                              scale=args.render_scale)
+    with FrameWriter(output, fps=args.fps) as writer:
+        for frame in frames:
+            writer.write(frame)
+    print(f"Wrote {writer.written} frames to {args.animation or args.output_dir}")
+
+
+def build_cache(args):
+    """Render the frame cache for each requested season"""
+    from src.config import FRAME_CACHE_SIZE
+    from src.framecache import build_frame_cache
+
+    seed = 0 if args.seed is None else args.seed
+    for season in args.build_cache or ("summer", "winter"):
+        path = build_frame_cache(season, args.cache_dir, frames=args.cache_frames,
+                                 size=args.size or FRAME_CACHE_SIZE, seed=seed,
+                                 workers=args.workers, platform=args.platform,
+                                 scale=args.render_scale)
+        print(f"Wrote {args.cache_frames} {season} frames to {path}")
+
+
+def main():
+    """Entry point for headless rendering"""
+    args = build_parser().parse_args()
+    if args.build_cache is not None:
+        build_cache(args)
+        return
+    if args.size is None:
+        from src.config import WINDOW_SIZE
+        args.size = WINDOW_SIZE
+    if args.timelapse:
+        render_timelapse(args)
+        return
+    use_platform(args.platform)
+
+    # Imported after the platform is selected so PyOpenGL picks it up
+    from src.scene import Scene
+    from src.offscreen import create_renderer, save_png
+
+    output = args.output or os.path.join("images", f"{args.season}_{args.hour:02d}.png")
+    scene = Scene(hour=args.hour, season=args.season, seed=args.seed)
+    scene.seek(args.hour, args.minute)
+    with create_renderer(args.size, args.platform, args.render_scale) as renderer:
+        frame = renderer.render(scene)
+    save_png(frame, output)
+    print(f"Wrote {output} ({frame.shape[1]}x{frame.shape[0]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Day-Night Transition Simulation
+Local HTTP service rendering scene stills on request (see src/service.py)
+"""
+import argparse
+
+from src.offscreen import PLATFORMS, DEFAULT_PLATFORM
+
+
+def build_parser():
+    from src.config import SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_CACHE_BYTES
+
+    parser = argparse.ArgumentParser(description="Serve rendered scene stills over HTTP")
+    parser.add_argument("--host", default=SERVICE_HOST,
+                        help="address to bind (default %(default)s, local connections only)")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT,
+                        help="port to listen on (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help="render processes (default %(default)s)")
+    parser.add_argument("--platform", choices=PLATFORMS, default=DEFAULT_PLATFORM,
+                        help="offscreen GL platform, or 'software' for the NumPy "
+                             "rasterizer (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for star, cloud and particle layout (default 0)")
+    parser.add_argument("--cache-mb", type=float, default=SERVICE_CACHE_BYTES / 2**20,
+                        help="encoded frame cache size in MiB (default %(default)g)")
+    return parser
+
+
+def main():
+    """Entry point for the render service"""
+    args = build_parser().parse_args()
+
+    from src.service import RenderService, make_server
+
+    with RenderService(workers=args.workers, platform=args.platform, seed=args.seed,
+                       cache_bytes=int(args.cache_mb * 2**20)) as service:
+        server = make_server(service, args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}/frame?hour=18&season=winter "
+              f"(stats at /stats); Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
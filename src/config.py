@@ -6,9 +6,18 @@ Centralized constants for the entire simulation
 # ============================================================================
 # WINDOW SETTINGS
 # ============================================================================
+# Scene coordinate space and initial window size; the scene is scaled to
+# whatever size the window is resized to
 WINDOW_SIZE = (1920, 1080)  # Full screen resolution
 WINDOW_POSITION = (0, 0)     # Position at top-left corner
 WINDOW_TITLE = b"Day - Night Transition Simulation"
+TARGET_FPS = 60              # Frame scheduler rate; redraws stop while paused
+# Internal resolution as a fraction of the output: below 1 the scene is
+# rendered smaller and upscaled (the HUD stays at full resolution)
+RENDER_SCALE = 1.0
+# Keep the scene's aspect ratio in resized windows (black bars) instead of
+# stretching it
+KEEP_ASPECT = True
 
 # ============================================================================
 # SEASON SETTINGS
@@ -26,9 +35,26 @@ WINTER_DAY_END = 18
 # BACKGROUND & SKY COLORS
 # ============================================================================
 GRADIENT_STEPS = 100
+# Sky strips are recolored only when color/brightness moves by more than this
+SKY_REBUILD_THRESHOLD = 0.5 / 255
 NIGHT_SKY = (0, 0.005, 0.02)
 DAY_SKY = (0.02, 0.46, 0.76)
 
+# ============================================================================
+# LIGHTING TABLES
+# ============================================================================
+# Sky, ground and sun/moon brightness are precomputed at this many steps
+# across the celestial arc (see lighting.py).
+LIGHTING_RESOLUTION = 4096
+# Optional keyframed colors over the day arc as (position, (r, g, b)), with
+# position 0 at sunrise and 1 at sunset, e.g. for warm dawn and dusk tints:
+#   SKY_KEYFRAMES = ((0.0, (0.35, 0.2, 0.3)), (0.1, (0.8, 0.5, 0.35)),
+#                    (0.25, DAY_SKY), (0.75, DAY_SKY),
+#                    (0.9, (0.85, 0.45, 0.25)), (1.0, (0.3, 0.15, 0.3)))
+# None blends between the night and day colors along sin(angle).
+SKY_KEYFRAMES = None
+GROUND_KEYFRAMES = None
+
 # ============================================================================
 # CELESTIAL BODIES - SUN
 # ============================================================================
@@ -98,6 +124,19 @@ ANIMATION_SPEED = 1.0
 # Example: 0.2 makes the whole day-night cycle ~5x slower.
 TIME_SCALE = 0.2
 
+# ============================================================================
+# SIMULATION CLOCK
+# ============================================================================
+# The simulation advances in fixed ticks driven by the wall clock, independent
+# of how often frames are drawn. Per-frame constants elsewhere (SUN_STEP,
+# snowflake speeds, fade increments, ...) were tuned at REFERENCE_FPS and are
+# scaled by dt * REFERENCE_FPS inside each update.
+REFERENCE_FPS = 60
+SIMULATION_HZ = 60
+SIMULATION_DT = 1.0 / SIMULATION_HZ
+MAX_CATCHUP_TICKS = 5   # Ticks run per frame; any further backlog waits a frame
+MAX_FRAME_TIME = 0.25   # Wall-clock gaps longer than this (s) are not replayed
+
 # ============================================================================
 # SNOW (WINTER ONLY)
 # ============================================================================
@@ -109,3 +148,104 @@ SNOW_COVER_HEIGHT = 120  # thickness of ground snow cap
 NIGHT_SNOW_INTENSITY_MULTIPLIER = 0.5  # Reduce snow intensity to 50% during night
 SNOW_COVER_OPACITY_DAY = 0.9  # Opacity of snow cover during day
 SNOW_COVER_OPACITY_NIGHT = 0.7  # Opacity of snow cover during night (dimmer)
+
+# ============================================================================
+# STATIC LAYER CACHE
+# ============================================================================
+# Sky/ground and house/trees are rendered into cached image layers that are
+# only redrawn when their inputs change; shadows follow the sun, so their
+# layer is redrawn once the sun has moved this many pixels.
+STATIC_LAYER_CACHE = True
+SHADOW_SUN_QUANTUM = 1.0
+
+# ============================================================================
+# HUD
+# ============================================================================
+# Extra fields shown after the hour in the on-screen clock. The HUD is only
+# rebuilt when its text changes; the FPS figure is refreshed every
+# HUD_FPS_INTERVAL seconds.
+HUD_SHOW_MINUTES = False
+HUD_SHOW_SEASON = False
+HUD_SHOW_FPS = False
+HUD_FPS_INTERVAL = 0.5
+# Prepared strings (display lists, glyph masks) kept per backend
+TEXT_CACHE_SIZE = 64
+
+# ============================================================================
+# TRACING
+# ============================================================================
+# Frames recorded by `main.py --trace FILE` before the trace is written
+TRACE_FRAMES = 300
+# Maximum GL calls for a steady-state frame (layers and HUD already cached)
+# through the command buffer, checked by `benchmark.py --check`
+GL_CALL_BUDGETS = {
+    "summer day": 75,
+    "winter night": 100,
+}
+
+# ============================================================================
+# CIRCLE TESSELLATION
+# ============================================================================
+# Circles are tessellated so the polygon edge stays within this many pixels
+# of the true circle; segment counts are clamped to the range below.
+CIRCLE_TOLERANCE = 0.5
+CIRCLE_MIN_SEGMENTS = 6
+CIRCLE_MAX_SEGMENTS = 96
+
+# ============================================================================
+# QUALITY PRESETS
+# ============================================================================
+# Named presets from cheapest to finest: sky gradient strips, fraction of
+# the star/firefly/cloud/snowflake pools in use, and circle tolerance in
+# pixels. "high" matches the defaults above.
+QUALITY_PRESETS = {
+    "low": {"gradient_steps": 25, "particles": 0.25, "circle_tolerance": 2.0},
+    "medium": {"gradient_steps": 50, "particles": 0.5, "circle_tolerance": 1.0},
+    "high": {"gradient_steps": 100, "particles": 1.0, "circle_tolerance": 0.5},
+    "ultra": {"gradient_steps": 200, "particles": 1.0, "circle_tolerance": 0.25},
+}
+QUALITY = "high"              # Starting preset
+# The window steps between presets to keep the QUALITY_PERCENTILE frame
+# time of the last QUALITY_WINDOW frames within one frame at TARGET_FPS,
+# checked on every frame.
+ADAPTIVE_QUALITY = True
+QUALITY_PERCENTILE = 95
+QUALITY_WINDOW = 120          # Recent frames the percentile covers
+# Step up only when the percentile is below this fraction of the budget
+QUALITY_UPGRADE_HEADROOM = 0.6
+
+# ============================================================================
+# FRAME EXPORT
+# ============================================================================
+# Frames waiting to be encoded; once full, "block" makes the renderer wait
+# for the encoder and "drop" discards new frames instead
+EXPORT_QUEUE_SIZE = 16
+EXPORT_BACKPRESSURE = "block"
+EXPORT_WORKERS = 2            # Encoder threads for numbered PNG sequences
+EXPORT_FPS = 30               # Frame rate of animated exports
+EXPORT_PNG_COMPRESS_LEVEL = 6  # zlib level 0-9: lower encodes faster
+EXPORT_GIF_COLORS = 256       # Palette size each GIF frame is quantized to
+
+# ============================================================================
+# FRAME CACHE
+# ============================================================================
+# `render.py --build-cache` renders a whole simulated day per season into
+# memory-mapped frame cubes that `main.py --playback` shows instead of
+# simulating. 1440 frames at 960x540 is about 2.2 GB per season.
+FRAME_CACHE_DIR = "framecache"
+FRAME_CACHE_FRAMES = 1440     # One frame per simulated minute
+FRAME_CACHE_SIZE = (960, 540)
+
+# ============================================================================
+# RENDER SERVICE
+# ============================================================================
+# `serve.py` renders stills over HTTP for dashboards
+SERVICE_HOST = "127.0.0.1"    # Local connections only
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2           # Render processes, each with a ready scene and context
+SERVICE_SIZE = (960, 540)     # Frame size when a request gives none
+SERVICE_MAX_SIZE = (3840, 2160)
+SERVICE_CACHE_BYTES = 256 * 2**20  # Encoded frames kept, least recently used first out
+SERVICE_TIME_QUANTUM = 1      # Requested times are rounded down to this many minutes
+SERVICE_RENDERERS = 4         # Output sizes each worker keeps a renderer for
+SERVICE_STATS_WINDOW = 1000   # Recent requests the latency percentiles cover
@@ -1,10 +1,10 @@
 """Entity classes for the simulation"""
 from .background import Background
-from .celestial import Sun, Moon, Star, Cloud
+from .celestial import Sun, Moon, StarField, Cloud
 from .ground import Ground
-from .nature import Grass, Firefly
+from .nature import Grass, FireflySwarm
 from .house import House
 from .tree import Tree
 from .snow import Snowfall
 
-__all__ = ['Background', 'Sun', 'Moon', 'Star', 'Cloud', 'Ground', 'Grass', 'Firefly', 'House', 'Tree', 'Snowfall']
+__all__ = ['Background', 'Sun', 'Moon', 'StarField', 'Cloud', 'Ground', 'Grass', 'FireflySwarm', 'House', 'Tree', 'Snowfall']
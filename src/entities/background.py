@@ -1,31 +1,62 @@
 """Background gradient rendering"""
-from OpenGL.GL import *
-from ..config import WINDOW_SIZE, GRADIENT_STEPS, NIGHT_SKY, DAY_SKY
+import numpy as np
+from ..config import WINDOW_SIZE, GRADIENT_STEPS, NIGHT_SKY, DAY_SKY, SKY_REBUILD_THRESHOLD
+from ..render.backend import QUADS
+from ..lighting import default_lighting
 
 
 class Background:
-    def __init__(self):
+    def __init__(self, steps=GRADIENT_STEPS, lighting=None):
         self.width, self.height = WINDOW_SIZE
         self.color = DAY_SKY  # Start with day sky
         self.bright = 0.5
         self.switching = False
+        self.lighting = lighting or default_lighting()
+        self.set_steps(steps)
 
-    def draw(self):
-        glBegin(GL_QUADS)
-        h = self.height / GRADIENT_STEPS
-        g = self.color[1] / GRADIENT_STEPS
-        b = self.color[2] / GRADIENT_STEPS
-        for i in range(1, GRADIENT_STEPS + 1):
-            glColor3f(
-                self.color[0],
-                self.color[1] - i * g * self.bright,
-                self.color[2] - i * b * self.bright
-            )
-            glVertex2f(0, h * i)
-            glVertex2f(self.width, h * i)
-            glVertex2f(self.width, h * (i - 1))
-            glVertex2f(0, h * (i - 1))
-        glEnd()
+    def set_steps(self, steps):
+        """Rebuild the gradient with this many horizontal strips"""
+        self.steps = steps
+        # Strip geometry only changes here; colors are rebuilt on visible change
+        h = self.height / steps
+        top = np.arange(steps, dtype=np.float32) * h
+        bottom = top + h
+        x0, x1 = 0.0, float(self.width)
+        self._vertices = np.stack((
+            np.column_stack((np.full(steps, x0), bottom)),
+            np.column_stack((np.full(steps, x1), bottom)),
+            np.column_stack((np.full(steps, x1), top)),
+            np.column_stack((np.full(steps, x0), top)),
+        ), axis=1).astype(np.float32).reshape(-1, 2)
+        self._colors = np.empty((steps, 4, 3), dtype=np.float32)
+        self._cached_state = None
+
+    def _needs_rebuild(self):
+        """True when color or brightness moved past the visible threshold"""
+        if self._cached_state is None:
+            return True
+        cached_color, cached_bright = self._cached_state
+        return (
+            abs(self.bright - cached_bright) > SKY_REBUILD_THRESHOLD
+            or max(abs(a - b) for a, b in zip(self.color, cached_color)) > SKY_REBUILD_THRESHOLD
+        )
+
+    def _rebuild_colors(self):
+        """Recompute per-strip colors for the current sky color"""
+        r, g, b = self.color
+        fade = np.arange(1, self.steps + 1, dtype=np.float32) * (self.bright / self.steps)
+        strip = np.column_stack((
+            np.full(self.steps, r, dtype=np.float32),
+            g - g * fade,
+            b - b * fade,
+        ))
+        self._colors[:] = strip[:, None, :]
+        self._cached_state = (self.color, self.bright)
+
+    def draw(self, renderer):
+        if self._needs_rebuild():
+            self._rebuild_colors()
+        renderer.draw(QUADS, self._vertices, colors=self._colors.reshape(-1, 3))
 
     def switch_time(self, time):
         self.bright = 1 if time == "night" else 0.5
@@ -45,32 +76,11 @@ class Background:
         return g, b
 
     def change_brightness(self, sun, time, seconds, transition_progress=0):
-        import math
-        r, g, b = self.color
         if time == "day":
-            # Brightness based on sun's angle position (0 to π)
-            brightness_factor = math.sin(sun.angle)
-            
-            # Interpolate between night and day colors based on sun position
-            night_r, night_g, night_b = NIGHT_SKY
-            day_r, day_g, day_b = DAY_SKY
-            
-            r = night_r + (day_r - night_r) * brightness_factor
-            g = night_g + (day_g - night_g) * brightness_factor
-            b = night_b + (day_b - night_b) * brightness_factor
-            
-            self.bright = brightness_factor
+            # Sky color and gradient depth follow the sun's angle (0 to π)
+            self.color = self.lighting.sky(sun.angle)
+            self.bright = self.lighting.daylight(sun.angle)
         else:
-            # During night transition, gradually darken
-            # Use transition_progress for smooth fade
-            night_r, night_g, night_b = NIGHT_SKY
-            day_r, day_g, day_b = DAY_SKY
-            
-            # Interpolate from current day color to night color based on transition progress
-            r = day_r + (night_r - day_r) * transition_progress
-            g = day_g + (night_g - day_g) * transition_progress
-            b = day_b + (night_b - day_b) * transition_progress
-            
+            # During night transition, fade from day to night color
+            self.color = self.lighting.dusk_sky(transition_progress)
             self.bright = 1
-        
-        self.color = r, g, b
@@ -1,14 +1,18 @@
 """
 Celestial Bodies Module
-Contains Sun, Moon, Star, and Cloud classes for the day-night simulation
+Contains Sun, Moon, StarField, and Cloud classes for the day-night simulation
 """
 import math
-from random import randint, uniform
-from OpenGL.GL import *
+import random
+import numpy as np
 from ..config import (
-    WINDOW_SIZE, SUN_RADIUS, SUN_POSITION, SUN_COLOR,
-    MOON_RADIUS, MOON_POSITION, MOON_COLOR, TIME_SCALE
+    WINDOW_SIZE, SUN_RADIUS, SUN_POSITION,
+    MOON_RADIUS, MOON_POSITION, TIME_SCALE, STAR_COUNT,
+    REFERENCE_FPS, SIMULATION_DT
 )
+from ..render.backend import POINTS, POLYGON
+from ..lighting import default_lighting
+from .geometry import circle_vertices, bounce, wrap
 
 # Celestial movement constants
 # Base steps define the arc speed; TIME_SCALE slows or speeds the full cycle.
@@ -24,6 +28,12 @@ ORBIT_RADIUS_Y = 300
 # Fade animation constants
 FADE_INCREMENT = 0.02
 
+# Star field constants
+STAR_SKY_HEIGHT = 650     # Stars are scattered above this screen row
+STAR_MIN_SIZE = 1
+STAR_MAX_SIZE = 3
+STAR_SIZE_QUANTUM = 0.5   # Point sizes are batched in steps of this many pixels
+
 
 class HeavenlyBody:
     """Base class for all celestial objects"""
@@ -41,172 +51,215 @@ class HeavenlyBody:
         self.x, self.y = position
         self.color = (*color, 0.0)
         self._draw = draw
+        self.angle = 0
+        self.step = 0
+        # Position at the previous tick, used to interpolate between ticks
+        self.prev_x, self.prev_y = self.x, self.y
+        self._restart = True
     
-    def draw(self):
-        """Draw the celestial body with glow effect"""
+    def draw(self, renderer, alpha=1.0):
+        """Draw the celestial body with glow effect
+        
+        Args:
+            renderer: Render backend to draw with
+            alpha: Fraction of a tick elapsed since the last update, used to
+                   interpolate between the previous and current position
+        """
         if self._draw:
-            self.shine()
-            self.draw_body()
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+            self.shine(renderer, x, y)
+            self.draw_body(renderer, x, y)
     
-    def draw_body(self):
-        """Draw solid body"""
-        glBegin(GL_POLYGON)
-        for i in range(360):
-            glColor4f(*self.color)
-            cosine = self.radius * math.cos(i) + self.x
-            sine = self.radius * math.sin(i) + self.y
-            glVertex2f(cosine, sine)
-        glEnd()
+    def draw_body(self, renderer, x, y):
+        """Draw solid body; it fades in and out with its alpha"""
+        renderer.draw(POLYGON, circle_vertices(x, y, self.radius), color=self.color, blend=True)
     
-    def shine(self):
+    def shine(self, renderer, x, y):
         """Draw glowing halo around the body"""
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glBegin(GL_POLYGON)
-        glColor4f(*self.color[:3], 0.3 * self.color[-1])
+        renderer.draw(POLYGON, circle_vertices(x, y, self.radius * 1.5),
+                      color=(*self.color[:3], 0.3 * self.color[-1]), blend=True)
+    
+    def revolve(self, dt=SIMULATION_DT):
+        """Move the body along its arc path
+        
+        Args:
+            dt: Simulated seconds to advance
+        
+        Returns:
+            True when the body completes its full arc, False otherwise
+        """
+        x, y = self.arc_position(self.angle)
+        if self._restart:
+            # Don't interpolate from where the previous arc ended
+            self.prev_x, self.prev_y = x, y
+            self._restart = False
+        else:
+            self.prev_x, self.prev_y = self.x, self.y
+        self.x, self.y = x, y
+        
+        self.angle += self.step * dt * REFERENCE_FPS
+        
+        # Check if arc is complete
+        if self.angle >= math.pi:
+            self.angle = 0
+            self._restart = True
+            return True
         
-        for i in range(360):
-            cosine = (self.radius * 1.5) * math.cos(i) + self.x
-            sine = (self.radius * 1.5) * math.sin(i) + self.y
-            glVertex2f(cosine, sine)
-        glEnd()
+        return False
+    
+    @staticmethod
+    def arc_position(angle):
+        """Position on the orbital arc for an angle in 0..pi"""
+        x = ORBIT_CENTER_X + ORBIT_RADIUS_X * math.cos(math.pi + angle)
+        y = ORBIT_CENTER_Y - ORBIT_RADIUS_Y * math.sin(angle)
+        return x, y
+    
+    def place(self, angle):
+        """Put the body directly at an angle along its arc, without stepping"""
+        self.angle = angle
+        self.x, self.y = self.arc_position(angle)
+        self.snap()
+        self._restart = False
+    
+    def snap(self):
+        """Drop interpolation history after the position was set directly"""
+        self.prev_x, self.prev_y = self.x, self.y
     
     def switch_time(self):
         """Toggle visibility"""
         self._draw = not self._draw
+        self._restart = True
     
-    def appear(self):
+    def appear(self, dt=SIMULATION_DT):
         """Fade in the celestial body"""
         r, g, b, a = self.color
         if a <= 1.0:
-            a += FADE_INCREMENT
+            a += FADE_INCREMENT * dt * REFERENCE_FPS
         self.color = r, g, b, a
     
-    def disappear(self, speed=1):
+    def disappear(self, speed=1, dt=SIMULATION_DT):
         """Fade out the celestial body"""
         r, g, b, a = self.color
         if a >= 0.0:
-            a -= FADE_INCREMENT * speed
+            a -= FADE_INCREMENT * speed * dt * REFERENCE_FPS
         self.color = r, g, b, a
 
 
 class Sun(HeavenlyBody):
     """The sun that revolves across the sky during the day"""
     
-    def __init__(self, radius, position, color, draw):
+    def __init__(self, radius, position, color, draw, lighting=None):
         """Initialize the sun"""
         super().__init__(radius, position, color, draw)
-        self.angle = 0
         self.step = SUN_STEP
+        self.lighting = lighting or default_lighting()
     
-    def revolve(self):
-        """Move the sun along its arc path
-        
-        Returns:
-            True when the sun completes its full arc, False otherwise
-        """
-        # Calculate position on arc
-        self.x = ORBIT_CENTER_X + ORBIT_RADIUS_X * math.cos(math.pi + self.angle)
-        self.y = ORBIT_CENTER_Y - ORBIT_RADIUS_Y * math.sin(self.angle)
-        
-        self.angle += self.step
-        
-        # Check if arc is complete
-        if self.angle >= math.pi:
-            self.angle = 0
-            return True
-        
-        return False
-    
-    def change_brightness(self, sun, time, seconds):
+    def change_brightness(self, sun, time, seconds, dt=SIMULATION_DT):
         """Update sun brightness based on time of day"""
         if time == "day":
             # Brightness curve: sin(angle)^1.5 for steep brightness changes
-            brightness = math.sin(self.angle) ** 1.5
-            r, g, b = SUN_COLOR
-            self.color = (r, g, b, brightness)
+            self.color = self.lighting.sun(self.angle)
         else:
             # Fade out during night
-            self.disappear()
+            self.disappear(dt=dt)
 
 
 class Moon(HeavenlyBody):
     """The moon that revolves across the sky during the night"""
     
-    def __init__(self, radius, position, color):
+    def __init__(self, radius, position, color, lighting=None):
         """Initialize the moon"""
         super().__init__(radius, position, color)
-        self.angle = 0
         self.step = MOON_STEP
+        self.lighting = lighting or default_lighting()
     
-    def revolve(self):
-        """Move the moon along its arc path
-        
-        Returns:
-            True when the moon completes its full arc, False otherwise
-        """
-        # Calculate position on arc (same as sun)
-        self.x = ORBIT_CENTER_X + ORBIT_RADIUS_X * math.cos(math.pi + self.angle)
-        self.y = ORBIT_CENTER_Y - ORBIT_RADIUS_Y * math.sin(self.angle)
-        
-        self.angle += self.step
-        
-        # Check if arc is complete
-        if self.angle >= math.pi:
-            self.angle = 0
-            return True
-        
-        return False
-    
-    def change_brightness(self, sun, time, seconds):
+    def change_brightness(self, sun, time, seconds, dt=SIMULATION_DT):
         """Update moon brightness based on time of day"""
         if time == "day":
             # Fade out during day
-            self.disappear()
+            self.disappear(dt=dt)
         else:
             # Brightness curve: sin(angle)^1.5 for steep brightness changes
-            brightness = math.sin(self.angle) ** 1.5
-            r, g, b = MOON_COLOR
-            self.color = (r, g, b, brightness)
+            self.color = self.lighting.moon(self.angle)
+
 
+class StarField:
+    """Twinkling stars visible at night, stored as NumPy arrays
 
-class Star:
-    """Twinkling star visible at night"""
+    Positions, sizes, twinkle steps and directions live in parallel arrays
+    so twinkling is a single vectorized step. Stars are drawn grouped by
+    point size quantized to STAR_SIZE_QUANTUM, which keeps the number of
+    point batches down to a handful regardless of star count.
+    """
     
-    def __init__(self, x, y, draw=True):
-        """Initialize a star
+    def __init__(self, count=STAR_COUNT, draw=True, seed=None):
+        """Initialize the star field
         
         Args:
-            x, y: Star position
+            count: Number of stars
             draw: Initial visibility
+            seed: Optional seed for reproducible star placement
         """
-        self.x, self.y = x, y
         self.width, self.height = WINDOW_SIZE
-        self.size = randint(1, 3)
-        self.i = True  # Direction indicator (growing/shrinking)
-        self.step = uniform(0.0001, 0.005)
+        rng = np.random.default_rng(seed)
+        self.count = count
+        self.positions = np.column_stack((
+            rng.integers(0, self.width, count),
+            rng.integers(0, STAR_SKY_HEIGHT, count),
+        )).astype(np.float32)
+        self.size = rng.integers(STAR_MIN_SIZE, STAR_MAX_SIZE, count, endpoint=True).astype(np.float32)
+        self.step = rng.uniform(0.0001, 0.005, count).astype(np.float32)
+        self.growing = np.ones(count, dtype=bool)  # Direction indicator
         self._draw = draw
+        # Only the first `active` stars are animated and drawn
+        self.active = count
+        # Initial state, from which seek() derives any later state
+        self._origin_size = self.size.copy()
+        self._origin_step = self.step.copy()
     
-    def twinkle(self):
-        """Animate star twinkling effect"""
-        if self.size >= 3 and self.i:
-            self.i = False
-            self.step = -self.step
-        elif self.size <= 1 and not self.i:
-            self.i = True
-            self.step = -self.step
-        
-        self.size += self.step
+    def set_detail(self, fraction):
+        """Show only this fraction (0..1) of the stars"""
+        self.active = min(self.count, max(0, round(self.count * fraction)))
     
-    def draw(self):
-        """Draw and animate the star"""
-        if self._draw:
-            glColor3f(1.0, 1.0, 1.0)
-            glPointSize(self.size)
-            glBegin(GL_POINTS)
-            glVertex2f(self.x, self.y)
-            glEnd()
-            self.twinkle()
+    def twinkle(self, dt=SIMULATION_DT):
+        """Animate star twinkling effect for every active star at once"""
+        n = self.active
+        size, step, growing = self.size[:n], self.step[:n], self.growing[:n]
+        flip = (size >= STAR_MAX_SIZE) & growing
+        flip |= (size <= STAR_MIN_SIZE) & ~growing
+        growing ^= flip
+        np.negative(step, out=step, where=flip)
+        size += step * np.float32(dt * REFERENCE_FPS)
+    
+    def update(self, dt=SIMULATION_DT):
+        """Advance twinkling; hidden fields cost nothing"""
+        if self._draw and self.active:
+            self.twinkle(dt)
+    
+    def seek(self, ticks):
+        """Set twinkle state to where it would be after `ticks` reference ticks"""
+        unfolded = self._origin_size + self._origin_step * np.float32(ticks)
+        size, self.growing = bounce(unfolded, STAR_MIN_SIZE, STAR_MAX_SIZE)
+        self.size = size.astype(np.float32)
+        self.step = np.where(self.growing, self._origin_step, -self._origin_step)
+    
+    def draw(self, renderer):
+        """Draw the stars; hidden fields cost nothing"""
+        n = self.active
+        if not self._draw or not n:
+            return
+        levels = np.rint(self.size[:n] / STAR_SIZE_QUANTUM).astype(np.intp)
+        order = np.argsort(levels, kind="stable")
+        positions = self.positions[:n][order]
+        counts = np.bincount(levels)
+        
+        start = 0
+        for level in np.flatnonzero(counts):
+            end = start + counts[level]
+            renderer.draw(POINTS, positions[start:end], color=(1.0, 1.0, 1.0),
+                          size=float(level * STAR_SIZE_QUANTUM))
+            start = end
     
     def switch_time(self, time):
         """Show stars at night, hide during day"""
@@ -216,56 +269,55 @@ class Star:
 class Cloud:
     """Drifting cloud element visible during day"""
     
-    def __init__(self, x, y, size=1.0):
+    def __init__(self, x, y, size=1.0, rng=random):
         """Initialize a cloud
         
         Args:
             x, y: Cloud position
             size: Scale factor for cloud size
+            rng: Source of randomness (the random module or a random.Random)
         """
         self.x = x
         self.y = y
+        self.origin_x = x
         self.size = size
-        self.speed = uniform(0.02, 0.08) * size
-        self.opacity = uniform(0.7, 0.9)
+        self.speed = rng.uniform(0.02, 0.08) * size
+        self.opacity = rng.uniform(0.7, 0.9)
         self._draw = False  # Invisible at night
     
-    def draw(self):
-        """Draw and animate the cloud"""
+    def update(self, dt=SIMULATION_DT):
+        """Move cloud horizontally"""
         if self._draw:
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            
-            # Draw cloud as overlapping circles
-            cloud_color = (1.0, 1.0, 1.0, self.opacity)
-            self._draw_cloud_puff(self.x, self.y, 30 * self.size, cloud_color)
-            self._draw_cloud_puff(self.x + 25 * self.size, self.y - 5 * self.size, 35 * self.size, cloud_color)
-            self._draw_cloud_puff(self.x + 50 * self.size, self.y, 30 * self.size, cloud_color)
-            self._draw_cloud_puff(self.x + 25 * self.size, self.y + 10 * self.size, 25 * self.size, cloud_color)
-            
-            glDisable(GL_BLEND)
-            
-            # Move cloud horizontally
-            self.x += self.speed
+            self.x += self.speed * dt * REFERENCE_FPS
             if self.x > WINDOW_SIZE[0] + 100 * self.size:
                 self.x = -100 * self.size
     
-    def _draw_cloud_puff(self, x, y, radius, color):
+    def seek(self, ticks):
+        """Place the cloud where it would be after `ticks` reference ticks
+        of daylight (clouds stand still while hidden at night)"""
+        margin = 100 * self.size
+        self.x = float(wrap(self.origin_x + self.speed * ticks, -margin, WINDOW_SIZE[0] + margin))
+    
+    def draw(self, renderer):
+        """Draw the cloud"""
+        if self._draw:
+            # Draw cloud as overlapping circles
+            cloud_color = (1.0, 1.0, 1.0, self.opacity)
+            self._draw_cloud_puff(renderer, self.x, self.y, 30 * self.size, cloud_color)
+            self._draw_cloud_puff(renderer, self.x + 25 * self.size, self.y - 5 * self.size, 35 * self.size, cloud_color)
+            self._draw_cloud_puff(renderer, self.x + 50 * self.size, self.y, 30 * self.size, cloud_color)
+            self._draw_cloud_puff(renderer, self.x + 25 * self.size, self.y + 10 * self.size, 25 * self.size, cloud_color)
+    
+    def _draw_cloud_puff(self, renderer, x, y, radius, color):
         """Draw a single cloud puff (circle)
         
         Args:
+            renderer: Render backend to draw with
             x, y: Center position
             radius: Circle radius
             color: RGBA color tuple
         """
-        glBegin(GL_POLYGON)
-        glColor4f(*color)
-        for i in range(30):
-            angle = 2 * math.pi * i / 30
-            cx = x + radius * math.cos(angle)
-            cy = y + radius * math.sin(angle)
-            glVertex2f(cx, cy)
-        glEnd()
+        renderer.draw(POLYGON, circle_vertices(x, y, radius), color=color, blend=True)
     
     def switch_time(self, time):
         """Show clouds during day, hide at night"""
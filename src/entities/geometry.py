@@ -0,0 +1,91 @@
+"""Shared circle tessellation with radius-based level of detail"""
+import math
+import numpy as np
+from ..config import CIRCLE_TOLERANCE, CIRCLE_MIN_SEGMENTS, CIRCLE_MAX_SEGMENTS
+
+# Unit-circle vertex arrays (outline and triangulated) keyed by segment count
+_UNIT_CIRCLES = {}
+_UNIT_DISCS = {}
+# Process-wide default tolerance, changed by the quality presets
+_tolerance = CIRCLE_TOLERANCE
+
+
+def set_circle_tolerance(tolerance):
+    """Set the default chord tolerance (pixels) of every circle drawn after"""
+    global _tolerance
+    _tolerance = tolerance
+
+
+def circle_tolerance():
+    """Current default chord tolerance in pixels"""
+    return _tolerance
+
+
+def segments_for_radius(radius, tolerance=None):
+    """Pick a segment count for a circle of the given on-screen radius
+
+    The count is the smallest one whose chord deviates from the circle by
+    at most `tolerance` pixels (default: circle_tolerance()), rounded up to
+    a multiple of 4 so only a handful of distinct tessellations end up in
+    the cache.
+    """
+    if tolerance is None:
+        tolerance = _tolerance
+    if radius <= tolerance:
+        return CIRCLE_MIN_SEGMENTS
+    step = 2 * math.acos(1 - tolerance / radius)
+    segments = 4 * math.ceil(2 * math.pi / step / 4)
+    return max(CIRCLE_MIN_SEGMENTS, min(CIRCLE_MAX_SEGMENTS, segments))
+
+
+def unit_circle(segments):
+    """Return the cached (segments, 2) float32 array of unit-circle vertices"""
+    verts = _UNIT_CIRCLES.get(segments)
+    if verts is None:
+        angles = np.linspace(0.0, 2 * math.pi, segments, endpoint=False)
+        verts = np.column_stack((np.cos(angles), np.sin(angles))).astype(np.float32)
+        verts.flags.writeable = False
+        _UNIT_CIRCLES[segments] = verts
+    return verts
+
+
+def circle_vertices(x, y, radius, segments=None):
+    """Vertices of a circle centred at (x, y), tessellated for its radius"""
+    if segments is None:
+        segments = segments_for_radius(radius)
+    return unit_circle(segments) * np.float32(radius) + np.array((x, y), dtype=np.float32)
+
+
+def unit_disc_triangles(segments):
+    """Cached unit circle triangulated as a fan, shape ((segments - 2) * 3, 2)
+
+    Useful for batching many small discs into one GL_TRIANGLES draw, since
+    separate polygons cannot share a single draw call.
+    """
+    tris = _UNIT_DISCS.get(segments)
+    if tris is None:
+        ring = unit_circle(segments)
+        fan = np.arange(1, segments - 1)
+        index = np.column_stack((np.zeros_like(fan), fan, fan + 1)).ravel()
+        tris = ring[index]
+        tris.flags.writeable = False
+        _UNIT_DISCS[segments] = tris
+    return tris
+
+
+def wrap(values, lo, hi):
+    """Wrap positions into [lo, hi), as if they re-entered from the other side"""
+    return lo + np.mod(values - lo, hi - lo)
+
+
+def bounce(values, lo, hi):
+    """Fold unbounded positions into [lo, hi) as if they bounced off both ends
+
+    Returns:
+        (positions, rising): folded positions, and whether each one is
+        currently moving towards `hi`
+    """
+    span = hi - lo
+    phase = np.mod(values - lo, 2 * span)
+    rising = phase < span
+    return lo + np.where(rising, phase, 2 * span - phase), rising
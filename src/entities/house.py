@@ -1,7 +1,7 @@
 """House structure"""
-import math
-from OpenGL.GL import *
 from ..config import HOUSE_POSITION, HOUSE_NIGHT_COLOR, HOUSE_DAY_COLOR
+from ..render.backend import POLYGON, RetainedGeometry
+from .geometry import circle_vertices
 
 
 class House:
@@ -12,117 +12,108 @@ class House:
         self.brightness = 1.0  # Start with full brightness for day
         self.is_night = False
         self.shadows_enabled = True
+        # Walls/roof and windows/door are cached separately so the shadow
+        # can still be drawn between them every frame
+        self._body_geometry = RetainedGeometry()
+        self._detail_geometry = RetainedGeometry()
 
-    def draw_layout(self):
+    def _cache_key(self):
+        """State the cached house geometry depends on"""
+        return (self.brightness, self.window_color)
+
+    def _draw_body(self, renderer):
+        self.draw_layout(renderer)
+        self.draw_roof(renderer)
+
+    def _draw_details(self, renderer):
+        self.draw_windows(renderer)
+        self.draw_door(renderer)
+
+    def draw_layout(self, renderer):
         """House Structure"""
-        glBegin(GL_POLYGON)
-        glColor3f(121/255 * self.brightness, 172/255 * self.brightness, 179/255 * self.brightness)
-
-        glVertex2f(self.x + 140, self.y + 120)
-        glVertex2f(self.x + 140, self.y)
-        glVertex2f(self.x, self.y)
-        glVertex2f(self.x, self.y + 250)
-        glVertex2f(self.x + 320, self.y + 250)
-        glVertex2f(self.x + 320, self.y + 120)
-        glVertex2f(self.x + 140, self.y + 120)
-        glEnd()
+        renderer.draw(POLYGON, [
+            (self.x + 140, self.y + 120),
+            (self.x + 140, self.y),
+            (self.x, self.y),
+            (self.x, self.y + 250),
+            (self.x + 320, self.y + 250),
+            (self.x + 320, self.y + 120),
+            (self.x + 140, self.y + 120),
+        ], color=(121/255 * self.brightness, 172/255 * self.brightness, 179/255 * self.brightness))
 
         ### Garden
-        glBegin(GL_POLYGON)
-        glColor3f(0.32 * self.brightness, 0.5 * self.brightness, 0.27 * self.brightness)
-
-        glVertex2f(self.x + 320, self.y + 250)
-        glVertex2f(self.x, self.y + 250)
-        glVertex2f(self.x - 15, self.y + 270)
-        glVertex2f(self.x + 335, self.y + 270)
-        glVertex2f(self.x + 320, self.y + 250)
-        glEnd()
-
-    def draw_roof(self):
-        glBegin(GL_POLYGON)
-        glColor3f(156/255 * self.brightness, 167/255 * self.brightness, 174/255 * self.brightness)
-
-        glVertex2f(self.x - 5, self.y - 10)
-        glVertex2f(self.x + 145, self.y - 10)
-        glVertex2f(self.x + 145, self.y + 10)
-        glVertex2f(self.x - 5, self.y + 10)
-        glVertex2f(self.x - 5, self.y - 10)
-        glEnd()
-
-        glBegin(GL_POLYGON)
-        glVertex(self.x - 5, self.y + 110)
-        glVertex(self.x + 325, self.y + 110)
-        glVertex(self.x + 335, self.y + 150)
-        glVertex(self.x - 5, self.y + 150)
-        glVertex(self.x - 5, self.y + 110)
-        glEnd()
-
-    def draw_window(self, x, y):
-        glBegin(GL_POLYGON)
-        glColor3f(*self.window_color)
-
-        glVertex2f(x + 20, y)
-        glVertex2f(x, y)
-        glVertex2f(x, y + 40)
-        glVertex2f(x + 20, y + 40)
-        glVertex2f(x + 20, y)
-        glEnd()
-
-    def draw_frame(self, x, y, w, h):
-        glBegin(GL_POLYGON)
-        glColor3f(1, 1, 1)
-
-        glVertex2f(x + w, y)
-        glVertex2f(x, y)
-        glVertex2f(x, y + h)
-        glVertex2f(x + w, y + h)
-        glVertex2f(x + w, y)
-        glEnd()
-
-    def draw_windows(self):
-        self.draw_frame(self.x + 44, self.y + 38, 52, 48)
+        renderer.draw(POLYGON, [
+            (self.x + 320, self.y + 250),
+            (self.x, self.y + 250),
+            (self.x - 15, self.y + 270),
+            (self.x + 335, self.y + 270),
+            (self.x + 320, self.y + 250),
+        ], color=(0.32 * self.brightness, 0.5 * self.brightness, 0.27 * self.brightness))
+
+    def draw_roof(self, renderer):
+        color = (156/255 * self.brightness, 167/255 * self.brightness, 174/255 * self.brightness)
+        renderer.draw(POLYGON, [
+            (self.x - 5, self.y - 10),
+            (self.x + 145, self.y - 10),
+            (self.x + 145, self.y + 10),
+            (self.x - 5, self.y + 10),
+            (self.x - 5, self.y - 10),
+        ], color=color)
+
+        renderer.draw(POLYGON, [
+            (self.x - 5, self.y + 110),
+            (self.x + 325, self.y + 110),
+            (self.x + 335, self.y + 150),
+            (self.x - 5, self.y + 150),
+            (self.x - 5, self.y + 110),
+        ], color=color)
+
+    def draw_window(self, renderer, x, y):
+        renderer.draw(POLYGON, [
+            (x + 20, y),
+            (x, y),
+            (x, y + 40),
+            (x + 20, y + 40),
+            (x + 20, y),
+        ], color=self.window_color)
+
+    def draw_frame(self, renderer, x, y, w, h):
+        renderer.draw(POLYGON, [
+            (x + w, y),
+            (x, y),
+            (x, y + h),
+            (x + w, y + h),
+            (x + w, y),
+        ], color=(1, 1, 1))
+
+    def draw_windows(self, renderer):
+        self.draw_frame(renderer, self.x + 44, self.y + 38, 52, 48)
         x, y = 48, 42
         for _ in range(2):
-            self.draw_window(self.x + x, self.y + y)
+            self.draw_window(renderer, self.x + x, self.y + y)
             x += 24
 
-        self.draw_frame(self.x + 180, self.y + 166, 100, 48)
+        self.draw_frame(renderer, self.x + 180, self.y + 166, 100, 48)
         x, y = 184, 170
         for _ in range(4):
-            self.draw_window(self.x + x, self.y + y)
+            self.draw_window(renderer, self.x + x, self.y + y)
             x += 24
 
-    def draw_door(self):
-        glBegin(GL_POLYGON)
-        glColor3f(146/255, 68/255, 27/255)
-
-        glVertex2f(self.x + 90, self.y + 180)
-        glVertex2f(self.x + 50, self.y + 180)
-        glVertex2f(self.x + 50, self.y + 250)
-        glVertex2f(self.x + 90, self.y + 250)
-        glVertex2f(self.x + 90, self.y + 180)
-        glEnd()
+    def draw_door(self, renderer):
+        renderer.draw(POLYGON, [
+            (self.x + 90, self.y + 180),
+            (self.x + 50, self.y + 180),
+            (self.x + 50, self.y + 250),
+            (self.x + 90, self.y + 250),
+            (self.x + 90, self.y + 180),
+        ], color=(146/255, 68/255, 27/255))
 
         # Door window (circular)
-        glBegin(GL_POLYGON)
-        glColor3f(1, 1, 1)
-        x, y = self.x + 70, self.y + 200
-        for i in range(360):
-            cosine = 12 * math.cos(i) + x
-            sine = 12 * math.sin(i) + y
-            glVertex2f(cosine, sine)
-        glEnd()
-
-        glBegin(GL_POLYGON)
-        glColor3f(*self.window_color)
         x, y = self.x + 70, self.y + 200
-        for i in range(360):
-            cosine = 10 * math.cos(i) + x
-            sine = 10 * math.sin(i) + y
-            glVertex2f(cosine, sine)
-        glEnd()
+        renderer.draw(POLYGON, circle_vertices(x, y, 12), color=(1, 1, 1))
+        renderer.draw(POLYGON, circle_vertices(x, y, 10), color=self.window_color)
 
-    def draw_shadow(self, sun_x, sun_y, sun_angle):
+    def draw_shadow(self, renderer, sun_x, sun_y, sun_angle):
         """Draw shadow cast by the house based on sun position"""
         import math
         
@@ -164,25 +155,14 @@ class House:
         shadow_end_y = house_ground_y + abs(shadow_dy) * 0.5
         
         # Draw shadow
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        glBegin(GL_POLYGON)
-        glColor4f(0.0, 0.0, 0.0, 0.5)
-        
-        # Shadow base at house (wider)
-        glVertex2f(self.x + 20, house_ground_y)
-        glVertex2f(self.x + 300, house_ground_y)
-        
-        # Shadow tip (much wider)
-        glVertex2f(shadow_end_x + 150, shadow_end_y)
-        glVertex2f(shadow_end_x - 150, shadow_end_y)
-        
-        glEnd()
-        
-        glDisable(GL_BLEND)
-        
-        glDisable(GL_BLEND)
+        renderer.draw(POLYGON, [
+            # Shadow base at house (wider)
+            (self.x + 20, house_ground_y),
+            (self.x + 300, house_ground_y),
+            # Shadow tip (much wider)
+            (shadow_end_x + 150, shadow_end_y),
+            (shadow_end_x - 150, shadow_end_y),
+        ], color=(0.0, 0.0, 0.0, 0.5), blend=True)
 
     def switch_time(self, time):
         self.window_color = HOUSE_NIGHT_COLOR if time == "night" else HOUSE_DAY_COLOR
@@ -197,10 +177,9 @@ class House:
     def set_shadows(self, enabled: bool):
         self.shadows_enabled = bool(enabled)
 
-    def draw(self, sun=None):
-        self.draw_layout()
-        self.draw_roof()
+    def draw(self, renderer, sun=None):
+        key = self._cache_key()
+        renderer.cached(self._body_geometry, key, lambda: self._draw_body(renderer))
         if sun is not None:
-            self.draw_shadow(sun.x, sun.y, sun.angle)
-        self.draw_windows()
-        self.draw_door()
+            self.draw_shadow(renderer, sun.x, sun.y, sun.angle)
+        renderer.cached(self._detail_geometry, key, lambda: self._draw_details(renderer))
@@ -1,9 +1,20 @@
 """Natural elements: Grass and Fireflies"""
-from random import randint, choices, uniform
-from OpenGL.GL import *
+from random import randint, choices
+import numpy as np
 from ..config import (
     WINDOW_SIZE, GRASS_LENGTH, GRASS_DAY_COLOR, GRASS_NIGHT_COLOR,
-    FIREFLY_RANGE
+    FIREFLY_RANGE, FIREFLY_COUNT, REFERENCE_FPS, SIMULATION_DT
+)
+from ..render.backend import LINE_STRIP, QUADS
+from .geometry import bounce
+
+FIREFLY_SPEED_RANGE = (0.002, 0.08)
+FIREFLY_FLASH_COLOR = (0.68, 0.655, 0.407)
+FIREFLY_NIGHT_COLOR = (0.63, 0.655, 0.407)
+FIREFLY_DAY_COLOR = (0.1, 0.1, 0.1)
+# Unit square centred on the origin; scaled by point size to draw a firefly
+_POINT_CORNERS = np.array(
+    [(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)], dtype=np.float32
 )
 
 
@@ -19,72 +30,130 @@ class Grass:
         """TODO: Implement wind effect"""
         pass
 
-    def draw(self):
-        glLineWidth(4.0)  # Make grass lines thicker
-        glBegin(GL_LINE_STRIP)  # Draw connected grass blade
-        glColor3f(*self.color)
+    def draw(self, renderer):
         x, y = self.x, self.y
-        glVertex2f(x, y)  # Start point at ground (bottom)
+        points = [(x, y)]  # Start point at ground (bottom)
         for b, s in zip(self.breakpoints, self.sway):
             x += s
             y -= b  # Grass grows upward (decreasing y in screen coords)
-            glVertex2f(x, y)
-        glEnd()
-        glLineWidth(1.0)  # Reset line width
+            points.append((x, y))
+        # Draw connected grass blade, with thicker lines
+        renderer.draw(LINE_STRIP, points, color=self.color, size=4.0)
 
     def switch_time(self, time):
         self.color = GRASS_NIGHT_COLOR if time == "night" else GRASS_DAY_COLOR
 
 
-class Firefly:
-    """Flying firefly with random movement"""
-    def __init__(self, x, y, draw=True):
-        self.x, self.y = x, y
-        self.speed = uniform(0.002, 0.08)  # Slower movement
-        self.xi = randint(0, 1)
-        self.yi = randint(0, 1)
-        self.entropy = randint(3, 7)
-        self.pointsize = 2
-        self.color = (0.63, 0.615, 0.357)
+class FireflySwarm:
+    """Flying fireflies with random movement, stored as NumPy arrays
+
+    Each firefly keeps the same state the old per-object version had
+    (position, speed, heading, entropy countdown, point size and color),
+    but the behavior runs as masked vector operations and the whole swarm
+    is drawn as one batch of quads with per-vertex color and size.
+    """
+    def __init__(self, count=FIREFLY_COUNT, draw=True, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.count = count
+        (x0, x1), (y0, y1) = FIREFLY_RANGE
+        self.x = self.rng.integers(x0, x1, count).astype(np.float32)
+        self.y = self.rng.integers(y0, y1, count).astype(np.float32)
+        self.speed = self.rng.uniform(*FIREFLY_SPEED_RANGE, count).astype(np.float32)  # Slower movement
+        self.xi = self.rng.integers(0, 1, count, endpoint=True).astype(bool)
+        self.yi = self.rng.integers(0, 1, count, endpoint=True).astype(bool)
+        self.entropy = self.rng.integers(3, 7, count, endpoint=True).astype(np.float32)
+        self.pointsize = np.full(count, 2, dtype=np.float32)
+        self.color = np.tile(np.float32((0.63, 0.615, 0.357)), (count, 1))
         self._draw = draw
+        # Only the first `active` fireflies fly and are drawn
+        self.active = count
+
+        self._vertices = np.empty((count, 4, 2), dtype=np.float32)
+        self._colors = np.empty((count, 4, 3), dtype=np.float32)
+
+        # Initial state, from which seek() derives any later state
+        self._origin = (
+            self.x.copy(), self.y.copy(), self.speed.copy(),
+            self.xi.copy(), self.yi.copy(), self.entropy.copy(),
+        )
+
+    def set_detail(self, fraction):
+        """Keep only this fraction (0..1) of the swarm flying and drawn"""
+        self.active = min(self.count, max(0, round(self.count * fraction)))
+
+    def fly(self, dt=SIMULATION_DT):
+        """Random movement of the active fireflies over dt simulated seconds"""
+        ticks = np.float32(dt * REFERENCE_FPS)
+        (x0, x1), (y0, y1) = FIREFLY_RANGE
+        n = self.active
+        x, y, xi, yi = self.x[:n], self.y[:n], self.xi[:n], self.yi[:n]
+        speed, entropy = self.speed[:n], self.entropy[:n]
+        pointsize, color = self.pointsize[:n], self.color[:n]
+        xi[x >= x1] = False
+        xi[x <= x0] = True
+        yi[y >= y1] = False
+        yi[y <= y0] = True
+
+        # Fireflies whose entropy ran out pick a new heading and flash
+        flash = np.flatnonzero(entropy < 0)
+        if flash.size:
+            k = flash.size
+            xi[flash] = self.rng.integers(0, 1, k, endpoint=True)
+            yi[flash] = self.rng.integers(0, 1, k, endpoint=True)
+            entropy[flash] = self.rng.integers(3, 7, k, endpoint=True)
+            speed[flash] = self.rng.uniform(*FIREFLY_SPEED_RANGE, k)
+            color[flash] = FIREFLY_FLASH_COLOR
+            pointsize[flash] = 4
+
+        # The rest count down and fade back after a flash
+        calm = entropy >= 0
+        calm[flash] = False
+        entropy[calm] -= 0.01 * ticks
+        fading = calm & (pointsize > 2)
+        pointsize[fading] -= 0.1 * ticks
+        color[fading] -= 0.0025 * ticks
+
+        step = speed * ticks
+        x += np.where(xi, step, -step)
+        y += np.where(yi, step, -step)
+
+    def seek(self, ticks):
+        """Place the swarm where it would be after `ticks` reference ticks
+
+        Closed-form approximation of fly(): every firefly keeps its initial
+        heading and speed and bounces off the range bounds; the random
+        re-headings are not replayed.
+        """
+        (x0, x1), (y0, y1) = FIREFLY_RANGE
+        x, y, speed, xi, yi, entropy = self._origin
+        travel = speed * np.float32(ticks)
+        self.x, rising_x = bounce(x + np.where(xi, travel, -travel), x0, x1)
+        self.y, rising_y = bounce(y + np.where(yi, travel, -travel), y0, y1)
+        self.x = self.x.astype(np.float32)
+        self.y = self.y.astype(np.float32)
+        self.xi = rising_x == xi
+        self.yi = rising_y == yi
+        self.speed = speed.copy()
+        self.entropy = entropy.copy()
+        # Flashes are not replayed either, so every firefly is at rest
+        self.pointsize[:] = 2
+        self.color[:] = FIREFLY_NIGHT_COLOR if self._draw else FIREFLY_DAY_COLOR
+
+    def update(self, dt=SIMULATION_DT):
+        """Fireflies only move while they are visible"""
+        if self._draw and self.active:
+            self.fly(dt)
 
-    def fly(self):
-        """Random firefly movement"""
-        if self.x >= FIREFLY_RANGE[0][1]:
-            self.xi = 0
-        elif self.x <= FIREFLY_RANGE[0][0]:
-            self.xi = 1
-
-        if self.y >= FIREFLY_RANGE[1][1]:
-            self.yi = 0
-        elif self.y <= FIREFLY_RANGE[1][0]:
-            self.yi = 1
-
-        if self.entropy < 0:
-            self.xi = randint(0, 1)
-            self.yi = randint(0, 1)
-            self.entropy = randint(3, 7)
-            self.speed = uniform(0.002, 0.08)  # Slower movement
-            self.color = (0.68, 0.655, 0.407)
-            self.pointsize = 4
-        else:
-            self.entropy -= 0.01
-            if self.pointsize > 2:
-                self.pointsize -= 0.1
-                self.color = tuple(map(lambda m: m - 0.0025, self.color))
-        
-        self.x += +self.speed if self.xi else -self.speed
-        self.y += +self.speed if self.yi else -self.speed
-
-    def draw(self):
-        if self._draw:
-            glColor3f(*self.color)
-            glPointSize(self.pointsize)
-            glBegin(GL_POINTS)
-            glVertex2f(self.x, self.y)
-            glEnd()
-            self.fly()
+    def draw(self, renderer):
+        n = self.active
+        if self._draw and n:
+            verts, colors = self._vertices[:n], self._colors[:n]
+            np.multiply(_POINT_CORNERS, self.pointsize[:n, None, None], out=verts)
+            verts[..., 0] += self.x[:n, None]
+            verts[..., 1] += self.y[:n, None]
+            colors[:] = self.color[:n, None, :]
+            renderer.draw(QUADS, verts.reshape(-1, 2), colors=colors.reshape(-1, 3))
 
     def switch_time(self, time):
         self._draw = True if time == "night" else False
-        self.color = (0.63, 0.655, 0.407) if time == "night" else (0.1, 0.1, 0.1)
+        self.color[:] = FIREFLY_NIGHT_COLOR if time == "night" else FIREFLY_DAY_COLOR
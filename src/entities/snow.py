@@ -1,91 +1,172 @@
 """Snowfall effects for winter season"""
-import math
-from random import randint, uniform
-from OpenGL.GL import *
+import numpy as np
 from ..config import (
     WINDOW_SIZE, SNOWFLAKE_COUNT, SNOWFLAKE_SIZE_RANGE,
-    SNOWFLAKE_SPEED_RANGE, SNOW_COLOR
+    SNOWFLAKE_SPEED_RANGE, SNOW_COLOR, REFERENCE_FPS, SIMULATION_DT
 )
+from ..render.backend import TRIANGLES
+from .geometry import segments_for_radius, unit_disc_triangles, wrap
 
-
-class Snowflake:
-    """Single falling snowflake"""
-    def __init__(self):
-        self.reset(random_x=True)
-
-    def reset(self, random_x=False):
-        if random_x:
-            self.x = randint(0, WINDOW_SIZE[0])
-        # Start slightly above the visible area
-        self.y = -randint(0, 100)
-        self.size = randint(*SNOWFLAKE_SIZE_RANGE)
-        self.speed = uniform(*SNOWFLAKE_SPEED_RANGE)
-        # Gentle horizontal drift
-        self.drift = uniform(-0.3, 0.3)
-
-    def update(self):
-        self.y += self.speed
-        self.x += self.drift
-        if self.x < -10:
-            self.x = WINDOW_SIZE[0] + 10
-        elif self.x > WINDOW_SIZE[0] + 10:
-            self.x = -10
-        # Reset when it goes past the bottom
-        if self.y > WINDOW_SIZE[1] + 10:
-            self.reset(random_x=True)
-
-    def draw(self):
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glBegin(GL_POLYGON)
-        glColor4f(*SNOW_COLOR)
-        # Draw as a small circle
-        segments = 12
-        r = self.size
-        for i in range(segments):
-            angle = 2 * math.pi * i / segments
-            cx = self.x + r * math.cos(angle)
-            cy = self.y + r * math.sin(angle)
-            glVertex2f(cx, cy)
-        glEnd()
-        glDisable(GL_BLEND)
+# Flakes wrap horizontally / respawn once this far outside the window
+SNOW_MARGIN = 10
+# Respawned flakes start up to this many pixels above the visible area
+SNOW_SPAWN_HEIGHT = 100
+SNOW_DRIFT_RANGE = (-0.3, 0.3)
 
 
 class Snowfall:
-    """Manager for multiple snowflakes"""
-    def __init__(self, intensity_multiplier=1.0):
-        self.intensity_multiplier = intensity_multiplier
-        self.update_flake_count()
-        # Randomize starting positions across the screen
-        for f in self.flakes:
-            f.x = randint(0, WINDOW_SIZE[0])
-            f.y = randint(-WINDOW_SIZE[1] // 2, WINDOW_SIZE[1] // 2)
-
-    def update_flake_count(self):
-        """Update the number of flakes based on intensity multiplier"""
-        target_count = int(SNOWFLAKE_COUNT * self.intensity_multiplier)
-        current_count = len(self.flakes) if hasattr(self, 'flakes') else 0
-        
-        if target_count > current_count:
-            # Add more flakes
-            new_flakes = [Snowflake() for _ in range(target_count - current_count)]
-            for f in new_flakes:
-                f.x = randint(0, WINDOW_SIZE[0])
-                f.y = randint(-WINDOW_SIZE[1] // 2, WINDOW_SIZE[1] // 2)
-            if hasattr(self, 'flakes'):
-                self.flakes.extend(new_flakes)
-            else:
-                self.flakes = new_flakes
-        elif target_count < current_count:
-            # Remove flakes
-            self.flakes = self.flakes[:target_count]
+    """Pool of snowflakes stored as NumPy arrays and drawn in one call
+
+    Every flake in the pool has its state (x, y, size, speed, drift) kept in
+    parallel arrays. Only the first `active` flakes are simulated and drawn,
+    so changing intensity never reallocates the pool.
+    """
+    def __init__(self, intensity_multiplier=1.0, capacity=SNOWFLAKE_COUNT, seed=None):
+        """Initialize the flake pool
+
+        Args:
+            intensity_multiplier: Fraction of the pool that is active
+            capacity: Number of preallocated flakes (full-intensity count)
+            seed: Optional seed for reproducible snowfall
+        """
+        self.width, self.height = WINDOW_SIZE
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.empty(capacity, dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.float32)
+        self.size = np.empty(capacity, dtype=np.float32)
+        self.speed = np.empty(capacity, dtype=np.float32)
+        self.drift = np.empty(capacity, dtype=np.float32)
+        self._scatter(np.arange(capacity))
+        # Initial state, from which seek() derives any later state
+        self._origin = tuple(a.copy() for a in (self.x, self.y, self.size, self.speed, self.drift))
+        # Positions at the previous tick, used to interpolate between ticks
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+
+        # Every flake is the same triangulated disc scaled by its size; it is
+        # re-tessellated when the circle tolerance changes. The vertex buffer
+        # only holds the flakes drawn so far and grows with the active count.
+        self._disc = None
+        self._vertices = np.empty((0, 0, 2), dtype=np.float32)
+        self._draw_x = np.empty(capacity, dtype=np.float32)
+        self._draw_y = np.empty(capacity, dtype=np.float32)
+
+        self.active = 0
+        self.intensity_multiplier = 0.0
+        # Fraction of the intensity's flakes kept by the quality preset
+        self.detail = 1.0
+        self.set_intensity(intensity_multiplier)
+
+    def _respawn(self, index):
+        """Give the flakes at `index` a fresh start just above the screen"""
+        n = len(index)
+        rng = self.rng
+        self.x[index] = rng.integers(0, self.width, n, endpoint=True)
+        self.y[index] = -rng.integers(0, SNOW_SPAWN_HEIGHT, n, endpoint=True)
+        self.size[index] = rng.integers(*SNOWFLAKE_SIZE_RANGE, n, endpoint=True)
+        self.speed[index] = rng.uniform(*SNOWFLAKE_SPEED_RANGE, n)
+        self.drift[index] = rng.uniform(*SNOW_DRIFT_RANGE, n)
+
+    def _scatter(self, index):
+        """Respawn flakes and spread them over the upper half of the screen"""
+        self._respawn(index)
+        self.y[index] = self.rng.integers(
+            -self.height // 2, self.height // 2, len(index), endpoint=True
+        )
 
     def set_intensity(self, multiplier):
-        """Set snow intensity (0.0 to 1.0+)"""
+        """Set snow intensity (0.0 to 1.0+), capped by the pool capacity"""
         self.intensity_multiplier = max(0.0, multiplier)
-        self.update_flake_count()
+        target = min(self.capacity, int(self.capacity * self.intensity_multiplier * self.detail))
+        if target > self.active:
+            # Reactivated flakes re-enter scattered across the screen
+            index = np.arange(self.active, target)
+            self._scatter(index)
+            self.snap(index)
+        self.active = target
+
+    def set_detail(self, fraction):
+        """Keep only this fraction (0..1) of the flakes the intensity asks for"""
+        self.detail = max(0.0, min(1.0, fraction))
+        self.set_intensity(self.intensity_multiplier)
+
+    def _flake_disc(self, count):
+        """Unit flake disc for the current circle tolerance, with room in the
+        vertex buffer for `count` flakes"""
+        disc = unit_disc_triangles(segments_for_radius(SNOWFLAKE_SIZE_RANGE[1]))
+        if disc is not self._disc or len(self._vertices) < count:
+            self._disc = disc
+            rows = max(count, len(self._vertices))
+            self._vertices = np.empty((rows, len(disc), 2), dtype=np.float32)
+        return disc
+
+    def snap(self, index=slice(None)):
+        """Drop interpolation history for flakes that were placed directly"""
+        self.prev_x[index] = self.x[index]
+        self.prev_y[index] = self.y[index]
+
+    def seek(self, ticks):
+        """Place every flake where it would be after `ticks` reference ticks
+
+        Closed-form version of update(): flakes keep their initial size,
+        speed and drift and wrap around both axes instead of respawning with
+        new random parameters.
+        """
+        x, y, size, speed, drift = self._origin
+        t = np.float32(ticks)
+        self.size[:] = size
+        self.speed[:] = speed
+        self.drift[:] = drift
+        self.x[:] = wrap(x + drift * t, -SNOW_MARGIN, self.width + SNOW_MARGIN)
+        self.y[:] = wrap(y + speed * t, -SNOW_SPAWN_HEIGHT, self.height + SNOW_MARGIN)
+        self.snap()
+
+    def update(self, dt=SIMULATION_DT):
+        """Advance all active flakes by dt simulated seconds"""
+        n = self.active
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        ticks = np.float32(dt * REFERENCE_FPS)
+        y += self.speed[:n] * ticks
+        x += self.drift[:n] * ticks
+
+        wrapped = np.flatnonzero((x < -SNOW_MARGIN) | (x > self.width + SNOW_MARGIN))
+        if wrapped.size:
+            x[wrapped] = np.where(x[wrapped] < 0, self.width + SNOW_MARGIN, -SNOW_MARGIN)
+            self.snap(wrapped)
+
+        # Reset flakes that went past the bottom
+        fallen = np.flatnonzero(y > self.height + SNOW_MARGIN)
+        if fallen.size:
+            self._respawn(fallen)
+            self.snap(fallen)
+
+    def draw(self, renderer, alpha=1.0):
+        """Draw all active flakes in one call
+
+        Args:
+            renderer: Render backend to draw with
+            alpha: Fraction of a tick elapsed since the last update, used to
+                   interpolate between the previous and current positions
+        """
+        n = self.active
+        if n:
+            x, y = self._draw_x[:n], self._draw_y[:n]
+            a = np.float32(alpha)
+            np.subtract(self.x[:n], self.prev_x[:n], out=x)
+            x *= a
+            x += self.prev_x[:n]
+            np.subtract(self.y[:n], self.prev_y[:n], out=y)
+            y *= a
+            y += self.prev_y[:n]
+
+            disc = self._flake_disc(n)
+            verts = self._vertices[:n]
+            np.multiply(disc, self.size[:n, None, None], out=verts)
+            verts[..., 0] += x[:, None]
+            verts[..., 1] += y[:, None]
 
-    def draw(self):
-        for f in self.flakes:
-            f.draw()
-            f.update()
+            renderer.draw(TRIANGLES, verts.reshape(-1, 2), color=SNOW_COLOR, blend=True)
@@ -1,8 +1,8 @@
 """
 Improved Pine Tree Structure
 """
-from OpenGL.GL import *
 from ..config import TREE_POSITION, TREE_TRUNK_COLOR, TREE_FOLIAGE_COLOR
+from ..render.backend import POLYGON, TRIANGLES, RetainedGeometry
 
 
 class Tree:
@@ -17,44 +17,44 @@ class Tree:
         self.brightness = 1.0  # Start with full brightness for day
         self.is_night = False
         self.shadows_enabled = True
+        self._body_geometry = RetainedGeometry()
 
-    def draw_trunk(self):
+    def _draw_body(self, renderer):
+        """Foliage and trunk, kept as retained geometry"""
+        self.draw_foliage(renderer)
+        self.draw_trunk(renderer)
+
+    def draw_trunk(self, renderer):
         """Draw slightly tapered trunk"""
-        glColor3f(
+        renderer.draw(POLYGON, [
+            (self.x - 12, self.y),
+            (self.x + 12, self.y),
+            (self.x + 8, self.y - 90),
+            (self.x - 8, self.y - 90),
+        ], color=(
             self.trunk_color[0] * self.brightness,
             self.trunk_color[1] * self.brightness,
             self.trunk_color[2] * self.brightness
-        )
-        glBegin(GL_POLYGON)
-
-        glVertex2f(self.x - 12, self.y)
-        glVertex2f(self.x + 12, self.y)
-        glVertex2f(self.x + 8, self.y - 90)
-        glVertex2f(self.x - 8, self.y - 90)
-
-        glEnd()
+        ))
 
-    def draw_foliage_layer(self, top_y, width, height):
+    def draw_foliage_layer(self, renderer, top_y, width, height):
         """Draw a single triangular foliage layer"""
-        glBegin(GL_TRIANGLES)
-        glColor3f(
+        renderer.draw(TRIANGLES, [
+            (self.x, top_y),
+            (self.x - width, top_y + height),
+            (self.x + width, top_y + height),
+        ], color=(
             self.foliage_color[0] * self.brightness,
             self.foliage_color[1] * self.brightness,
             self.foliage_color[2] * self.brightness
-        )
-
-        glVertex2f(self.x, top_y)
-        glVertex2f(self.x - width, top_y + height)
-        glVertex2f(self.x + width, top_y + height)
-
-        glEnd()
+        ))
 
-    def draw_foliage(self):
+    def draw_foliage(self, renderer):
         """Draw layered pine foliage"""
-        self.draw_foliage_layer(self.y - 200, 40, 60)
-        self.draw_foliage_layer(self.y - 150, 55, 70)
+        self.draw_foliage_layer(renderer, self.y - 200, 40, 60)
+        self.draw_foliage_layer(renderer, self.y - 150, 55, 70)
 
-    def draw_shadow(self, sun_x, sun_y, sun_angle):
+    def draw_shadow(self, renderer, sun_x, sun_y, sun_angle):
         """Draw shadow cast by tree based on sun position"""
         import math
         
@@ -97,23 +97,14 @@ class Tree:
         shadow_end_y = tree_ground_y + abs(shadow_dy) * 0.3
         
         # Draw shadow
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        glBegin(GL_POLYGON)
-        glColor4f(0.0, 0.0, 0.0, 0.4)
-        
-        # Shadow base at tree (narrow)
-        glVertex2f(self.x - 35, tree_ground_y)
-        glVertex2f(self.x + 35, tree_ground_y)
-        
-        # Shadow tip (wider)
-        glVertex2f(shadow_end_x + 50, shadow_end_y)
-        glVertex2f(shadow_end_x - 50, shadow_end_y)
-        
-        glEnd()
-        
-        glDisable(GL_BLEND)
+        renderer.draw(POLYGON, [
+            # Shadow base at tree (narrow)
+            (self.x - 35, tree_ground_y),
+            (self.x + 35, tree_ground_y),
+            # Shadow tip (wider)
+            (shadow_end_x + 50, shadow_end_y),
+            (shadow_end_x - 50, shadow_end_y),
+        ], color=(0.0, 0.0, 0.0, 0.4), blend=True)
     
     def switch_time(self, time):
         """Adjust tree brightness based on time of day"""
@@ -127,10 +118,9 @@ class Tree:
     def set_shadows(self, enabled: bool):
         self.shadows_enabled = bool(enabled)
 
-    def draw(self, sun=None):
+    def draw(self, renderer, sun=None):
         """Draw complete tree with shadow"""
         if sun is not None:
-            self.draw_shadow(sun.x, sun.y, sun.angle)
+            self.draw_shadow(renderer, sun.x, sun.y, sun.angle)
 
-        self.draw_foliage()
-        self.draw_trunk()
+        renderer.cached(self._body_geometry, self.brightness, lambda: self._draw_body(renderer))
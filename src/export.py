@@ -0,0 +1,173 @@
+"""
+Frame Export
+Encodes rendered frames on background threads, so rendering does not wait
+for compression or disk writes:
+
+    with FrameWriter("timelapse/summer_{:05d}.png") as writer:
+        for frame in frames:
+            writer.write(frame)
+
+A path with a format field writes a numbered PNG sequence, one file per
+frame. Any other path writes a single animation, typed by its extension:
+.png/.apng (APNG), .webp or .gif. Pillow releases the GIL while it encodes
+and quantizes, so threads encode in parallel with rendering.
+"""
+import os
+import queue
+import threading
+
+import numpy as np
+
+from .config import (
+    EXPORT_QUEUE_SIZE, EXPORT_BACKPRESSURE, EXPORT_WORKERS, EXPORT_FPS,
+    EXPORT_PNG_COMPRESS_LEVEL, EXPORT_GIF_COLORS,
+)
+
+# Pillow format of each animation extension
+ANIMATION_FORMATS = {".png": "PNG", ".apng": "PNG", ".webp": "WEBP", ".gif": "GIF"}
+BACKPRESSURE = ("block", "drop")
+
+# Queued after the last frame, once per worker
+_DONE = None
+
+
+class FrameWriter:
+    """Bounded queue of frames encoded to disk by background threads"""
+
+    def __init__(self, path, fps=EXPORT_FPS, queue_size=EXPORT_QUEUE_SIZE,
+                 backpressure=EXPORT_BACKPRESSURE, workers=EXPORT_WORKERS):
+        """Start the encoder threads
+
+        Args:
+            path: Numbered sequence pattern such as "out/frame_{:05d}.png",
+                  or an animation file (.png/.apng, .webp or .gif)
+            fps: Playback rate of animations
+            queue_size: Frames that may wait for encoding
+            backpressure: What write() does with a full queue: "block"
+                          waits for room, "drop" discards the frame
+            workers: Encoder threads for sequences; animations are
+                     assembled in order by a single thread
+        """
+        if backpressure not in BACKPRESSURE:
+            raise ValueError(f"backpressure must be one of {BACKPRESSURE}, got {backpressure!r}")
+        self.path = path
+        self.sequence = "{" in path
+        if not self.sequence:
+            extension = os.path.splitext(path)[1].lower()
+            if extension not in ANIMATION_FORMATS:
+                raise ValueError(
+                    f"Unsupported animation type {extension!r}; use one of "
+                    f"{', '.join(ANIMATION_FORMATS)} or a numbered sequence pattern"
+                )
+            self.format = ANIMATION_FORMATS[extension]
+            workers = 1
+        self.fps = fps
+        self.backpressure = backpressure
+        # Frames accepted and frames discarded by the "drop" policy
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(queue_size)
+        self._error = None
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        target = self._encode_sequence if self.sequence else self._encode_animation
+        self._threads = [
+            threading.Thread(target=self._run, args=(target,), daemon=True, name=f"frame-writer-{i}")
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def write(self, frame):
+        """Queue a (height, width, 3) uint8 RGB frame for encoding
+
+        The frame is encoded later, so it must not be modified afterwards;
+        the offscreen renderers return a new array for every frame.
+
+        Returns:
+            False if the frame was dropped because the queue was full
+        """
+        self._raise_error()
+        if self._closed:
+            raise RuntimeError("FrameWriter is closed")
+        item = (self.written, frame)
+        if self.backpressure == "drop":
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self._queue.put(item)
+        self.written += 1
+        return True
+
+    def close(self):
+        """Encode the queued frames, finish the file(s) and stop the threads"""
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(_DONE)
+            for thread in self._threads:
+                thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Encoding {self.path} failed") from error
+
+    def _run(self, encode):
+        try:
+            encode()
+        except BaseException as error:
+            self._error = error
+            # Keep consuming so a blocked write() or close() cannot hang
+            while self._queue.get() is not _DONE:
+                pass
+
+    def _frames(self):
+        """Queued (index, frame) pairs until this thread's end marker"""
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def _encode_sequence(self):
+        from PIL import Image
+
+        for index, frame in self._frames():
+            image = Image.fromarray(np.asarray(frame, dtype=np.uint8), "RGB")
+            image.save(self.path.format(index), "PNG", compress_level=EXPORT_PNG_COMPRESS_LEVEL)
+
+    def _encode_animation(self):
+        """Convert frames as they arrive and write the file at the end
+
+        Pillow's animated writers take every frame at once, so converted
+        frames (palette images for GIF) are kept until close().
+        """
+        from PIL import Image
+
+        images = []
+        for _, frame in self._frames():
+            image = Image.fromarray(np.asarray(frame, dtype=np.uint8), "RGB")
+            if self.format == "GIF":
+                image = image.quantize(EXPORT_GIF_COLORS)
+            images.append(image)
+        if not images:
+            return
+        options = {"save_all": True, "append_images": images[1:],
+                   "duration": round(1000 / self.fps), "loop": 0}
+        if self.format == "PNG":
+            options["compress_level"] = EXPORT_PNG_COMPRESS_LEVEL
+        images[0].save(self.path, self.format, **options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,247 @@
+"""
+Frame Cache
+Precomputed days for instant playback. build_frame_cache() renders one
+full simulated day of a season into a (frames, height, width, 3) uint8
+.npy cube with a JSON index next to it; FrameCache memory-maps the cube,
+so opening it is instant whatever its size and frames are only read from
+disk when shown. Playback shows a cached day in place of a live Scene.
+"""
+import json
+import os
+from time import perf_counter
+
+import numpy as np
+
+from .config import (
+    WINDOW_SIZE, SEASON, FRAME_CACHE_DIR, FRAME_CACHE_FRAMES, FRAME_CACHE_SIZE,
+    REFERENCE_FPS, MAX_FRAME_TIME,
+)
+from .offscreen import DEFAULT_PLATFORM
+from .render.backend import RetainedGeometry
+from .scene import HUD_POSITION, hud_text, draw_label, ticks_since_midnight
+from .trace import NULL_TRACER
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def cache_paths(season, directory=FRAME_CACHE_DIR):
+    """(.npy cube, .json index) paths of a season's cache"""
+    base = os.path.join(directory, season)
+    return base + ".npy", base + ".json"
+
+
+def build_frame_cache(season=SEASON, directory=FRAME_CACHE_DIR, frames=FRAME_CACHE_FRAMES,
+                      size=FRAME_CACHE_SIZE, seed=0, workers=None, platform=DEFAULT_PLATFORM,
+                      scale=1.0):
+    """Render a full simulated day into a memory-mapped frame cube
+
+    Frames are rendered in parallel (see src.timelapse) and written
+    straight into the mapped file, so memory use does not grow with the
+    cache. The index is written last; a partly built cache has none and
+    will not open.
+
+    Args:
+        season: 'summer' or 'winter'
+        directory: Directory for <season>.npy and <season>.json
+        frames: Frames per day, evenly spaced from midnight
+        size: Frame (width, height)
+        seed: Scene seed
+        workers: Render processes (defaults to the CPU count)
+        platform: 'egl', 'osmesa' or 'software'
+        scale: Internal resolution as a fraction of size
+
+    Returns:
+        Path of the .npy cube
+    """
+    from .timelapse import frame_times, render_timelapse
+
+    cube_path, index_path = cache_paths(season, directory)
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    times = frame_times(0, MINUTES_PER_DAY, frames)
+    width, height = size
+    cube = np.lib.format.open_memmap(cube_path, "w+", np.uint8, (frames, height, width, 3))
+    for offset, frame in enumerate(render_timelapse(times, season=season, seed=seed, size=size,
+                                                    workers=workers, platform=platform,
+                                                    scale=scale)):
+        cube[offset] = frame
+    cube.flush()
+    del cube
+
+    # Live-clock position of every frame, so playback keeps the window's pace
+    index = {
+        "season": season,
+        "seed": seed,
+        "size": [width, height],
+        "frames": frames,
+        "start_minute": times[0],
+        "minute_step": MINUTES_PER_DAY / frames,
+        "ticks": [ticks_since_midnight(minutes / 60, season) for minutes in times],
+        "day_ticks": ticks_since_midnight(24, season),
+    }
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return cube_path
+
+
+class FrameCache:
+    """A season's cached day, memory-mapped read-only"""
+
+    def __init__(self, season=SEASON, directory=FRAME_CACHE_DIR):
+        cube_path, index_path = cache_paths(season, directory)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(
+                f"No frame cache for {season} in {directory!r}; "
+                f"build one with `python render.py --build-cache {season}`"
+            )
+        with open(index_path, encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.frames = np.load(cube_path, mmap_mode="r")
+        if self.frames.shape[0] != self.index["frames"]:
+            raise ValueError(f"{cube_path} does not match its index; rebuild the cache")
+        self.season = season
+        self._ticks = np.asarray(self.index["ticks"])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def offset_at_minute(self, minutes):
+        """Offset of the frame for a time in minutes since midnight, in O(1)"""
+        step = self.index["minute_step"]
+        return int((minutes - self.index["start_minute"]) // step) % len(self)
+
+    def offset_at_ticks(self, ticks):
+        """Offset of the frame shown after `ticks` live-clock ticks since midnight"""
+        day = self.index["day_ticks"]
+        ticks %= day
+        # Whole days can come back a rounding error short of a full day
+        if day - ticks < 1e-9 * day:
+            ticks = 0.0
+        return max(0, int(np.searchsorted(self._ticks, ticks, side="right")) - 1)
+
+    def minute_of(self, offset):
+        """Minutes since midnight of a frame"""
+        return self.index["start_minute"] + offset * self.index["minute_step"]
+
+    def ticks_of(self, offset):
+        """Live-clock ticks since midnight of a frame"""
+        return self._ticks[offset]
+
+    def frame(self, offset):
+        """A frame as a (height, width, 3) uint8 view, paged in on access"""
+        return self.frames[offset]
+
+
+class Playback:
+    """Plays cached days in place of a Scene
+
+    Implements the part of the Scene interface the window uses: drawing,
+    pausing, hour jumps and season toggles. Time runs at the live
+    simulation's pace, and jumping to an hour is an index lookup.
+    """
+
+    def __init__(self, hour=12, season=SEASON, directory=FRAME_CACHE_DIR):
+        """
+        Args:
+            hour: Starting hour (0-23)
+            season: Season whose cache is shown first
+            directory: Directory holding the caches
+        """
+        self.directory = directory
+        # Frames are stretched over the same coordinate space as a Scene
+        self.wsize = WINDOW_SIZE
+        self._caches = {}
+        self.cache = self._cache(season)
+        self.ticks = self.cache.ticks_of(self.cache.offset_at_minute(hour * 60))
+        self.is_paused = False
+        self.fps = None
+        self.tracer = NULL_TRACER
+        self._last_clock = None
+        self._dirty = True
+        self._image = RetainedGeometry()
+        self._hud = RetainedGeometry()
+
+    def _cache(self, season):
+        if season not in self._caches:
+            self._caches[season] = FrameCache(season, self.directory)
+        return self._caches[season]
+
+    @property
+    def season(self):
+        return self.cache.season
+
+    @property
+    def offset(self):
+        return self.cache.offset_at_ticks(self.ticks)
+
+    @property
+    def current_hour(self):
+        return int(self.cache.minute_of(self.offset) // 60) % 24
+
+    @property
+    def current_minute(self):
+        return int(self.cache.minute_of(self.offset) % 60)
+
+    @property
+    def needs_redraw(self):
+        return not self.is_paused or self._dirty
+
+    def advance(self, now=None):
+        """Move the playback clock on by the wall time since the last call"""
+        if now is None:
+            now = perf_counter()
+        if self._last_clock is not None:
+            elapsed = min(now - self._last_clock, MAX_FRAME_TIME)
+            self.ticks += elapsed * REFERENCE_FPS
+        self._last_clock = now
+
+    def draw(self, renderer, hud=True):
+        """Advance the clock (unless paused) and show the current frame"""
+        with self.tracer.frame():
+            if self.is_paused:
+                self._last_clock = None
+            else:
+                self.advance()
+            self.render(renderer, hud=hud)
+
+    def render(self, renderer, hud=True):
+        """Show the current frame without advancing the clock"""
+        self._dirty = False
+        offset = self.offset
+        renderer.begin_frame()
+        with self.tracer.span("frame image", "render"):
+            renderer.image(self._image, (self.season, offset), self.cache.frame(offset))
+        if hud:
+            self._draw_time_display(renderer)
+        renderer.end_frame()
+
+    def render_hud(self, renderer):
+        """Render only the time overlay"""
+        renderer.begin_frame()
+        self._draw_time_display(renderer)
+        renderer.end_frame()
+
+    def _draw_time_display(self, renderer):
+        text = hud_text(self.current_hour, self.current_minute, self.season, self.fps)
+        with self.tracer.span("hud", "render"):
+            renderer.cached(self._hud, text, lambda: draw_label(renderer, *HUD_POSITION, text))
+
+    def toggle_pause(self):
+        self.is_paused = not self.is_paused
+        self._dirty = True
+        return self.is_paused
+
+    def set_hour(self, hour):
+        """Jump to the first frame of an hour"""
+        self.ticks = self.cache.ticks_of(self.cache.offset_at_minute(hour * 60))
+        self._dirty = True
+        return True
+
+    def toggle_season(self):
+        """Switch to the other season's cache at the same time of day"""
+        minutes = self.cache.minute_of(self.offset)
+        self.cache = self._cache("summer" if self.season == "winter" else "winter")
+        self.ticks = self.cache.ticks_of(self.cache.offset_at_minute(minutes))
+        self._dirty = True
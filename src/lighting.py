@@ -0,0 +1,137 @@
+"""
+Lighting Lookup Tables
+Sky, ground and sun/moon glow as functions of the celestial angle, sampled
+once over the 0..π arc so per-tick lighting updates are a table lookup.
+
+Colors along the arc come from keyframed curves. By default the sky and
+ground blend from their night to their day color along sin(angle); passing
+keyframes instead (e.g. warm tints just after sunrise and before sunset)
+shapes dawn and dusk without touching the entities.
+"""
+import math
+import numpy as np
+
+from .config import (
+    LIGHTING_RESOLUTION, SKY_KEYFRAMES, GROUND_KEYFRAMES,
+    NIGHT_SKY, DAY_SKY, GRASS_DAY_COLOR, GRASS_NIGHT_COLOR, SUN_COLOR, MOON_COLOR,
+)
+
+# Sun and moon brighten as sin(angle) ** GLOW_EXPONENT, steeper than the sky
+GLOW_EXPONENT = 1.5
+
+
+def sample_keyframes(keyframes, positions):
+    """Piecewise-linear colors through keyframes
+
+    Args:
+        keyframes: Sequence of (position, (r, g, b)) with positions in 0..1
+                   along the arc (0 = rise, 1 = set), in increasing order
+        positions: Array of positions to sample at
+
+    Returns:
+        (len(positions), 3) float64 array; positions outside the keyframes
+        take the nearest end color
+    """
+    stops = np.array([position for position, _ in keyframes], dtype=np.float64)
+    colors = np.array([color for _, color in keyframes], dtype=np.float64)
+    if len(stops) == 0 or (np.diff(stops) < 0).any():
+        raise ValueError("Keyframes must be a non-empty sequence in increasing order")
+    return np.column_stack([np.interp(positions, stops, colors[:, c]) for c in range(3)])
+
+
+def _blend(start, end, weights):
+    """start + (end - start) * w for each weight, as an (n, 3) array"""
+    start, end = np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64)
+    return start + (end - start) * weights[:, None]
+
+
+def _as_tuples(array):
+    return [tuple(row) for row in array.tolist()]
+
+
+class LightingTable:
+    """Precomputed lighting for every step of a celestial arc
+
+    Arc tables are indexed by angle (0..π) and transition tables by the
+    night transition's progress (0..1), each with resolution + 1 entries.
+    Lookups return prebuilt tuples, so they allocate nothing.
+    """
+
+    def __init__(self, resolution=LIGHTING_RESOLUTION,
+                 sky_keyframes=SKY_KEYFRAMES, ground_keyframes=GROUND_KEYFRAMES):
+        """
+        Args:
+            resolution: Number of steps the arc and the transition are split into
+            sky_keyframes: Optional (position, rgb) sky curve over the day arc;
+                           None blends NIGHT_SKY to DAY_SKY along sin(angle)
+            ground_keyframes: Same for the ground, between the grass colors
+        """
+        self.resolution = resolution
+        steps = np.linspace(0.0, 1.0, resolution + 1)
+        daylight = np.maximum(np.sin(steps * math.pi), 0.0)
+
+        if sky_keyframes is None:
+            sky = _blend(NIGHT_SKY, DAY_SKY, daylight)
+        else:
+            sky = sample_keyframes(sky_keyframes, steps)
+        if ground_keyframes is None:
+            ground = _blend(GRASS_NIGHT_COLOR, GRASS_DAY_COLOR, daylight)
+        else:
+            ground = sample_keyframes(ground_keyframes, steps)
+        glow = daylight ** GLOW_EXPONENT
+
+        self._daylight = daylight.tolist()
+        self._sky = _as_tuples(sky)
+        self._ground = _as_tuples(ground)
+        self._sun = _as_tuples(np.column_stack((np.tile(SUN_COLOR, (len(glow), 1)), glow)))
+        self._moon = _as_tuples(np.column_stack((np.tile(MOON_COLOR, (len(glow), 1)), glow)))
+        # Day-to-night fades, linear in the transition progress
+        self._dusk_sky = _as_tuples(_blend(DAY_SKY, NIGHT_SKY, steps))
+        self._dusk_ground = _as_tuples(_blend(GRASS_DAY_COLOR, GRASS_NIGHT_COLOR, steps))
+
+    def _arc_index(self, angle):
+        index = int(angle * (self.resolution / math.pi) + 0.5)
+        return min(max(index, 0), self.resolution)
+
+    def _progress_index(self, progress):
+        index = int(progress * self.resolution + 0.5)
+        return min(max(index, 0), self.resolution)
+
+    def daylight(self, angle):
+        """sin(angle) clamped at 0: how high the body stands over the horizon"""
+        return self._daylight[self._arc_index(angle)]
+
+    def sky(self, angle):
+        """Sky RGB with the sun at angle"""
+        return self._sky[self._arc_index(angle)]
+
+    def ground(self, angle):
+        """Ground RGB with the sun at angle"""
+        return self._ground[self._arc_index(angle)]
+
+    def sun(self, angle):
+        """Sun RGBA at angle, alpha following the glow curve"""
+        return self._sun[self._arc_index(angle)]
+
+    def moon(self, angle):
+        """Moon RGBA at angle, alpha following the glow curve"""
+        return self._moon[self._arc_index(angle)]
+
+    def dusk_sky(self, progress):
+        """Sky RGB partway (0..1) through the fade from day to night"""
+        return self._dusk_sky[self._progress_index(progress)]
+
+    def dusk_ground(self, progress):
+        """Ground RGB partway (0..1) through the fade from day to night"""
+        return self._dusk_ground[self._progress_index(progress)]
+
+
+_default = None
+
+
+def default_lighting():
+    """The shared table built from config, created on first use"""
+    global _default
+    if _default is None:
+        _default = LightingTable()
+    return _default
@@ -0,0 +1,45 @@
+"""
+Least-Recently-Used Cache
+A count-bounded LRU for resources that have to be freed explicitly: an
+optional release callback is given every entry that is evicted or cleared,
+so backends can delete display lists and workers can close contexts.
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Least-recently-used cache, one entry per key"""
+
+    def __init__(self, capacity, release=None):
+        """
+        Args:
+            capacity: Number of entries kept before the oldest is dropped
+            release: Optional callable given each evicted entry, to free
+                     resources such as display lists or GL contexts
+        """
+        self.capacity = capacity
+        self.release = release
+        self._entries = OrderedDict()
+
+    def get(self, key, build):
+        """The entry for key, calling build() to create it on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        entry = self._entries[key] = build()
+        while len(self._entries) > self.capacity:
+            _, evicted = self._entries.popitem(last=False)
+            if self.release is not None:
+                self.release(evicted)
+        return entry
+
+    def clear(self):
+        """Drop every entry, releasing each one"""
+        entries, self._entries = self._entries, OrderedDict()
+        if self.release is not None:
+            for entry in entries.values():
+                self.release(entry)
+
+    def __len__(self):
+        return len(self._entries)
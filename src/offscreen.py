@@ -0,0 +1,296 @@
+"""
+Headless Offscreen Rendering
+Renders a Scene into an offscreen framebuffer without a window and returns
+the pixels as NumPy arrays. Works on GPU-less machines through Mesa's
+software rasterizer, using either a surfaceless EGL context or OSMesa, or
+without any GL library through the NumPy rasterizer ('software').
+
+PyOpenGL picks its platform when OpenGL is first imported, so call
+use_platform() before importing src.scene (or anything else that imports
+OpenGL.GL).
+"""
+import ctypes
+import os
+import sys
+
+import numpy as np
+
+from .config import WINDOW_SIZE
+
+GL_PLATFORMS = ("egl", "osmesa")
+PLATFORMS = GL_PLATFORMS + ("software",)
+DEFAULT_PLATFORM = "egl"
+
+# From EGL_MESA_platform_surfaceless; not exported by PyOpenGL
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def use_platform(platform=DEFAULT_PLATFORM):
+    """Select the PyOpenGL platform used for offscreen contexts
+
+    'software' needs no GL, so it leaves PyOpenGL alone.
+
+    Raises:
+        ValueError: Unknown platform name
+        RuntimeError: OpenGL was already imported for a different platform
+    """
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform {platform!r}, expected one of {PLATFORMS}")
+    if platform not in GL_PLATFORMS:
+        return
+    current = os.environ.get("PYOPENGL_PLATFORM")
+    if "OpenGL.GL" in sys.modules and current != platform:
+        raise RuntimeError(
+            f"OpenGL was already imported for platform {current!r}; "
+            f"call use_platform({platform!r}) before importing src.scene"
+        )
+    os.environ["PYOPENGL_PLATFORM"] = platform
+
+
+class _EGLContext:
+    """Surfaceless EGL context (Mesa); rendering goes to an FBO"""
+
+    def __init__(self):
+        from OpenGL import EGL
+        from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+
+        self.EGL = EGL
+        self.display = eglGetPlatformDisplayEXT(
+            EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None
+        )
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("eglInitialize failed for the surfaceless platform")
+
+        attributes = (EGL.EGLint * 5)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        )
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, attributes, ctypes.pointer(config), 1,
+                                   ctypes.pointer(count)) or count.value < 1:
+            raise RuntimeError("No EGL config with desktop OpenGL support")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not self.context:
+            raise RuntimeError("eglCreateContext failed")
+        if not EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE,
+                                  self.context):
+            raise RuntimeError("eglMakeCurrent failed")
+
+    def close(self):
+        EGL = self.EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE,
+                           EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
+
+
+class _OSMesaContext:
+    """OSMesa context rendering into a client-side buffer; we still use an FBO"""
+
+    def __init__(self, width, height):
+        from OpenGL import osmesa
+        from OpenGL import arrays
+        from OpenGL.GL import GL_UNSIGNED_BYTE
+
+        self.osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("OSMesaCreateContextExt failed")
+        self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL_UNSIGNED_BYTE,
+                                        width, height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+
+    def close(self):
+        self.osmesa.OSMesaDestroyContext(self.context)
+
+
+class OffscreenRenderer:
+    """Renders scenes into an offscreen framebuffer and reads them back"""
+
+    def __init__(self, size=WINDOW_SIZE, platform=DEFAULT_PLATFORM):
+        """Create the GL context and framebuffer
+
+        Args:
+            size: Output (width, height); the scene is scaled to fit
+            platform: 'egl' (surfaceless Mesa) or 'osmesa'
+        """
+        use_platform(platform)
+        self.width, self.height = size
+        if platform == "egl":
+            self._context = _EGLContext()
+        else:
+            self._context = _OSMesaContext(self.width, self.height)
+        self._create_framebuffer()
+
+        from .render.commands import CommandBuffer
+        from .render.gl import GLBackend
+        self._backend = CommandBuffer(GLBackend())
+
+    def _create_framebuffer(self):
+        from OpenGL.GL import (
+            glGenFramebuffers, glBindFramebuffer, glGenRenderbuffers, glBindRenderbuffer,
+            glRenderbufferStorage, glFramebufferRenderbuffer, glCheckFramebufferStatus,
+            GL_FRAMEBUFFER, GL_RENDERBUFFER, GL_RGBA8, GL_COLOR_ATTACHMENT0,
+            GL_FRAMEBUFFER_COMPLETE,
+        )
+        self.framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        self.renderbuffer = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.renderbuffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, self.width, self.height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER,
+                                  self.renderbuffer)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Offscreen framebuffer is incomplete")
+
+    def render(self, scene, hud=False):
+        """Render the scene's current state without advancing its clock
+
+        Args:
+            scene: Scene to draw
+            hud: Whether to include the time overlay (needs an initialized
+                 GLUT for its bitmap font, so it is off by default)
+
+        Returns:
+            (height, width, 3) uint8 RGB array, top row first
+        """
+        from OpenGL.GL import (
+            glBindFramebuffer, glViewport, glMatrixMode, glLoadIdentity, glOrtho,
+            glClearColor, glClear, glFinish, glReadPixels, glPixelStorei,
+            GL_FRAMEBUFFER, GL_PROJECTION, GL_MODELVIEW, GL_COLOR_BUFFER_BIT,
+            GL_PACK_ALIGNMENT, GL_RGB, GL_UNSIGNED_BYTE,
+        )
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        glViewport(0, 0, self.width, self.height)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        # Scene coordinates are in WINDOW_SIZE pixels, y pointing down
+        glOrtho(0.0, scene.wsize[0], scene.wsize[1], 0, 0.0, 1.0)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glClearColor(0.0, 0.0, 0.0, 1.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        scene.render(self._backend, hud=hud)
+        glFinish()
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        frame = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)
+        # GL rows start at the bottom
+        return np.ascontiguousarray(frame[::-1])
+
+    def close(self):
+        """Release the framebuffer and context"""
+        from OpenGL.GL import glDeleteFramebuffers, glDeleteRenderbuffers
+        glDeleteRenderbuffers(1, [self.renderbuffer])
+        glDeleteFramebuffers(1, [self.framebuffer])
+        self._context.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SoftwareRenderer:
+    """OffscreenRenderer counterpart that rasterizes in NumPy, without GL"""
+
+    def __init__(self, size=WINDOW_SIZE):
+        """
+        Args:
+            size: Output (width, height); the scene is scaled to fit
+        """
+        from .render.commands import CommandBuffer
+        from .render.software import SoftwareBackend
+        self.width, self.height = size
+        self._raster = SoftwareBackend(size)
+        self._backend = CommandBuffer(self._raster)
+
+    def render(self, scene, hud=False):
+        """Render the scene's current state without advancing its clock
+
+        Args:
+            scene: Scene to draw
+            hud: Whether to include the time overlay
+
+        Returns:
+            (height, width, 3) uint8 RGB array, top row first
+        """
+        scene.render(self._backend, hud=hud)
+        return self._raster.frame()
+
+    def close(self):
+        """Nothing to release; kept for parity with OffscreenRenderer"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ScaledRenderer:
+    """Renders at a fraction of the output size and upscales the result
+
+    Rasterizing fewer pixels is what makes the software renderer faster;
+    frames are enlarged to the output size by nearest-neighbour sampling.
+    """
+
+    def __init__(self, renderer, size):
+        """
+        Args:
+            renderer: Renderer producing the smaller frames
+            size: Output (width, height)
+        """
+        self.renderer = renderer
+        self.width, self.height = size
+        # Source row and column of every output pixel
+        self._rows = np.arange(self.height) * renderer.height // self.height
+        self._cols = np.arange(self.width) * renderer.width // self.width
+
+    def render(self, scene, hud=False):
+        """Render the scene and return it as an output-sized RGB array"""
+        frame = self.renderer.render(scene, hud=hud)
+        # Separate passes per axis are several times faster than one 2-D index
+        return frame.take(self._rows, axis=0).take(self._cols, axis=1)
+
+    def close(self):
+        self.renderer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def create_renderer(size=WINDOW_SIZE, platform=DEFAULT_PLATFORM, scale=1.0):
+    """OffscreenRenderer for a GL platform, SoftwareRenderer for 'software'
+
+    Args:
+        size: Output (width, height)
+        platform: 'egl', 'osmesa' or 'software'
+        scale: Internal resolution as a fraction of size; below 1 frames
+               are rendered smaller and upscaled (see ScaledRenderer)
+    """
+    inner = size
+    if scale != 1:
+        inner = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+    if platform == "software":
+        renderer = SoftwareRenderer(inner)
+    else:
+        renderer = OffscreenRenderer(inner, platform)
+    return renderer if inner == size else ScaledRenderer(renderer, size)
+
+
+def save_png(frame, path):
+    """Write an RGB frame array to a PNG file"""
+    from PIL import Image
+    Image.fromarray(frame, "RGB").save(path)
@@ -0,0 +1,99 @@
+"""
+Adaptive Quality
+Steps a scene through the QUALITY_PRESETS so its frame time stays within
+budget on whatever machine it runs on, without hand-tuning per display.
+
+Every frame, a high percentile of the most recent frame times (a rolling
+window) is compared with the budget rather than their mean, so occasional
+hitches do not count but sustained slowness does, and is acted on within a
+few frames. Two mechanisms keep the preset from oscillating:
+
+- Stepping down happens as soon as the percentile is over budget; stepping
+  up needs it to stay below QUALITY_UPGRADE_HEADROOM of the budget for a
+  whole window, leaving a band in which nothing changes.
+- Every time a preset proves too slow, the number of calm windows needed
+  before trying it again doubles.
+
+The window is emptied after every change, so each preset is judged only on
+frames rendered with it.
+"""
+import math
+from collections import Counter, deque
+
+from .config import (
+    TARGET_FPS, QUALITY_PRESETS, QUALITY_PERCENTILE, QUALITY_WINDOW,
+    QUALITY_UPGRADE_HEADROOM,
+)
+
+# Retrying a preset that failed waits at most 2**MAX_BACKOFF windows
+MAX_BACKOFF = 5
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (0-100) of a non-empty sequence"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class QualityGovernor:
+    """Chooses a scene's quality preset from its measured frame times"""
+
+    def __init__(self, scene, budget=1.0 / TARGET_FPS, pct=QUALITY_PERCENTILE,
+                 window=QUALITY_WINDOW, headroom=QUALITY_UPGRADE_HEADROOM):
+        """
+        Args:
+            scene: Scene whose preset is managed (see Scene.set_quality)
+            budget: Frame time to stay within, in seconds
+            pct: Percentile of the window's frame times compared to budget
+            window: Number of most recent frames the percentile covers
+            headroom: Fraction of budget the percentile must stay under
+                      before a finer preset is tried
+        """
+        self.scene = scene
+        self.budget = budget
+        self.pct = pct
+        self.window = window
+        self.headroom = headroom
+        # Preset names from cheapest to finest
+        self.levels = list(QUALITY_PRESETS)
+        self._times = deque(maxlen=window)
+        # Consecutive frames after which the full window was under headroom
+        self._calm = 0
+        # Times each preset had to be left for being too slow
+        self._failures = Counter()
+
+    @property
+    def level(self):
+        return self.levels.index(self.scene.quality)
+
+    def record(self, seconds):
+        """Add one frame's time; returns the new preset name if it changed"""
+        self._times.append(seconds)
+        if len(self._times) < self.window:
+            return None
+        slowest = percentile(self._times, self.pct)
+
+        level = self.level
+        if slowest > self.budget:
+            self._calm = 0
+            if level > 0:
+                self._failures[level] += 1
+                return self._step(level - 1)
+        elif slowest < self.budget * self.headroom and level < len(self.levels) - 1:
+            self._calm += 1
+            # The first calm frame already closes one calm window
+            windows = 2 ** min(self._failures[level + 1], MAX_BACKOFF)
+            if self._calm > (windows - 1) * self.window:
+                return self._step(level + 1)
+        else:
+            self._calm = 0
+        return None
+
+    def _step(self, level):
+        name = self.levels[level]
+        self.scene.set_quality(name)
+        # Judge the new preset only on its own frames
+        self._times.clear()
+        self._calm = 0
+        return name
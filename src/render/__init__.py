@@ -0,0 +1,34 @@
+"""Render backends the scene draws through
+
+Only the backend interface is imported eagerly. The backends themselves
+load on first use, so the simulation can be imported without them, and
+GLBackend (src.render.gl) only imports OpenGL when it is asked for.
+"""
+from .backend import (
+    RenderBackend, RetainedGeometry,
+    POINTS, LINES, LINE_STRIP, TRIANGLES, QUADS, POLYGON, PRIMITIVES,
+)
+
+# Lazily imported names and the submodule defining each
+_LAZY = {
+    'SoftwareBackend': 'software',
+    'CountingBackend': 'counting',
+    'CommandBuffer': 'commands',
+    'GLBackend': 'gl',
+    'RenderTarget': 'gl',
+}
+
+__all__ = [
+    'RenderBackend', 'RetainedGeometry', 'SoftwareBackend', 'CountingBackend',
+    'CommandBuffer', 'GLBackend', 'RenderTarget',
+    'POINTS', 'LINES', 'LINE_STRIP', 'TRIANGLES', 'QUADS', 'POLYGON', 'PRIMITIVES',
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    globals()[name] = value
+    return value
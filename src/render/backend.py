@@ -0,0 +1,133 @@
+"""
+Render Backend Interface
+Entities describe what to draw through a backend instead of calling OpenGL
+directly, so the same scene can be drawn with OpenGL or rasterized in NumPy.
+"""
+import weakref
+
+# Primitive types, matching the OpenGL primitives the entities used
+POINTS = "points"
+LINES = "lines"
+LINE_STRIP = "line_strip"
+TRIANGLES = "triangles"
+QUADS = "quads"
+POLYGON = "polygon"
+
+PRIMITIVES = (POINTS, LINES, LINE_STRIP, TRIANGLES, QUADS, POLYGON)
+
+# Key that never matches, marking invalidated geometry
+_STALE = object()
+
+
+class RetainedGeometry:
+    """Handle for geometry a backend may keep between frames
+
+    The key describes the state the geometry depends on; backends that
+    retain geometry (display lists, recorded commands) rebuild it only when
+    the key changes. Each backend keeps its own entry, so the same entity
+    can be drawn by several backends.
+    """
+
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+
+    def lookup(self, backend, key):
+        """The handle the backend stored for this key, or None if stale"""
+        entry = self._entries.get(backend)
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1]
+
+    def previous(self, backend):
+        """The backend's last handle regardless of key, for reuse on rebuild"""
+        entry = self._entries.get(backend)
+        return None if entry is None else entry[1]
+
+    def store(self, backend, key, handle):
+        """Remember the handle the backend built for this key"""
+        self._entries[backend] = (key, handle)
+
+    def invalidate(self):
+        """Force a rebuild on the next draw, for every backend"""
+        for backend, (key, handle) in list(self._entries.items()):
+            self._entries[backend] = (_STALE, handle)
+
+
+class RenderBackend:
+    """Base class for render backends
+
+    Coordinates are scene pixels (WINDOW_SIZE, y pointing down); backends
+    scale them to their own output size.
+    """
+
+    # Whether cached() keeps geometry between frames (display lists) rather
+    # than calling build every frame
+    retains_geometry = False
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        """Draw one primitive batch
+
+        Args:
+            mode: One of PRIMITIVES. POLYGON draws a single polygon, the
+                  other modes draw every primitive in `vertices`
+            vertices: (n, 2) array-like of x, y positions
+            color: RGB or RGBA color for the whole batch
+            colors: (n, 3) or (n, 4) per-vertex colors, instead of `color`
+            blend: Alpha-blend onto what is already drawn
+            size: Point size (POINTS) or line width (LINES, LINE_STRIP) in pixels
+        """
+        raise NotImplementedError
+
+    def cached(self, geometry, key, build):
+        """Draw geometry that only changes when `key` changes
+
+        Args:
+            geometry: RetainedGeometry handle owned by the caller
+            key: Hashable description of the state the geometry depends on
+            build: Callable issuing the draw calls for the geometry
+
+        Backends without retained geometry simply call build every frame.
+        """
+        build()
+
+    def layer(self, geometry, key, build):
+        """Draw static content through a cached image layer
+
+        Backends that support layers render `build` into an offscreen image
+        only when `key` changes and composite that image every frame.
+        Blended content keeps its transparency, so a layer can sit on top of
+        dynamic content drawn before it.
+
+        Args:
+            geometry: RetainedGeometry handle owned by the caller
+            key: Hashable description of everything the layer shows
+            build: Callable issuing the draw calls for the layer
+
+        Backends without layers simply call build every frame.
+        """
+        build()
+
+    def image(self, geometry, key, pixels):
+        """Draw an RGB image stretched over the whole scene
+
+        Args:
+            geometry: RetainedGeometry handle owned by the caller
+            key: Hashable identity of the image; backends that keep it
+                 (as a texture) only upload it again when key changes
+            pixels: (height, width, 3) uint8 array, top row first
+        """
+        raise NotImplementedError
+
+    def text(self, x, y, text, color):
+        """Draw a line of HUD text with its baseline at (x, y)"""
+        raise NotImplementedError
+
+    def text_width(self, text):
+        """Width in scene pixels of a line of HUD text"""
+        raise NotImplementedError
+
+    def begin_frame(self):
+        """Prepare for a new frame"""
+
+    def end_frame(self):
+        """Finish the current frame"""
@@ -0,0 +1,255 @@
+"""
+Per-Frame Command Buffer
+Records the draw calls of a frame instead of executing them, then merges
+commands that share render state into a few large array draws for the
+backend it wraps.
+
+Filled primitives (triangles, quads, polygons) all become triangles and
+line strips become line segments, so the only state left to tell commands
+apart is the primitive type, the blend flag and the point size or line
+width. A command may join an earlier batch with the same state as long as
+it does not overlap anything drawn in between, which keeps the frame
+identical to drawing the commands in order. Text and images are recorded
+too, as barriers no batch is merged across, so retained geometry can
+include them.
+
+Retained geometry is recorded once per key and replayed into the buffer.
+When the target backend retains geometry itself (GL display lists), plain
+draws are handed to it instead, merged once when the key changes, so the
+target replays them with a single call.
+"""
+import numpy as np
+
+from .backend import (
+    RenderBackend, POINTS, LINES, LINE_STRIP, TRIANGLES, QUADS, POLYGON,
+)
+from .raster import triangle_indices
+
+
+class Command:
+    """One recorded draw call, normalized to a mergeable primitive"""
+
+    __slots__ = ("mode", "vertices", "colors", "blend", "size", "bounds")
+
+    def __init__(self, mode, vertices, colors, blend, size):
+        self.mode = mode
+        self.vertices = vertices
+        self.colors = colors
+        self.blend = blend
+        self.size = size
+        # Screen-space bounding box, grown by half the point size/line width
+        pad = size / 2 if mode in (POINTS, LINES) else 0.0
+        low = vertices.min(axis=0) - pad
+        high = vertices.max(axis=0) + pad
+        self.bounds = (low[0], low[1], high[0], high[1])
+
+    @property
+    def state(self):
+        return (self.mode, self.blend, self.size if self.mode in (POINTS, LINES) else None)
+
+
+class TextCommand:
+    """One recorded line of HUD text"""
+
+    __slots__ = ("x", "y", "text", "color")
+
+    def __init__(self, x, y, text, color):
+        self.x = x
+        self.y = y
+        self.text = text
+        self.color = color
+
+
+class ImageCommand:
+    """One recorded full-scene image"""
+
+    __slots__ = ("geometry", "key", "pixels")
+
+    def __init__(self, geometry, key, pixels):
+        self.geometry = geometry
+        self.key = key
+        self.pixels = pixels
+
+
+class _Batch:
+    """Commands with identical state, drawn with a single backend call"""
+
+    __slots__ = ("state", "commands", "bounds")
+
+    def __init__(self, command):
+        self.state = command.state
+        self.commands = [command]
+        self.bounds = command.bounds
+
+    def add(self, command):
+        self.commands.append(command)
+        x0, y0, x1, y1 = self.bounds
+        a0, b0, a1, b1 = command.bounds
+        self.bounds = (min(x0, a0), min(y0, b0), max(x1, a1), max(y1, b1))
+
+    def overlaps(self, bounds):
+        x0, y0, x1, y1 = self.bounds
+        a0, b0, a1, b1 = bounds
+        return a0 < x1 and x0 < a1 and b0 < y1 and y0 < b1
+
+
+class CommandBuffer(RenderBackend):
+    """Render backend that batches a frame's draw calls for another backend
+
+    Use it like any backend between begin_frame() and end_frame(); nothing
+    reaches the wrapped backend until end_frame(). Retained geometry is
+    recorded once per key and replayed into the buffer on later frames.
+    """
+
+    def __init__(self, target):
+        """
+        Args:
+            target: Backend that executes the merged batches
+        """
+        self.target = target
+        self._commands = []
+        # Draw calls recorded and batches executed since reset_stats()
+        self.stats = {"commands": 0, "batches": 0}
+
+    def begin_frame(self):
+        self._commands = []
+        self.target.begin_frame()
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 2)
+        if not len(vertices):
+            return
+        if colors is None:
+            colors = np.broadcast_to(_rgba(color), (len(vertices), 4))
+        else:
+            colors = np.asarray(colors, dtype=np.float32)
+            if colors.shape[1] == 3:
+                colors = np.column_stack((colors, np.ones(len(colors), dtype=np.float32)))
+
+        if mode in (TRIANGLES, QUADS, POLYGON):
+            index = triangle_indices(mode, len(vertices))
+            # Flat color per triangle, as the backends draw them
+            vertices = vertices[index].reshape(-1, 2)
+            colors = np.repeat(colors[index[:, 0]], 3, axis=0)
+            mode = TRIANGLES
+        elif mode == LINE_STRIP:
+            segments = np.arange(len(vertices) - 1)
+            index = np.column_stack((segments, segments + 1)).reshape(-1)
+            vertices, colors = vertices[index], colors[index]
+            mode = LINES
+        if len(vertices):
+            self._commands.append(Command(mode, vertices, colors, blend, size))
+
+    def cached(self, geometry, key, build):
+        """Replay recorded commands for geometry, recording them if key changed
+
+        Geometry without text or images goes to the target's own cached()
+        when the target retains geometry, after drawing everything recorded
+        before it.
+        """
+        commands = geometry.lookup(self, key)
+        if commands is None:
+            outer = self._commands
+            self._commands = []
+            build()
+            commands = self._commands
+            geometry.store(self, key, commands)
+            self._commands = outer
+        if self.target.retains_geometry and all(isinstance(c, Command) for c in commands):
+            self.flush()
+            self.target.cached(geometry, key, lambda: self._execute(commands))
+        else:
+            self._commands.extend(commands)
+
+    def layer(self, geometry, key, build):
+        """Pass a layer to the target, batching its draws when it is rebuilt"""
+        # Everything recorded so far lies underneath the layer
+        self.flush()
+
+        def replay():
+            outer = self._commands
+            self._commands = []
+            build()
+            self.flush()
+            self._commands = outer
+
+        self.target.layer(geometry, key, replay)
+
+    def text_width(self, text):
+        return self.target.text_width(text)
+
+    def text(self, x, y, text, color):
+        # Text is drawn after everything recorded so far
+        self._commands.append(TextCommand(x, y, text, color))
+
+    def image(self, geometry, key, pixels):
+        # Covers everything recorded so far
+        self._commands.append(ImageCommand(geometry, key, pixels))
+
+    def end_frame(self):
+        self.flush()
+        self.target.end_frame()
+
+    def flush(self):
+        """Merge the recorded commands and draw them on the target backend"""
+        commands, self._commands = self._commands, []
+        self.stats["commands"] += len(commands)
+        run = []
+        for command in commands:
+            if isinstance(command, TextCommand):
+                self._execute(run)
+                run = []
+                self.target.text(command.x, command.y, command.text, command.color)
+            elif isinstance(command, ImageCommand):
+                self._execute(run)
+                run = []
+                self.target.image(command.geometry, command.key, command.pixels)
+            else:
+                run.append(command)
+        self._execute(run)
+
+    def _execute(self, commands):
+        """Draw a run of commands as merged batches"""
+        batches = self._merge(commands)
+        self.stats["batches"] += len(batches)
+        for batch in batches:
+            mode, blend, size = batch.state
+            vertices = np.concatenate([c.vertices for c in batch.commands])
+            colors = np.concatenate([c.colors for c in batch.commands])
+            if (colors == colors[0]).all():
+                self.target.draw(mode, vertices, color=tuple(colors[0].tolist()),
+                                 blend=blend, size=size or 1.0)
+            else:
+                self.target.draw(mode, vertices, colors=colors, blend=blend, size=size or 1.0)
+
+    def reset_stats(self):
+        """Zero the command and batch counters"""
+        self.stats = dict.fromkeys(self.stats, 0)
+
+    @staticmethod
+    def _merge(commands):
+        """Group commands into batches without changing what the frame shows
+
+        Each command joins the latest batch with its state, unless a batch
+        drawn after that one overlaps it; then it starts a new batch.
+        """
+        batches = []
+        for command in commands:
+            state = command.state
+            for batch in reversed(batches):
+                if batch.state == state:
+                    batch.add(command)
+                    break
+                if batch.overlaps(command.bounds):
+                    batches.append(_Batch(command))
+                    break
+            else:
+                batches.append(_Batch(command))
+        return batches
+
+
+def _rgba(color):
+    """A color as a float32 RGBA row, opaque when no alpha is given"""
+    rgba = np.ones(4, dtype=np.float32)
+    rgba[:len(color)] = color
+    return rgba
@@ -0,0 +1,51 @@
+"""
+Counting Render Backend
+Accepts draw calls without drawing anything and tallies them, so the
+Python cost of issuing a frame can be measured with no GL context or
+display (see benchmark.py).
+"""
+from collections import Counter
+
+import numpy as np
+
+from .backend import RenderBackend
+
+
+class CountingBackend(RenderBackend):
+    """Render backend that only counts what it is asked to draw
+
+    Retained geometry and layers are rebuilt every frame, so every entity
+    issues its full set of draw calls on every frame.
+    """
+
+    def __init__(self):
+        # Draw calls and vertices per primitive type, plus text lines and images
+        self.calls = Counter()
+        self.vertices = Counter()
+        self.texts = 0
+        self.images = 0
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        self.calls[mode] += 1
+        self.vertices[mode] += len(np.asarray(vertices).reshape(-1, 2))
+
+    def text(self, x, y, text, color):
+        self.texts += 1
+
+    def image(self, geometry, key, pixels):
+        self.images += 1
+
+    def text_width(self, text):
+        # Roughly GLUT's Helvetica 18 average advance
+        return 10 * len(text)
+
+    def reset(self):
+        """Zero all counters"""
+        self.calls.clear()
+        self.vertices.clear()
+        self.texts = 0
+        self.images = 0
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values()) + self.texts + self.images
@@ -0,0 +1,350 @@
+"""
+OpenGL Render Backend
+Submits draw calls as client-side vertex arrays, keeps retained geometry
+in display lists and caches static layers in framebuffer-object textures.
+Needs a current GL context; HUD text also needs GLUT and is kept in one
+display list per string.
+
+This backend replaces the GL helpers entities used to call directly:
+draw_arrays() moved here from entities/glarrays.py, and the display lists
+of entities/display_list.py became cached() with RetainedGeometry handles.
+"""
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLUT import glutBitmapCharacter, glutBitmapWidth, GLUT_BITMAP_HELVETICA_18
+
+from ..config import WINDOW_SIZE
+from .backend import RenderBackend, POINTS, LINES, LINE_STRIP, TRIANGLES, QUADS, POLYGON
+from .text import TextCache
+
+_GL_MODES = {
+    POINTS: GL_POINTS,
+    LINES: GL_LINES,
+    LINE_STRIP: GL_LINE_STRIP,
+    TRIANGLES: GL_TRIANGLES,
+    QUADS: GL_QUADS,
+    POLYGON: GL_POLYGON,
+}
+
+
+def draw_arrays(mode, vertices, colors=None):
+    """Draw a primitive batch from client-side arrays in a single call
+
+    Args:
+        mode: GL primitive type (GL_POLYGON, GL_TRIANGLES, ...)
+        vertices: (n, 2) array of x, y positions
+        colors: Optional (n, 3) or (n, 4) array of per-vertex colors;
+                the current GL color is used when omitted
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, vertices)
+    if colors is not None:
+        colors = np.ascontiguousarray(colors, dtype=np.float32)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(colors.shape[1], GL_FLOAT, 0, colors)
+    glDrawArrays(mode, 0, len(vertices))
+    if colors is not None:
+        glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+class GLBackend(RenderBackend):
+    """Render backend drawing into the current OpenGL context"""
+
+    def __init__(self, scene_size=WINDOW_SIZE, font=GLUT_BITMAP_HELVETICA_18):
+        """
+        Args:
+            scene_size: Size of the scene coordinate space set up by the
+                        caller's projection
+            font: GLUT bitmap font used for HUD text
+        """
+        self.scene_size = scene_size
+        self.font = font
+        # Last blend state set, so repeated draws skip redundant toggles;
+        # None means unknown (e.g. after replaying a display list)
+        self._blend = None
+        # True while rendering into a layer texture
+        self._in_layer = False
+        # True while compiling a display list, which cannot nest another
+        self._compiling = False
+        # Per string: [width, display list id or None]
+        self._strings = TextCache(release=self._release_string)
+
+    def _set_blend(self, blend):
+        if blend == self._blend:
+            return
+        if blend:
+            glEnable(GL_BLEND)
+            if self._in_layer:
+                # Accumulate coverage in alpha so the texture ends up
+                # premultiplied and can be composited over other content
+                glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
+                                    GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+            else:
+                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        else:
+            glDisable(GL_BLEND)
+        self._blend = blend
+
+    def begin_frame(self):
+        self._blend = None
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        self._set_blend(blend)
+        if mode == POINTS:
+            glPointSize(size)
+        elif mode in (LINES, LINE_STRIP):
+            glLineWidth(size)
+        if colors is None:
+            self._set_color(color)
+        draw_arrays(_GL_MODES[mode], vertices, colors)
+
+    @staticmethod
+    def _set_color(color):
+        if len(color) == 4:
+            glColor4f(*color)
+        else:
+            glColor3f(*color)
+
+    retains_geometry = True
+
+    def cached(self, geometry, key, build):
+        """Replay the geometry's display list, recompiling it if key changed"""
+        list_id = geometry.lookup(self, key)
+        if list_id is None:
+            list_id = geometry.previous(self) or glGenLists(1)
+            # Compiled lists must set their own state, not rely on ours
+            self._blend = None
+            glNewList(list_id, GL_COMPILE)
+            compiling, self._compiling = self._compiling, True
+            try:
+                build()
+            finally:
+                self._compiling = compiling
+                glEndList()
+            geometry.store(self, key, list_id)
+        glCallList(list_id)
+        self._blend = None
+
+    def layer(self, geometry, key, build):
+        """Composite the layer texture, re-rendering it first if key changed"""
+        x, y, width, height = glGetIntegerv(GL_VIEWPORT)
+        key = (key, width, height)
+        handle = geometry.lookup(self, key)
+        if handle is None:
+            handle = self._layer_target(geometry.previous(self), width, height)
+            self._render_layer(handle, build)
+            geometry.store(self, key, handle)
+        self._composite(handle[1])
+
+    def image(self, geometry, key, pixels):
+        """Draw an image through a texture, uploading it only if key changed"""
+        handle = geometry.lookup(self, key)
+        if handle is None:
+            handle = self._upload_image(geometry.previous(self), pixels)
+            geometry.store(self, key, handle)
+        self._composite(handle[0], flip=True)
+
+    @staticmethod
+    def _upload_image(previous, pixels):
+        """Copy pixels into the previous texture, or a new one if the size changed"""
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        height, width = pixels.shape[:2]
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        if previous is not None and previous[1] == (width, height):
+            glBindTexture(GL_TEXTURE_2D, previous[0])
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE, pixels)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            return previous
+        if previous is not None:
+            glDeleteTextures([previous[0]])
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB8, width, height, 0, GL_RGB, GL_UNSIGNED_BYTE, pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return texture, (width, height)
+
+    @staticmethod
+    def _layer_target(previous, width, height):
+        """Framebuffer and texture for a layer, reusing the previous pair if it fits"""
+        if previous is not None:
+            framebuffer, texture, size = previous
+            if size == (width, height):
+                return previous
+            glDeleteFramebuffers(1, [framebuffer])
+            glDeleteTextures([texture])
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        bound = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+        complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        glBindFramebuffer(GL_FRAMEBUFFER, bound)
+        if not complete:
+            raise RuntimeError("Layer framebuffer is incomplete")
+        return framebuffer, texture, (width, height)
+
+    def _render_layer(self, handle, build):
+        """Draw build() into the layer texture, starting from transparent"""
+        bound = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        clear = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glBindFramebuffer(GL_FRAMEBUFFER, handle[0])
+        # The window viewport may be letterboxed; the layer fills its texture
+        width, height = handle[2]
+        glViewport(0, 0, width, height)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        self._in_layer, self._blend = True, None
+        try:
+            build()
+        finally:
+            self._in_layer, self._blend = False, None
+            glBindFramebuffer(GL_FRAMEBUFFER, bound)
+            glViewport(*viewport)
+            glClearColor(*clear)
+
+    def _composite(self, texture, flip=False):
+        """Draw a premultiplied layer texture over the whole scene
+
+        Layer rows start at the bottom of the viewport; flip is for
+        textures uploaded top row first.
+        """
+        width, height = self.scene_size
+        bottom, top = (1.0, 0.0) if flip else (0.0, 1.0)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        # Texture rows start at the bottom of the viewport
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, bottom)
+        glVertex2f(0.0, height)
+        glTexCoord2f(1.0, bottom)
+        glVertex2f(width, height)
+        glTexCoord2f(1.0, top)
+        glVertex2f(width, 0.0)
+        glTexCoord2f(0.0, top)
+        glVertex2f(0.0, 0.0)
+        glEnd()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+        self._blend = None
+
+    def _string(self, text):
+        """Cache entry for a string in this backend's font"""
+        return self._strings.get(
+            text, lambda: [sum(glutBitmapWidth(self.font, ord(ch)) for ch in text), None]
+        )
+
+    @staticmethod
+    def _release_string(entry):
+        if entry[1] is not None:
+            glDeleteLists(entry[1], 1)
+
+    def text_width(self, text):
+        return self._string(text)[0]
+
+    def text(self, x, y, text, color):
+        """Draw text through its display list, compiling it on first use
+
+        Inside a display list being compiled (the retained HUD) the glyphs
+        are recorded inline: a call to the string's own list would outlive
+        that list once the string is evicted from the cache and deleted.
+        """
+        self._set_color(color)
+        glRasterPos2f(x, y)
+        if self._compiling:
+            self._draw_glyphs(text)
+            return
+        entry = self._string(text)
+        if entry[1] is not None:
+            glCallList(entry[1])
+        else:
+            entry[1] = glGenLists(1)
+            glNewList(entry[1], GL_COMPILE_AND_EXECUTE)
+            self._draw_glyphs(text)
+            glEndList()
+
+    def _draw_glyphs(self, text):
+        for ch in text:
+            glutBitmapCharacter(self.font, ord(ch))
+
+
+class RenderTarget:
+    """Offscreen color buffer for rendering below the window's resolution
+
+    The scene is drawn into a framebuffer `scale` times the size of the
+    viewport and then stretched over the viewport with linear filtering,
+    trading sharpness for fill rate.
+    """
+
+    def __init__(self, scale):
+        """
+        Args:
+            scale: Internal resolution as a fraction of the viewport (0..1]
+        """
+        self.scale = scale
+        self.size = None
+        self._framebuffer = None
+        self._texture = None
+        self._bound = 0
+        self._viewport = None
+
+    def _resize(self, size):
+        self.release()
+        self._texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self._texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, *size, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        bound = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        self._framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self._framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D,
+                               self._texture, 0)
+        complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        glBindFramebuffer(GL_FRAMEBUFFER, bound)
+        if not complete:
+            raise RuntimeError("Render target framebuffer is incomplete")
+        self.size = size
+
+    def begin(self):
+        """Redirect drawing into the target, sized for the current viewport"""
+        self._viewport = tuple(glGetIntegerv(GL_VIEWPORT))
+        width, height = self._viewport[2:]
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        if size != self.size:
+            self._resize(size)
+        self._bound = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_FRAMEBUFFER, self._framebuffer)
+        glViewport(0, 0, *size)
+
+    def present(self):
+        """Restore the previous framebuffer and stretch the target over its viewport"""
+        x, y, width, height = self._viewport
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self._framebuffer)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self._bound)
+        glBlitFramebuffer(0, 0, *self.size, x, y, x + width, y + height,
+                          GL_COLOR_BUFFER_BIT, GL_LINEAR)
+        glBindFramebuffer(GL_FRAMEBUFFER, self._bound)
+        glViewport(x, y, width, height)
+
+    def release(self):
+        """Delete the framebuffer and texture, if any"""
+        if self._framebuffer is not None:
+            glDeleteFramebuffers(1, [self._framebuffer])
+            glDeleteTextures([self._texture])
+        self._framebuffer = self._texture = self.size = None
@@ -0,0 +1,194 @@
+"""
+GL Call Recorder
+Stands in for the OpenGL and GLUT functions the GL backend calls and
+records them instead, so the complete call stream of a frame can be
+captured with no GL context. Calls are attributed to the entity being
+drawn through the scene's tracer hook, which gives a deterministic,
+machine-independent measure of rendering work:
+
+    recorder = GLCallRecorder()
+    with recorder.installed():
+        recorder.record_frame(scene, CommandBuffer(GLBackend()))
+    recorder.assert_budget(120)
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+from ..config import WINDOW_SIZE
+from ..trace import NULL_TRACER
+from . import gl
+
+# Advance of every glyph, close to GLUT's Helvetica 18
+_STUB_GLYPH_WIDTH = 10
+# Owner of calls made outside any entity span
+UNATTRIBUTED = "(frame)"
+
+
+class _OwnerSpan:
+    """Makes an entity the owner of the calls recorded inside it"""
+
+    __slots__ = ("recorder", "name")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.recorder._owners.append(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder._owners.pop()
+        return False
+
+
+class GLCallRecorder:
+    """Records GL/GLUT calls made through src.render.gl
+
+    Also implements the scene tracer interface (see src.trace), so setting
+    it as scene.tracer attributes each call to the innermost entity or
+    phase span that issued it.
+    """
+
+    enabled = True
+    finished = False
+
+    def __init__(self, viewport=WINDOW_SIZE, origin=(0, 0)):
+        """
+        Args:
+            viewport: (width, height) reported by glGetIntegerv(GL_VIEWPORT)
+            origin: (x, y) of the viewport, e.g. to stand in for a
+                    letterboxed window
+        """
+        self.viewport = viewport
+        self.origin = origin
+        # (function name, owner) per recorded call, in call order
+        self.calls = []
+        self._owners = []
+        self._next_name = 1
+        self._originals = None
+
+    # -- Tracer interface ----------------------------------------------------
+
+    def span(self, name, category="scene"):
+        return _OwnerSpan(self, name)
+
+    def frame(self):
+        return NULL_TRACER.frame()
+
+    # -- Recording -----------------------------------------------------------
+
+    @contextmanager
+    def installed(self):
+        """Replace the GL and GLUT functions used by src.render.gl while active"""
+        self._originals = {
+            name: value for name, value in vars(gl).items()
+            if name.startswith("gl") and callable(value)
+        }
+        for name in self._originals:
+            setattr(gl, name, self._stub(name))
+        try:
+            yield self
+        finally:
+            for name, value in self._originals.items():
+                setattr(gl, name, value)
+            self._originals = None
+
+    def _stub(self, name):
+        result = self._results().get(name)
+
+        def record(*args):
+            self.calls.append((name, self._owners[-1] if self._owners else UNATTRIBUTED))
+            return result(*args) if result is not None else None
+        record.__name__ = name
+        return record
+
+    def _results(self):
+        """Stubbed return values of the queries the backend relies on; every
+        other recorded function returns None"""
+        def new_names(*args):
+            name = self._next_name
+            self._next_name += 1
+            return name
+
+        def get_integer(pname):
+            if pname == gl.GL_VIEWPORT:
+                return (*self.origin, *self.viewport)
+            return 0
+
+        def set_viewport(x, y, width, height):
+            self.origin, self.viewport = (x, y), (width, height)
+
+        return {
+            "glGenLists": new_names,
+            "glGenTextures": new_names,
+            "glGenFramebuffers": new_names,
+            "glCheckFramebufferStatus": lambda target: gl.GL_FRAMEBUFFER_COMPLETE,
+            "glGetIntegerv": get_integer,
+            "glViewport": set_viewport,
+            "glGetFloatv": lambda pname: (0.0, 0.0, 0.0, 0.0),
+            "glutBitmapWidth": lambda font, char: _STUB_GLYPH_WIDTH,
+        }
+
+    def record_frame(self, scene, backend, hud=True):
+        """Render one frame of scene with backend and record only its calls
+
+        Args:
+            scene: Scene to render (not advanced)
+            backend: GLBackend, or a backend wrapping one (CommandBuffer)
+            hud: Whether to draw the HUD overlay
+        """
+        if self._originals is None:
+            raise RuntimeError("GLCallRecorder.record_frame() needs installed()")
+        self.reset()
+        tracer, scene.tracer = scene.tracer, self
+        try:
+            scene.render(backend, hud=hud)
+        finally:
+            scene.tracer = tracer
+        return self
+
+    def reset(self):
+        """Forget the calls recorded so far"""
+        self.calls = []
+        self._owners = []
+
+    # -- Reports -------------------------------------------------------------
+
+    @property
+    def total(self):
+        return len(self.calls)
+
+    def by_call(self):
+        """Counter of recorded calls per GL function"""
+        return Counter(name for name, _ in self.calls)
+
+    def by_owner(self):
+        """Counter of recorded calls per entity or phase"""
+        return Counter(owner for _, owner in self.calls)
+
+    def report(self):
+        """Per-owner and per-function call counts as text"""
+        lines = [f"{self.total} GL calls"]
+        for title, counts in (("by entity", self.by_owner()), ("by call", self.by_call())):
+            lines.append(f"  {title}:")
+            lines.extend(f"    {name:<28} {count:>6}" for name, count in counts.most_common())
+        return "\n".join(lines)
+
+    def assert_budget(self, max_calls, owner=None, call=None):
+        """Raise AssertionError if the recorded calls exceed a budget
+
+        Args:
+            max_calls: Maximum number of calls allowed
+            owner: Only count calls made by this entity or phase
+            call: Only count calls to this GL function
+        """
+        count = sum(
+            1 for name, by in self.calls
+            if (owner is None or by == owner) and (call is None or name == call)
+        )
+        if count > max_calls:
+            scope = " ".join(filter(None, (owner, call))) or "frame"
+            raise AssertionError(
+                f"{scope}: {count} GL calls exceed the budget of {max_calls}\n{self.report()}"
+            )
@@ -0,0 +1,238 @@
+"""
+NumPy Software Rasterizer Backend
+Draws scenes into a NumPy RGB framebuffer with no OpenGL or GLUT at all.
+Primitives are triangulated and rasterized into pixel spans in vectorized
+batches (see raster.py), with source-alpha blending for blended draws.
+"""
+import numpy as np
+
+from ..config import WINDOW_SIZE
+from .backend import RenderBackend
+from .raster import to_triangles, rasterize, span_pixels
+from .text import TextCache
+
+# Size of the HUD font in scene pixels, matching GLUT's Helvetica 18
+HUD_FONT_SIZE = 18
+# Average span length (pixels) above which spans are filled as row slices
+# rather than expanded into pixel indices
+LONG_SPAN = 64
+
+
+def _load_font(size):
+    """Pillow's bundled font at a pixel size (bitmap fallback on old Pillow)"""
+    from PIL import ImageFont
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+class SoftwareBackend(RenderBackend):
+    """Render backend that rasterizes into a NumPy array"""
+
+    def __init__(self, size=WINDOW_SIZE, scene_size=WINDOW_SIZE, clear_color=(0.0, 0.0, 0.0)):
+        """Allocate the framebuffer
+
+        Args:
+            size: Output (width, height); the scene is scaled to fit
+            scene_size: Size of the scene coordinate space
+            clear_color: RGB color the framebuffer is cleared to
+        """
+        self.width, self.height = size
+        self.scale = np.array(
+            (self.width / scene_size[0], self.height / scene_size[1]), dtype=np.float64
+        )
+        self.clear_color = np.asarray(clear_color, dtype=np.float32)
+        self._pixels = np.empty((self.height * self.width, 3), dtype=np.float32)
+        # Coverage, only tracked while drawing into a layer
+        self._alpha = None
+        self._fonts = {}
+        # Rendered glyph coverage per (text, font size)
+        self._masks = TextCache()
+        self._widths = TextCache()
+        self.begin_frame()
+
+    def begin_frame(self):
+        """Clear the framebuffer"""
+        self._pixels[:] = self.clear_color
+
+    def frame(self):
+        """The framebuffer as a (height, width, 3) uint8 RGB array, top row first"""
+        rgb = np.rint(np.clip(self._pixels, 0.0, 1.0) * 255).astype(np.uint8)
+        return rgb.reshape(self.height, self.width, 3)
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        if not len(vertices):
+            return
+        # Point size and line width are in pixels, scaled like the scene
+        pixel_size = size * float(self.scale.mean())
+        triangles, sources = to_triangles(mode, vertices * self.scale, pixel_size)
+        owners, rows, starts, ends = rasterize(triangles, self.width, self.height)
+        if not len(owners):
+            return
+
+        if colors is None:
+            rgba = self._rgba(np.asarray(color, dtype=np.float32)[None])
+            owners = np.zeros_like(owners)
+        else:
+            rgba = self._rgba(np.asarray(colors, dtype=np.float32)[sources])
+
+        if (ends - starts).mean() >= LONG_SPAN:
+            self._fill_rows(owners, rows, starts, ends, rgba, blend)
+        else:
+            self._fill_pixels(owners, rows, starts, ends, rgba, blend)
+
+    @staticmethod
+    def _rgba(colors):
+        """Clamp colors to 0..1 like glColor and add opaque alpha to RGB"""
+        colors = np.clip(colors, 0.0, 1.0)
+        if colors.shape[1] == 3:
+            colors = np.column_stack((colors, np.ones(len(colors), dtype=np.float32)))
+        return colors
+
+    def _fill_rows(self, owners, rows, starts, ends, rgba, blend):
+        """Fill long spans one row slice at a time, in draw order"""
+        pixels = self._pixels.reshape(self.height, self.width, 3)
+        coverage = None if self._alpha is None else self._alpha.reshape(self.height, self.width)
+        colors = rgba.tolist()
+        for owner, y, x0, x1 in zip(owners.tolist(), rows.tolist(), starts.tolist(), ends.tolist()):
+            r, g, b, a = colors[owner]
+            if blend and a < 1.0:
+                span = pixels[y, x0:x1]
+                span += (rgba[owner, :3] - span) * a
+                if coverage is not None:
+                    span = coverage[y, x0:x1]
+                    span += (1.0 - span) * a
+            else:
+                pixels[y, x0:x1] = (r, g, b)
+                if coverage is not None:
+                    coverage[y, x0:x1] = 1.0
+
+    def _fill_pixels(self, owners, rows, starts, ends, rgba, blend):
+        """Fill many short spans with vectorized pixel writes"""
+        pixels, spans = span_pixels(rows, starts, ends, self.width)
+        owners = owners[spans]
+        if not blend or (rgba[:, 3] >= 1.0).all():
+            # Later triangles overwrite earlier ones, as in draw order
+            self._pixels[pixels] = rgba[owners, :3]
+            if self._alpha is not None:
+                self._alpha[pixels] = 1.0
+            return
+        # Consecutive triangles of one color blend together in closed form;
+        # runs of different colors are blended in draw order
+        colors = rgba[owners]
+        changes = np.flatnonzero((colors[1:] != colors[:-1]).any(axis=1)) + 1
+        bounds = np.concatenate(([0], changes, [len(pixels)]))
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            self._blend_uniform(pixels[start:end], colors[start])
+
+    def _blend_uniform(self, pixels, rgba):
+        """Blend one color over pixels with SRC_ALPHA/ONE_MINUS_SRC_ALPHA
+
+        A pixel covered k times by the same color blends to
+        rgb + (dst - rgb) * (1 - alpha)^k, so overlaps need no loop.
+        """
+        rgb, alpha = rgba[:3], rgba[3]
+        low = pixels.min()
+        counts = np.bincount(pixels - low)
+        covered = np.flatnonzero(counts)
+        keep = (1.0 - alpha) ** counts[covered].astype(np.float32)
+        index = covered + low
+        dst = self._pixels[index]
+        self._pixels[index] = rgb + (dst - rgb) * keep[:, None]
+        if self._alpha is not None:
+            self._alpha[index] = 1.0 + (self._alpha[index] - 1.0) * keep
+
+    def layer(self, geometry, key, build):
+        """Composite a cached layer image, re-rendering it first if key changed"""
+        image = geometry.lookup(self, key)
+        if image is None:
+            image = self._render_layer(build)
+            geometry.store(self, key, image)
+        top, bottom, rgb, alpha = image
+        dst = self._pixels.reshape(self.height, self.width, 3)[top:bottom]
+        if alpha is None:
+            dst[:] = rgb
+        else:
+            dst *= 1.0 - alpha[..., None]
+            dst += rgb
+
+    def image(self, geometry, key, pixels):
+        """Copy an image over the framebuffer, resampled once per key"""
+        rgb = geometry.lookup(self, key)
+        if rgb is None:
+            pixels = np.asarray(pixels)
+            # Nearest-neighbour resampling, one axis at a time
+            rows = np.arange(self.height) * pixels.shape[0] // self.height
+            cols = np.arange(self.width) * pixels.shape[1] // self.width
+            rgb = pixels.take(rows, axis=0).take(cols, axis=1).reshape(-1, 3)
+            rgb = rgb.astype(np.float32) / 255
+            geometry.store(self, key, rgb)
+        self._pixels[:] = rgb
+
+    def _render_layer(self, build):
+        """Draw build() onto a transparent canvas
+
+        Blending onto transparent black leaves premultiplied color, so the
+        layer composites as rgb + dst * (1 - alpha). Only the rows the layer
+        touches are kept.
+
+        Returns:
+            (top, bottom, rgb, alpha) with alpha None for a fully opaque layer
+        """
+        saved = self._pixels, self._alpha
+        self._pixels = np.zeros_like(saved[0])
+        self._alpha = np.zeros(len(self._pixels), dtype=np.float32)
+        try:
+            build()
+            rgb = self._pixels.reshape(self.height, self.width, 3)
+            alpha = self._alpha.reshape(self.height, self.width)
+        finally:
+            self._pixels, self._alpha = saved
+
+        rows = np.flatnonzero(alpha.any(axis=1))
+        if not len(rows):
+            return 0, 0, rgb[:0], None
+        top, bottom = rows[0], rows[-1] + 1
+        rgb, alpha = rgb[top:bottom].copy(), alpha[top:bottom].copy()
+        return top, bottom, rgb, None if alpha.min() >= 1.0 else alpha
+
+    def _font(self, scale):
+        size = max(1, int(round(HUD_FONT_SIZE * scale)))
+        if size not in self._fonts:
+            self._fonts[size] = _load_font(size)
+        return self._fonts[size]
+
+    def text_width(self, text):
+        return self._widths.get(text, lambda: self._font(1.0).getlength(text))
+
+    def _mask(self, text, scale):
+        """(coverage, ascent) for a string: float32 0..1 glyph coverage"""
+        from PIL import Image, ImageDraw
+
+        font = self._font(scale)
+        ascent, descent = font.getmetrics()
+        width = int(np.ceil(font.getlength(text))) + 1
+        mask = Image.new("L", (width, ascent + descent))
+        ImageDraw.Draw(mask).text((0, ascent), text, fill=255, font=font, anchor="ls")
+        return np.asarray(mask, dtype=np.float32) / 255, ascent
+
+    def text(self, x, y, text, color):
+        sx, sy = self.scale
+        coverage, ascent = self._masks.get((text, sy), lambda: self._mask(text, sy))
+
+        # Clip the text box against the framebuffer
+        left, top = int(round(x * sx)), int(round(y * sy)) - ascent
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + coverage.shape[1], self.width)
+        y1 = min(top + coverage.shape[0], self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        coverage = coverage[y0 - top:y1 - top, x0 - left:x1 - left]
+
+        rgba = self._rgba(np.asarray(color, dtype=np.float32)[None])[0]
+        alpha = coverage[..., None] * rgba[3]
+        pixels = self._pixels.reshape(self.height, self.width, 3)
+        region = pixels[y0:y1, x0:x1]
+        region += (rgba[:3] - region) * alpha
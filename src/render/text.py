@@ -0,0 +1,21 @@
+"""
+Per-String Text Cache
+HUD strings change rarely (the hour, a rounded FPS figure), so backends
+build whatever they need to draw a string once and keep it here, keyed by
+the string and font, until it falls out of the least-recently-used window.
+"""
+from ..config import TEXT_CACHE_SIZE
+from ..lru import LRUCache
+
+
+class TextCache(LRUCache):
+    """Least-recently-used cache of prepared text, one entry per key"""
+
+    def __init__(self, capacity=TEXT_CACHE_SIZE, release=None):
+        """
+        Args:
+            capacity: Number of entries kept before the oldest is dropped
+            release: Optional callable given each evicted entry, to free
+                     backend resources such as display lists
+        """
+        super().__init__(capacity, release)
@@ -3,32 +3,106 @@ Scene Manager
 Orchestrates all entities and manages the day-night cycle
 """
 import math
-from random import choices, uniform
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from .entities import Background, Sun, Moon, Star, Cloud, Ground, Firefly, House, Tree, Snowfall
+from time import perf_counter
+from random import Random
+import numpy as np
+from .entities import Background, Sun, Moon, StarField, Cloud, Ground, FireflySwarm, House, Tree, Snowfall
+from .entities.celestial import SUN_STEP, MOON_STEP
+from .entities.geometry import set_circle_tolerance
+from .render.backend import QUADS, RetainedGeometry
+from .trace import NULL_TRACER
 from .config import (
-    WINDOW_SIZE, FIREFLY_RANGE, FIREFLY_COUNT, STAR_COUNT,
+    WINDOW_SIZE, FIREFLY_COUNT, STAR_COUNT,
     MOON_RADIUS, MOON_POSITION, MOON_COLOR,
     SUN_RADIUS, SUN_POSITION, SUN_COLOR,
     TREE_POSITION_RIGHT, CLOUD_COUNT, CLOUD_X_RANGE, CLOUD_Y_RANGE, CLOUD_SIZE_RANGE,
     SEASON, SUMMER_DAY_START, SUMMER_DAY_END, WINTER_DAY_START, WINTER_DAY_END,
-    NIGHT_SNOW_INTENSITY_MULTIPLIER
+    SNOWFLAKE_COUNT, NIGHT_SNOW_INTENSITY_MULTIPLIER, REFERENCE_FPS,
+    SIMULATION_DT, MAX_CATCHUP_TICKS, MAX_FRAME_TIME,
+    STATIC_LAYER_CACHE, SHADOW_SUN_QUANTUM,
+    HUD_SHOW_MINUTES, HUD_SHOW_SEASON, HUD_SHOW_FPS, QUALITY, QUALITY_PRESETS
 )
 
 # Transition constants
 TRANSITION_SPEED = 0.005
 INITIAL_TIME = "day"
+# Baseline position of the HUD text, in scene pixels
+HUD_POSITION = (20, 60)
+
+
+def day_schedule(season):
+    """(sunrise, sunset) hours of a season"""
+    if season == "winter":
+        return WINTER_DAY_START, WINTER_DAY_END
+    return SUMMER_DAY_START, SUMMER_DAY_END
+
+
+def daylight_ticks(hours, season=SEASON):
+    """Reference ticks of daylight between 00:00 and `hours`; clouds only
+    drift while they are shown, during the day"""
+    day_start, day_end = day_schedule(season)
+    day_span = day_end - day_start
+    day_hours = min(max(hours - day_start, 0.0), float(day_span))
+    return day_hours * math.pi / (SUN_STEP * day_span)
+
+
+def ticks_since_midnight(hours, season=SEASON):
+    """Reference ticks the live simulation takes to get from 00:00 to `hours`
+    
+    Day and night arcs both span pi radians but cover different numbers of
+    hours, so simulated time runs at a different rate in each.
+    """
+    day_start, day_end = day_schedule(season)
+    day_span = day_end - day_start
+    day_hours = min(max(hours - day_start, 0.0), float(day_span))
+    night_rate = math.pi / (MOON_STEP * (24 - day_span))
+    return daylight_ticks(hours, season) + (hours - day_hours) * night_rate
+
+
+def hud_text(hour, minute, season, fps=None):
+    """The HUD line: the hour, plus minutes, season and FPS when enabled"""
+    text = f"Time: {hour:02d}"
+    if HUD_SHOW_MINUTES:
+        text += f":{minute:02d}"
+    if HUD_SHOW_SEASON:
+        text += f"  {season.capitalize()}"
+    if HUD_SHOW_FPS and fps is not None:
+        text += f"  {fps:.0f} FPS"
+    return text
+
+
+def draw_label(renderer, x, y, text):
+    """Render text on a translucent box, with a drop shadow"""
+    text_width = renderer.text_width(text)
+    text_height = 18
+
+    renderer.draw(QUADS, [
+        (x - 6, y - text_height),
+        (x + text_width + 6, y - text_height),
+        (x + text_width + 6, y + 6),
+        (x - 6, y + 6),
+    ], color=(0.0, 0.0, 0.0, 0.45), blend=True)
+
+    renderer.text(x + 1, y + 1, text, (0.0, 0.0, 0.0))
+    renderer.text(x, y, text, (1.0, 1.0, 1.0))
 
 
 class Scene:
     """Main scene containing all visual elements and their interactions"""
     
-    def __init__(self, hour=12):
+    def __init__(self, hour=12, season=SEASON, seed=None, cache_layers=STATIC_LAYER_CACHE,
+                 particle_scale=1.0, quality=QUALITY):
         """Initialize all scene entities
         
         Args:
             hour: Hour of day (0-23), default is noon
+            season: 'summer' or 'winter', defaults to config SEASON
+            seed: Optional seed; scenes built with the same seed place stars,
+                  fireflies, clouds and snow identically
+            cache_layers: Render the static scenery through cached layers
+            particle_scale: Multiplier for the configured star, firefly,
+                            cloud and snowflake counts
+            quality: Name of the starting preset in QUALITY_PRESETS
         """
         self.wsize = WINDOW_SIZE
         self.time = INITIAL_TIME
@@ -36,22 +110,48 @@ class Scene:
         self.current_hour = hour  # 0-23 format
         self.current_minute = 0
         self.is_paused = False  # Animation is active by default
-        self.season = SEASON
+        self.season = season
+        self.particle_scale = particle_scale
+        if quality not in QUALITY_PRESETS:
+            raise ValueError(f"Unknown quality preset {quality!r}")
+        self.quality = quality
+        self._preset = QUALITY_PRESETS[quality]
+        self._apply_schedule()
 
-        # Season-based day/night schedule
-        if self.season == "winter":
-            self.day_start = WINTER_DAY_START
-            self.day_end = WINTER_DAY_END
-        else:
-            self.day_start = SUMMER_DAY_START
-            self.day_end = SUMMER_DAY_END
-        self.day_span = self.day_end - self.day_start
-        self.night_start = self.day_end
-        self.night_span = 24 - self.day_span
+        # One independent seed per randomized entity, so rebuilding one of
+        # them (e.g. on a season toggle) always reproduces the same layout
+        stars, fireflies, clouds, snow = np.random.SeedSequence(seed).spawn(4)
+        self._seeds = {
+            "stars": stars,
+            "fireflies": fireflies,
+            "clouds": int(clouds.generate_state(1)[0]),
+            "snow": snow,
+        }
         
         # Transition state variables
         self.transition_progress = 0.0
         self.is_transitioning = False
+
+        # Fixed-timestep clock: wall time accumulates and is consumed in
+        # SIMULATION_DT ticks; alpha is the leftover fraction of a tick
+        self._last_clock = None
+        self._accumulator = 0.0
+        self.alpha = 1.0
+        # Set whenever state changes outside the running clock (jumps,
+        # season toggles) so a paused scene still gets one redraw
+        self._dirty = True
+
+        # Static scenery is split around the dynamic layers drawn between
+        # them: sky and ground behind, trees and house (with shadows) in front
+        self.cache_layers = cache_layers
+        self._back_layer = RetainedGeometry()
+        self._front_layer = RetainedGeometry()
+        # HUD overlay, keyed by its text; fps is set by the caller that
+        # measures it (see main.py)
+        self._hud = RetainedGeometry()
+        self.fps = None
+        # Frame tracer (see src.trace); NULL_TRACER records nothing
+        self.tracer = NULL_TRACER
         
         # Initialize entities
         self._init_background()
@@ -59,6 +159,7 @@ class Scene:
         self._init_stars_and_fireflies()
         self._init_landscape()
         self._init_seasonal_effects()
+        self._apply_preset()
         
         # Set initial state for all entities based on starting time
         self._set_time_of_day(hour)
@@ -80,47 +181,72 @@ class Scene:
     
     def _init_stars_and_fireflies(self):
         """Initialize stars and fireflies"""
-        self.stars = [
-            Star(x, y, draw=False) 
-            for x, y in zip(
-                choices(range(0, self.wsize[0]), k=STAR_COUNT),
-                choices(range(0, 650), k=STAR_COUNT)
-            )
-        ]
-        
-        self.fireflies = [
-            Firefly(x, y)
-            for x, y in zip(
-                choices(range(*FIREFLY_RANGE[0]), k=FIREFLY_COUNT),
-                choices(range(*FIREFLY_RANGE[1]), k=FIREFLY_COUNT)
-            )
-        ]
+        self.stars = StarField(self._scaled(STAR_COUNT), draw=False, seed=self._seeds["stars"])
+        self.fireflies = FireflySwarm(self._scaled(FIREFLY_COUNT), seed=self._seeds["fireflies"])
     
     def _init_landscape(self):
         """Initialize clouds, ground, trees, and house"""
-        # Create clouds only in non-winter seasons
-        if self.season != "winter":
-            self.clouds = [
-                Cloud(x, y, size)
-                for x, y, size in zip(
-                    choices(range(*CLOUD_X_RANGE), k=CLOUD_COUNT),
-                    choices(range(*CLOUD_Y_RANGE), k=CLOUD_COUNT),
-                    [uniform(*CLOUD_SIZE_RANGE) for _ in range(CLOUD_COUNT)]
-                )
-            ]
-        else:
-            self.clouds = []
-        
+        self.clouds = []
         self.ground = Ground()
         self.tree = Tree()
         self.tree_right = Tree(TREE_POSITION_RIGHT)
         self.house = House()
 
+    def _make_clouds(self):
+        """Create the (seeded) summer cloud layer"""
+        rng = Random(self._seeds["clouds"])
+        return [
+            Cloud(rng.randrange(*CLOUD_X_RANGE), rng.randrange(*CLOUD_Y_RANGE),
+                  rng.uniform(*CLOUD_SIZE_RANGE), rng)
+            for _ in range(self._scaled(CLOUD_COUNT))
+        ]
+
+    def _scaled(self, count):
+        """A configured entity count multiplied by particle_scale"""
+        return max(0, round(count * self.particle_scale))
+
+    def set_quality(self, quality):
+        """Switch to a named preset from QUALITY_PRESETS
+        
+        Presets change the sky gradient resolution, the share of each
+        particle pool in use and the circle tessellation; pools are never
+        reallocated, so switching is cheap enough to do while running.
+        """
+        if quality not in QUALITY_PRESETS:
+            raise ValueError(f"Unknown quality preset {quality!r}")
+        if quality != self.quality:
+            self.quality = quality
+            self._preset = QUALITY_PRESETS[quality]
+            self._apply_preset()
+            self._dirty = True
+
+    def _apply_preset(self):
+        preset = self._preset
+        self.background.set_steps(preset["gradient_steps"])
+        # Tessellation is process-wide (see entities.geometry)
+        set_circle_tolerance(preset["circle_tolerance"])
+        self.stars.set_detail(preset["particles"])
+        self.fireflies.set_detail(preset["particles"])
+        if self.snowfall is not None:
+            self.snowfall.set_detail(preset["particles"])
+
+    def _visible_clouds(self):
+        """The clouds the current preset draws"""
+        return self.clouds[:round(len(self.clouds) * self._preset["particles"])]
+
+    def _apply_schedule(self):
+        """Set the day/night schedule for the current season"""
+        self.day_start, self.day_end = day_schedule(self.season)
+        self.day_span = self.day_end - self.day_start
+        self.night_start = self.day_end
+        self.night_span = 24 - self.day_span
+
     def _init_seasonal_effects(self):
         """Initialize seasonal elements like snowfall for winter"""
         self.snowfall = None
         if self.season == "winter":
-            self.snowfall = Snowfall()
+            self.snowfall = Snowfall(capacity=self._scaled(SNOWFLAKE_COUNT), seed=self._seeds["snow"])
+            self.snowfall.set_detail(self._preset["particles"])
             # Enable snow cover on ground
             self.ground.enable_snow(True)
             # Clear clouds in winter
@@ -132,14 +258,7 @@ class Scene:
         else:
             self.ground.enable_snow(False)
             # Regenerate clouds in non-winter
-            self.clouds = [
-                Cloud(x, y, size)
-                for x, y, size in zip(
-                    choices(range(*CLOUD_X_RANGE), k=CLOUD_COUNT),
-                    choices(range(*CLOUD_Y_RANGE), k=CLOUD_COUNT),
-                    [uniform(*CLOUD_SIZE_RANGE) for _ in range(CLOUD_COUNT)]
-                )
-            ]
+            self.clouds = self._make_clouds()
             self.tree.set_shadows(True)
             self.tree_right.set_shadows(True)
             self.house.set_shadows(True)
@@ -151,49 +270,46 @@ class Scene:
             hour: Hour of day (0-23)
                   0 = midnight, 6 = sunrise, 12 = noon, 18 = sunset, 23 = late night
         """
-        import math
+        self._apply_time(hour % 24)
+
+    def _apply_time(self, hours):
+        """Derive celestial, lighting and entity state from the time of day
         
-        self.current_hour = hour % 24
-        self.current_minute = 0
+        Everything here is a closed-form function of `hours` (fractional,
+        0 <= hours < 24) and the season schedule; no history is used.
+        """
+        self.current_hour = int(hours)
+        self.current_minute = int(round((hours - self.current_hour) * 60, 6))
+        self._dirty = True
         
         # Determine if it's day or night using configured spans
-        if self.day_start <= self.current_hour < self.day_end:
+        if self.day_start <= hours < self.day_end:
             self.time = "day"
-            self.sun._draw = True
-            self.moon._draw = False
-            
-            # Calculate sun angle: 0 at sunrise, pi at sunset
-            hour_progress = (self.current_hour - self.day_start) / float(self.day_span)
-            self.sun.angle = hour_progress * math.pi
-            self.sun.revolve()
-            
-            # Update brightness based on sun angle
-            brightness = max(0, math.sin(self.sun.angle)) ** 1.5
-            r, g, b = SUN_COLOR
-            self.sun.color = (r, g, b, brightness)
-            
-            # Set full snow intensity during day
-            if self.snowfall is not None:
-                self.snowfall.set_intensity(1.0)
+            body, other = self.sun, self.moon
+            # Sun angle: 0 at sunrise, pi at sunset
+            progress = (hours - self.day_start) / float(self.day_span)
+            intensity = 1.0
         else:
             self.time = "night"
-            self.moon._draw = True
-            self.sun._draw = False
-            
-            # Calculate moon angle for night hours over a single NIGHT_SPAN arc
-            night_progress = ((self.current_hour - self.night_start) % 24) / float(self.night_span)
+            body, other = self.moon, self.sun
             # Map full night to a single π arc: NIGHT_START -> rise, NIGHT_START+NIGHT_SPAN -> set
-            self.moon.angle = night_progress * math.pi
-            self.moon.revolve()
-            
-            # Update brightness based on moon angle
-            brightness = max(0, math.sin(self.moon.angle)) ** 1.5
-            r, g, b = MOON_COLOR
-            self.moon.color = (r, g, b, brightness)
-            
-            # Reduce snow intensity during night
-            if self.snowfall is not None:
-                self.snowfall.set_intensity(NIGHT_SNOW_INTENSITY_MULTIPLIER)
+            progress = ((hours - self.night_start) % 24) / float(self.night_span)
+            intensity = NIGHT_SNOW_INTENSITY_MULTIPLIER
+        
+        body._draw = True
+        other._draw = False
+        body.place(progress * math.pi)
+        # Stepping leaves the hidden body at the start of its arc
+        other.place(0.0)
+        
+        # The day/night transition starts with each arc and advances
+        # TRANSITION_SPEED per reference tick
+        arc_ticks = body.angle / body.step
+        self.transition_progress = min(1.0, arc_ticks * TRANSITION_SPEED)
+        self.is_transitioning = self.transition_progress < 1.0
+        
+        if self.snowfall is not None:
+            self.snowfall.set_intensity(intensity)
         
         # Update all entities to match time of day
         self.background.switch_time(self.time)
@@ -205,136 +321,267 @@ class Scene:
         for cloud in self.clouds:
             cloud.switch_time(self.time)
         
-        for star in self.stars:
-            star.switch_time(self.time)
+        self.stars.switch_time(self.time)
         
-        for firefly in self.fireflies:
-            firefly.switch_time(self.time)
+        self.fireflies.switch_time(self.time)
         
-        # Update brightness of environment
+        # Update brightness of environment; the body below the horizon has
+        # long since faded out
         self._update_brightness()
+        other.color = (*other.color[:3], 0.0)
+
+    def seek(self, hour, minute=0, season=None):
+        """Jump straight to the complete visual state at a simulated time
+        
+        Unlike stepping the clock, this is O(1) in the target time: sun and
+        moon placement, sky/ground colors, entity brightness, the day/night
+        transition and seeded particle positions are all computed directly.
+        Two scenes with the same seed render the same frame for the same
+        arguments regardless of their history.
+        
+        Args:
+            hour: Hour of day (0-23)
+            minute: Minute within the hour; fractions are allowed
+            season: Optional 'summer' or 'winter' to switch to first
+        """
+        if season is not None and season != self.season:
+            self.toggle_season()
+        hours = (hour + minute / 60.0) % 24
+        self._apply_time(hours)
+        
+        ticks = ticks_since_midnight(hours, self.season)
+        self.stars.seek(ticks)
+        self.fireflies.seek(ticks)
+        daylight = daylight_ticks(hours, self.season)
+        for cloud in self.clouds:
+            cloud.seek(daylight)
+        if self.snowfall is not None:
+            self.snowfall.seek(ticks)
+        
+        # Interpolation restarts from the new state
+        self._accumulator = 0.0
+        self.alpha = 1.0
     
-    def draw(self):
-        """Render all scene elements in proper order"""
+    def draw(self, renderer, hud=True):
+        """Advance the simulation clock and render all scene elements
+        
+        Args:
+            renderer: Render backend to draw with (see src.render)
+            hud: Whether to draw the time overlay on top of the scene
+        """
+        with self.tracer.frame():
+            # Update state (only if not paused)
+            if self.is_paused:
+                self._last_clock = None
+            else:
+                with self.tracer.span("advance"):
+                    self.advance()
+            self.render(renderer, hud=hud)
+
+    def render(self, renderer, hud=True):
+        """Render all scene elements in proper order without advancing time
+        
+        Args:
+            renderer: Render backend to draw with (see src.render)
+            hud: Whether to draw the time overlay on top of the scene
+        """
+        self._dirty = False
+        span = self.tracer.span
+        renderer.begin_frame()
+        
         # Background and ground layers
-        self.background.draw()
-        self.ground.draw()
+        with span("back layer", "render"):
+            self._draw_static(renderer, self._back_layer, self._back_layer_key(), self._draw_back)
         
         # Stars in the sky (drawn early so objects can appear in front)
-        for star in self.stars:
-            star.draw()
+        with span("stars", "render"):
+            self.stars.draw(renderer)
         
         # Atmospheric elements
-        for cloud in self.clouds:
-            cloud.draw()
+        with span("clouds", "render"):
+            for cloud in self._visible_clouds():
+                cloud.draw(renderer)
 
         # Winter snowfall overlay (drawn over sky/clouds, under objects)
         if self.snowfall is not None:
-            self.snowfall.draw()
+            with span("snowfall", "render"):
+                self.snowfall.draw(renderer, self.alpha)
         
         # Landscape objects with shadows
-        self.tree.draw(self.sun)
-        self.tree_right.draw(self.sun)
-        self.house.draw(self.sun)
+        with span("front layer", "render"):
+            self._draw_static(renderer, self._front_layer, self._front_layer_key(), self._draw_front)
         
         # Fireflies (near ground level, drawn after landscape)
-        for firefly in self.fireflies:
-            firefly.draw()
+        with span("fireflies", "render"):
+            self.fireflies.draw(renderer)
         
         # Celestial bodies (drawn last, on top of everything)
-        self.moon.draw()
-        self.sun.draw()
+        with span("moon", "render"):
+            self.moon.draw(renderer, self.alpha)
+        with span("sun", "render"):
+            self.sun.draw(renderer, self.alpha)
 
         # HUD overlay (drawn on top of scene)
-        self._draw_time_display()
-        
-        # Update state (only if not paused)
-        if not self.is_paused:
-            self.time_elapse()
-    
+        if hud:
+            with span("hud", "render"):
+                self._draw_time_display(renderer)
+        # Backends that defer work (CommandBuffer) do it here
+        with span("end_frame", "render"):
+            renderer.end_frame()
 
+    def render_hud(self, renderer):
+        """Render only the time overlay, e.g. over a scene rendered at a
+        lower internal resolution, so the text stays sharp"""
+        renderer.begin_frame()
+        with self.tracer.span("hud", "render"):
+            self._draw_time_display(renderer)
+        renderer.end_frame()
 
-    
-    def _draw_time_display(self):
-        """Draw current time as a simple HUD overlay"""
-        time_text = f"Time: {self.current_hour:02d}"
-        self._draw_text(20, 60, time_text)
-
-    def _draw_text(self, x, y, text, font=GLUT_BITMAP_HELVETICA_18):
-        """Render bitmap text in screen space"""
-        w, h = self.wsize
-
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0.0, w, h, 0.0, -1.0, 1.0)
-
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-
-        text_width = sum(glutBitmapWidth(font, ord(ch)) for ch in text)
-        text_height = 18
-
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glBegin(GL_QUADS)
-        glColor4f(0.0, 0.0, 0.0, 0.45)
-        glVertex2f(x - 6, y - text_height)
-        glVertex2f(x + text_width + 6, y - text_height)
-        glVertex2f(x + text_width + 6, y + 6)
-        glVertex2f(x - 6, y + 6)
-        glEnd()
-        glDisable(GL_BLEND)
-
-        glColor3f(0.0, 0.0, 0.0)
-        glRasterPos2f(x + 1, y + 1)
-        for ch in text:
-            glutBitmapCharacter(font, ord(ch))
-
-        glColor3f(1.0, 1.0, 1.0)
-        glRasterPos2f(x, y)
-        for ch in text:
-            glutBitmapCharacter(font, ord(ch))
-
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+    def _draw_static(self, renderer, layer, key, draw):
+        """Draw static scenery, through its cached layer when enabled"""
+        if self.cache_layers:
+            renderer.layer(layer, key, lambda: draw(renderer))
+        else:
+            draw(renderer)
 
+    def _draw_back(self, renderer):
+        span = self.tracer.span
+        with span("background", "render"):
+            self.background.draw(renderer)
+        with span("ground", "render"):
+            self.ground.draw(renderer)
 
+    def _draw_front(self, renderer):
+        span = self.tracer.span
+        with span("tree", "render"):
+            self.tree.draw(renderer, self.sun)
+        with span("tree_right", "render"):
+            self.tree_right.draw(renderer, self.sun)
+        with span("house", "render"):
+            self.house.draw(renderer, self.sun)
 
+    def _back_layer_key(self):
+        """Everything the sky and ground layer shows, quantized to 8-bit colors"""
+        return (
+            self.season, self.quality,
+            tuple(round(c * 255) for c in self.background.color),
+            round(self.background.bright * 255),
+            tuple(round(c * 255) for c in self.ground.current_color),
+            self.ground.snow_enabled,
+            self.ground.snow_cover_opacity,
+        )
+
+    def _front_layer_key(self):
+        """Everything the trees and house layer shows
+        
+        Shadows follow the sun, so while they are visible the sun position
+        is part of the key, quantized to SHADOW_SUN_QUANTUM pixels.
+        """
+        shadows = self.house.shadows_enabled and not self.house.is_night
+        sun = None
+        if shadows and 0 <= self.sun.angle <= math.pi:
+            sun = (round(self.sun.x / SHADOW_SUN_QUANTUM), round(self.sun.y / SHADOW_SUN_QUANTUM))
+        return (
+            self.season, self.quality,
+            self.house.brightness, self.house.window_color,
+            self.tree.brightness, self.tree_right.brightness,
+            shadows, sun,
+        )
+
+    @property
+    def needs_redraw(self):
+        """True unless the scene is paused and nothing changed since the last draw"""
+        return not self.is_paused or self._dirty
+
+    def toggle_pause(self):
+        """Pause or resume the simulation clock"""
+        self.is_paused = not self.is_paused
+        self._dirty = True
+        return self.is_paused
+
+    def advance(self, now=None):
+        """Run the fixed-timestep ticks owed since the previous call
+        
+        Wall-clock time is accumulated and consumed in SIMULATION_DT ticks,
+        at most MAX_CATCHUP_TICKS per call; any remaining backlog carries
+        over to the next frame so the simulated clock keeps pace with the
+        wall clock even when frames are dropped.
+        
+        Args:
+            now: Current wall-clock time in seconds (defaults to perf_counter)
+        
+        Returns:
+            Number of ticks that were run
+        """
+        if now is None:
+            now = perf_counter()
+        if self._last_clock is None:
+            self._last_clock = now
+            return 0
+        
+        elapsed = now - self._last_clock
+        self._last_clock = now
+        # A long stall (window drag, debugger) is skipped, not replayed
+        self._accumulator = min(self._accumulator + elapsed, MAX_FRAME_TIME)
+        
+        ticks = 0
+        while self._accumulator >= SIMULATION_DT and ticks < MAX_CATCHUP_TICKS:
+            self.time_elapse(SIMULATION_DT)
+            self._accumulator -= SIMULATION_DT
+            ticks += 1
+        
+        self.alpha = min(1.0, self._accumulator / SIMULATION_DT)
+        return ticks
     
-    def time_elapse(self):
-        """Handle time progression and transitions"""
-        self._update_transition()
-        self._update_celestial_bodies()
-        self._update_brightness()
-        self._sync_sim_time_from_angles()
-        # Clock sync removed; simulation still updates celestial bodies
+    def hud_text(self):
+        """The HUD line for the current simulated time (see hud_text())"""
+        return hud_text(self.current_hour, self.current_minute, self.season, self.fps)
+
+    def _draw_time_display(self, renderer):
+        """Draw current time as a simple HUD overlay
+        
+        The overlay is retained geometry keyed by its text, so it is only
+        rebuilt when the displayed string changes.
+        """
+        time_text = self.hud_text()
+        renderer.cached(self._hud, time_text, lambda: draw_label(renderer, *HUD_POSITION, time_text))
+
+    def time_elapse(self, dt=SIMULATION_DT):
+        """Advance the simulation by one tick of dt simulated seconds"""
+        span = self.tracer.span
+        with span("time_elapse", "update"):
+            with span("transition", "update"):
+                self._update_transition(dt)
+            with span("celestial", "update"):
+                self._update_celestial_bodies(dt)
+            with span("brightness", "update"):
+                self._update_brightness(dt)
+            with span("particles", "update"):
+                self._update_particles(dt)
+            self._sync_sim_time_from_angles()
     
-    def _update_transition(self):
+    def _update_transition(self, dt):
         """Update transition state when switching between day and night"""
         if self.is_transitioning:
-            self.transition_progress += TRANSITION_SPEED
+            self.transition_progress += TRANSITION_SPEED * dt * REFERENCE_FPS
             if self.transition_progress >= 1.0:
                 self.transition_progress = 1.0
                 self.is_transitioning = False
     
-    def _update_celestial_bodies(self):
+    def _update_celestial_bodies(self, dt):
         """Update sun and moon positions and handle time transitions"""
         if self.time == "day":
-            if self.sun.revolve():
+            if self.sun.revolve(dt):
                 self.is_transitioning = True
                 self.transition_progress = 0
                 self.switch_time()
         else:
-            if self.moon.revolve():
+            if self.moon.revolve(dt):
                 self.is_transitioning = True
                 self.transition_progress = 0
                 self.switch_time()
     
-    def _update_brightness(self):
+    def _update_brightness(self, dt=SIMULATION_DT):
         """Update colors of environment based on time of day"""
         self.background.change_brightness(
             self.sun, self.time, self.seconds, self.transition_progress
@@ -342,8 +589,22 @@ class Scene:
         self.ground.change_brightness(
             self.sun, self.time, self.seconds, self.transition_progress
         )
-        self.sun.change_brightness(self.sun, self.time, self.seconds)
-        self.moon.change_brightness(self.sun, self.time, self.seconds)
+        self.sun.change_brightness(self.sun, self.time, self.seconds, dt)
+        self.moon.change_brightness(self.sun, self.time, self.seconds, dt)
+
+    def _update_particles(self, dt):
+        """Advance stars, clouds, fireflies and snow"""
+        span = self.tracer.span
+        with span("stars", "update"):
+            self.stars.update(dt)
+        with span("clouds", "update"):
+            for cloud in self.clouds:
+                cloud.update(dt)
+        with span("fireflies", "update"):
+            self.fireflies.update(dt)
+        if self.snowfall is not None:
+            with span("snowfall", "update"):
+                self.snowfall.update(dt)
 
     def _sync_sim_time_from_angles(self):
         """Map celestial angles to simulated clock time for accurate hour/minute tracking"""
@@ -376,14 +637,12 @@ class Scene:
         self.ground.switch_time(self.time)
         
         # Update all entities
-        for star in self.stars:
-            star.switch_time(self.time)
+        self.stars.switch_time(self.time)
         
         for cloud in self.clouds:
             cloud.switch_time(self.time)
         
-        for firefly in self.fireflies:
-            firefly.switch_time(self.time)
+        self.fireflies.switch_time(self.time)
         
         # Update celestial bodies
         self.moon.switch_time()
@@ -398,43 +657,9 @@ class Scene:
         """Toggle between summer and winter seasons and reconfigure scene"""
         self.season = "summer" if self.season == "winter" else "winter"
 
-        # Update day/night schedule based on new season
-        if self.season == "winter":
-            self.day_start = WINTER_DAY_START
-            self.day_end = WINTER_DAY_END
-        else:
-            self.day_start = SUMMER_DAY_START
-            self.day_end = SUMMER_DAY_END
-        self.day_span = self.day_end - self.day_start
-        self.night_start = self.day_end
-        self.night_span = 24 - self.day_span
-
-        # Initialize/disable seasonal effects
-        if self.season == "winter":
-            self.snowfall = Snowfall()
-            self.ground.enable_snow(True)
-            # Clear clouds in winter
-            self.clouds = []
-            # Disable shadows during winter
-            self.tree.set_shadows(False)
-            self.tree_right.set_shadows(False)
-            self.house.set_shadows(False)
-        else:
-            self.snowfall = None
-            self.ground.enable_snow(False)
-            # Regenerate clouds in non-winter
-            self.clouds = [
-                Cloud(x, y, size)
-                for x, y, size in zip(
-                    choices(range(*CLOUD_X_RANGE), k=CLOUD_COUNT),
-                    choices(range(*CLOUD_Y_RANGE), k=CLOUD_COUNT),
-                    [uniform(*CLOUD_SIZE_RANGE) for _ in range(CLOUD_COUNT)]
-                )
-            ]
-            # Enable shadows during summer
-            self.tree.set_shadows(True)
-            self.tree_right.set_shadows(True)
-            self.house.set_shadows(True)
+        # Update day/night schedule and seasonal effects for the new season
+        self._apply_schedule()
+        self._init_seasonal_effects()
 
         # Re-apply current hour to update time-of-day with new schedule
         self._set_time_of_day(self.current_hour)
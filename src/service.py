@@ -0,0 +1,312 @@
+"""
+Render Service
+Serves stills of the scene over HTTP for any season and time of day:
+
+    GET /frame?hour=18&minute=30&season=winter&size=640x360&format=png
+    GET /stats
+
+Frames are rendered by a pool of processes that each build their Scene and
+offscreen renderer once, and encoded frames are kept in a size-bounded LRU
+cache keyed by season, time (quantized to SERVICE_TIME_QUANTUM minutes),
+size and format. /stats reports the cache hit rate and request latencies.
+"""
+import io
+import json
+import multiprocessing
+import multiprocessing.util
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from urllib.parse import urlsplit, parse_qs
+
+from .config import (
+    SEASON, SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_SIZE, SERVICE_MAX_SIZE,
+    SERVICE_CACHE_BYTES, SERVICE_TIME_QUANTUM, SERVICE_RENDERERS, SERVICE_STATS_WINDOW,
+    EXPORT_PNG_COMPRESS_LEVEL,
+)
+from .offscreen import DEFAULT_PLATFORM, use_platform
+from .quality import percentile
+
+FORMATS = {"png": "image/png", "raw": "application/octet-stream"}
+SEASONS = ("summer", "winter")
+
+# Per-process state, set up once by _init_worker
+_worker = None
+
+
+def _init_worker(platform, seed, size):
+    """Pool initializer: build the scene and a renderer for the default size"""
+    global _worker
+    use_platform(platform)
+    from .scene import Scene
+    from .offscreen import create_renderer
+    from .lru import LRUCache
+
+    # One renderer per recently requested output size
+    renderers = LRUCache(SERVICE_RENDERERS, release=lambda renderer: renderer.close())
+    renderers.get(size, lambda: create_renderer(size, platform))
+    # Close the contexts when the worker exits normally
+    multiprocessing.util.Finalize(None, renderers.clear, exitpriority=0)
+    _worker = (Scene(seed=seed), renderers, platform)
+
+
+def _render(season, minutes, size, fmt):
+    """Render and encode one frame in a worker process"""
+    scene, renderers, platform = _worker
+    from .offscreen import create_renderer
+
+    scene.seek(int(minutes // 60), minutes % 60, season)
+    frame = renderers.get(size, lambda: create_renderer(size, platform)).render(scene)
+    if fmt == "raw":
+        return frame.tobytes()
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(frame, "RGB").save(buffer, "PNG", compress_level=EXPORT_PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+class EncodedFrameCache:
+    """Least-recently-used cache of encoded frames, bounded by total bytes"""
+
+    def __init__(self, max_bytes=SERVICE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """The cached bytes for key, or None"""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        """Store data, evicting the least recently used frames to make room"""
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= len(previous)
+        self._entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RenderService:
+    """Renders, caches and times frame requests; safe to call from many threads
+
+    Concurrent requests for a frame that is not cached yet share a single
+    render: the first starts it and the others wait for its result.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, platform=DEFAULT_PLATFORM, seed=0,
+                 size=SERVICE_SIZE, cache_bytes=SERVICE_CACHE_BYTES,
+                 quantum=SERVICE_TIME_QUANTUM):
+        """Start the render processes
+
+        Args:
+            workers: Render processes
+            platform: 'egl', 'osmesa' or 'software'
+            seed: Scene seed, so every worker renders identical frames
+            size: Frame (width, height) when a request gives none; workers
+                  set up a renderer for it in advance
+            cache_bytes: Bound on the encoded frames kept
+            quantum: Minutes requested times are rounded down to
+        """
+        self.size = size
+        self.quantum = quantum
+        self.cache = EncodedFrameCache(cache_bytes)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hits = 0
+        self._renders = 0
+        self._errors = 0
+        # Cache key -> AsyncResult of the render in progress for it
+        self._pending = {}
+        # (seconds, hit) of recent requests
+        self._latencies = deque(maxlen=SERVICE_STATS_WINDOW)
+        # Spawned workers start without the parent's GL state or platform choice
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(workers, _init_worker, (platform, seed, size))
+
+    def key(self, season, hour, minute, size, fmt):
+        """Cache key of a request: its time is quantized to whole quanta"""
+        minutes = (hour * 60 + minute) // self.quantum * self.quantum
+        return season, minutes, tuple(size), fmt
+
+    def frame(self, season=SEASON, hour=12, minute=0, size=None, fmt="png"):
+        """Encoded frame for a time of day
+
+        Returns:
+            (bytes, hit) where hit tells whether the frame came from the cache
+
+        Raises:
+            Whatever the render raised; failed requests are counted as
+            errors and left out of the latency figures
+        """
+        start = perf_counter()
+        key = self.key(season, hour, minute, size or self.size, fmt)
+        with self._lock:
+            data = self.cache.get(key)
+            if data is None:
+                pending = self._pending.get(key)
+                if pending is None:
+                    try:
+                        pending = self._pool.apply_async(_render, key)
+                    except BaseException:
+                        self._errors += 1
+                        raise
+                    self._pending[key] = pending
+                    self._renders += 1
+        hit = data is not None
+        if not hit:
+            try:
+                data = pending.get()
+            except BaseException:
+                with self._lock:
+                    if self._pending.get(key) is pending:
+                        del self._pending[key]
+                    self._errors += 1
+                raise
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+                    self.cache.put(key, data)
+        with self._lock:
+            self._requests += 1
+            self._hits += hit
+            self._latencies.append((perf_counter() - start, hit))
+        return data, hit
+
+    def stats(self):
+        """Request counts, cache hit rate and latency percentiles in ms"""
+        with self._lock:
+            latencies = list(self._latencies)
+            report = {
+                "requests": self._requests,
+                "hits": self._hits,
+                "hit_rate": self._hits / self._requests if self._requests else None,
+                "renders": self._renders,
+                "errors": self._errors,
+                "cache": {"frames": len(self.cache), "bytes": self.cache.bytes,
+                          "max_bytes": self.cache.max_bytes},
+            }
+        for name, subset in (("all", latencies),
+                             ("hit", [entry for entry in latencies if entry[1]]),
+                             ("miss", [entry for entry in latencies if not entry[1]])):
+            times = [seconds * 1000 for seconds, _ in subset]
+            report[f"latency_ms_{name}"] = {
+                "count": len(times),
+                "mean": sum(times) / len(times),
+                "p50": percentile(times, 50),
+                "p95": percentile(times, 95),
+                "p99": percentile(times, 99),
+            } if times else None
+        return report
+
+    def close(self):
+        """Stop the render processes"""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_frame_query(query, default_size=SERVICE_SIZE):
+    """Validate /frame parameters
+
+    Returns:
+        dict of frame() keyword arguments
+
+    Raises:
+        ValueError: with a message for the client
+    """
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    try:
+        hour = int(params.get("hour", 12))
+        minute = float(params.get("minute", 0))
+    except ValueError:
+        raise ValueError("hour must be an integer and minute a number")
+    if not 0 <= hour <= 23 or not 0 <= minute < 60:
+        raise ValueError("hour must be 0-23 and minute 0-59")
+    season = params.get("season", SEASON)
+    if season not in SEASONS:
+        raise ValueError(f"season must be one of {', '.join(SEASONS)}")
+    fmt = params.get("format", "png")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    size = default_size
+    if "size" in params:
+        try:
+            size = tuple(int(v) for v in params["size"].lower().split("x"))
+        except ValueError:
+            size = ()
+        if len(size) != 2:
+            raise ValueError("size must be WIDTHxHEIGHT")
+    if not (0 < size[0] <= SERVICE_MAX_SIZE[0] and 0 < size[1] <= SERVICE_MAX_SIZE[1]):
+        raise ValueError("size must be at most %dx%d" % SERVICE_MAX_SIZE)
+    return {"season": season, "hour": hour, "minute": minute, "size": size, "fmt": fmt}
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Routes /frame and /stats to the server's RenderService"""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == "/frame":
+            try:
+                request = parse_frame_query(url.query, service.size)
+            except ValueError as error:
+                self._send_json({"error": str(error)}, status=400)
+                return
+            try:
+                data, hit = service.frame(**request)
+            except Exception as error:
+                self._send_json({"error": f"render failed: {error}"}, status=500)
+                return
+            headers = {"X-Cache": "hit" if hit else "miss"}
+            if request["fmt"] == "raw":
+                width, height = request["size"]
+                headers.update({"X-Frame-Width": str(width), "X-Frame-Height": str(height),
+                                "X-Frame-Format": "rgb24"})
+            self._send(data, FORMATS[request["fmt"]], headers=headers)
+        elif url.path == "/stats":
+            self._send_json(service.stats())
+        else:
+            self._send_json({"error": "not found; use /frame or /stats"}, status=404)
+
+    def _send_json(self, payload, status=200):
+        self._send(json.dumps(payload, indent=2).encode(), "application/json", status)
+
+    def _send(self, data, content_type, status=200, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate cached responses; see /stats
+        pass
+
+
+def make_server(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    """HTTP server answering requests from service on (host, port)"""
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
@@ -0,0 +1,135 @@
+"""
+Frame Tracing
+Records nested per-phase and per-entity spans for a number of frames and
+writes them as a Chrome trace-event JSON file, which opens in Perfetto
+(ui.perfetto.dev) or chrome://tracing.
+
+Scenes hold NULL_TRACER unless tracing was asked for; its spans are a
+shared do-nothing context manager, so disabled tracing costs one method
+call per span.
+"""
+import os
+import threading
+from time import perf_counter_ns
+
+from .config import TRACE_FRAMES
+
+
+class _NullSpan:
+    """Context manager that does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer that records nothing"""
+
+    enabled = False
+    finished = False
+
+    def span(self, name, category="scene"):
+        return _NULL_SPAN
+
+    def frame(self):
+        return _NULL_SPAN
+
+
+NULL_TRACER = NullTracer()
+
+
+class _Span:
+    """Times its with-block and records it as a complete ("X") event"""
+
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.category, self.start, perf_counter_ns())
+        return False
+
+
+class _FrameSpan(_Span):
+    """Span around a whole frame; the tracer finishes after its last frame"""
+
+    __slots__ = ()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        self.tracer._end_frame()
+        return False
+
+
+class FrameTracer:
+    """Records spans for a fixed number of frames, then writes the trace"""
+
+    enabled = True
+
+    def __init__(self, path, frames=TRACE_FRAMES):
+        """
+        Args:
+            path: Output .json file, written once `frames` frames completed
+            frames: Number of frames to record
+        """
+        self.path = path
+        self.frames = frames
+        self.frame_count = 0
+        self.finished = False
+        self._events = []
+        self._origin = perf_counter_ns()
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+
+    def span(self, name, category="scene"):
+        """Context manager timing a named phase or entity"""
+        if self.finished:
+            return _NULL_SPAN
+        return _Span(self, name, category)
+
+    def frame(self):
+        """Context manager around one whole frame"""
+        if self.finished:
+            return _NULL_SPAN
+        return _FrameSpan(self, f"frame {self.frame_count}", "frame")
+
+    def _record(self, name, category, start, end):
+        self._events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            # Trace timestamps are microseconds
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self._pid,
+            "tid": self._tid,
+        })
+
+    def _end_frame(self):
+        self.frame_count += 1
+        if self.frame_count >= self.frames:
+            self.write()
+
+    def write(self):
+        """Write the events recorded so far and stop recording"""
+        import json
+
+        self.finished = True
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self._events, "displayTimeUnit": "ms"}, f)
+        return self.path
@@ -0,0 +1,61 @@
+"""Background: the sky gradient mesh and when its colors are rebuilt"""
+import numpy as np
+
+from src.config import SKY_REBUILD_THRESHOLD
+from src.entities.background import Background
+from src.render import CountingBackend, QUADS
+
+
+class RecordingBackend(CountingBackend):
+    """Keeps the colors of the last draw"""
+
+    def draw(self, mode, vertices, color=None, colors=None, blend=False, size=1.0):
+        super().draw(mode, vertices, color, colors, blend, size)
+        self.colors = np.array(colors)
+
+
+def test_gradient_is_one_batch_covering_the_window():
+    sky = Background(steps=50)
+    backend = CountingBackend()
+    sky.draw(backend)
+    assert backend.calls[QUADS] == 1 and backend.vertices[QUADS] == 4 * 50
+    assert sky._vertices[:, 1].min() == 0 and np.isclose(sky._vertices[:, 1].max(), sky.height)
+    assert sky._vertices[:, 0].min() == 0 and sky._vertices[:, 0].max() == sky.width
+
+
+def test_colors_only_rebuild_past_the_threshold():
+    sky = Background(steps=20)
+    backend = RecordingBackend()
+    sky.draw(backend)
+    first = backend.colors
+
+    r, g, b = sky.color
+    sky.color = (r, g + SKY_REBUILD_THRESHOLD / 2, b)
+    sky.draw(backend)
+    assert np.array_equal(backend.colors, first)
+
+    sky.color = (r, g + SKY_REBUILD_THRESHOLD * 2, b)
+    sky.draw(backend)
+    assert not np.array_equal(backend.colors, first)
+
+
+def test_rebuilt_colors_match_a_fresh_gradient():
+    sky = Background(steps=20)
+    sky.draw(RecordingBackend())
+    sky.color, sky.bright = (0.2, 0.3, 0.4), 1.0
+    backend = RecordingBackend()
+    sky.draw(backend)
+
+    fresh = Background(steps=20)
+    fresh.color, fresh.bright = (0.2, 0.3, 0.4), 1.0
+    expected = RecordingBackend()
+    fresh.draw(expected)
+    assert np.array_equal(backend.colors, expected.colors)
+
+
+def test_set_steps_rebuilds_the_mesh():
+    sky = Background(steps=100)
+    sky.set_steps(25)
+    backend = CountingBackend()
+    sky.draw(backend)
+    assert backend.vertices[QUADS] == 4 * 25
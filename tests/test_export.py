@@ -0,0 +1,78 @@
+"""FrameWriter: backpressure policies, output files and encoder errors"""
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.export import FrameWriter
+
+
+class GatedWriter(FrameWriter):
+    """Encoder threads wait for the gate before taking any frame"""
+
+    def __init__(self, *args, **kwargs):
+        self.gate = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _encode_sequence(self):
+        self.gate.wait()
+        super()._encode_sequence()
+
+
+def frame(value):
+    return np.full((9, 16, 3), value, dtype=np.uint8)
+
+
+def test_drop_discards_frames_while_the_queue_is_full(tmp_path):
+    writer = GatedWriter(str(tmp_path / "f_{:03d}.png"), queue_size=2,
+                         backpressure="drop", workers=1)
+    results = [writer.write(frame(i)) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert (writer.written, writer.dropped) == (2, 3)
+
+    writer.gate.set()
+    writer.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["f_000.png", "f_001.png"]
+
+
+def test_block_waits_for_room_and_keeps_every_frame(tmp_path):
+    writer = GatedWriter(str(tmp_path / "f_{:03d}.png"), queue_size=1,
+                         backpressure="block", workers=2)
+    writer.write(frame(0))
+    blocked = threading.Thread(target=writer.write, args=(frame(1),))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()
+
+    writer.gate.set()
+    blocked.join()
+    for i in range(2, 8):
+        assert writer.write(frame(i))
+    writer.close()
+    assert (writer.written, writer.dropped) == (8, 0)
+    assert len(list(tmp_path.iterdir())) == 8
+    assert np.array_equal(np.asarray(Image.open(tmp_path / "f_005.png")), frame(5))
+
+
+def test_animation_holds_every_frame(tmp_path):
+    path = tmp_path / "out.gif"
+    with FrameWriter(str(path)) as writer:
+        for i in range(3):
+            writer.write(frame(i * 80))
+    assert Image.open(path).n_frames == 3
+
+
+def test_rejects_unknown_options(tmp_path):
+    with pytest.raises(ValueError):
+        FrameWriter(str(tmp_path / "f_{:03d}.png"), backpressure="wait")
+    with pytest.raises(ValueError):
+        FrameWriter(str(tmp_path / "out.mp4"))
+
+
+def test_encoder_errors_surface_on_close(tmp_path):
+    writer = FrameWriter(str(tmp_path / "f_{:03d}.png"), workers=1)
+    writer.write("not a frame")
+    with pytest.raises(RuntimeError) as raised:
+        writer.close()
+    assert raised.value.__cause__ is not None
@@ -0,0 +1,73 @@
+"""FireflySwarm: detail bounds, active-only flight and single-batch drawing"""
+import numpy as np
+
+from src.config import FIREFLY_RANGE
+from src.entities.nature import FireflySwarm, FIREFLY_SPEED_RANGE
+from src.render import CountingBackend, QUADS
+
+
+def test_detail_is_clamped_to_the_swarm():
+    swarm = FireflySwarm(40, seed=0)
+    swarm.set_detail(0.5)
+    assert swarm.active == 20
+    swarm.set_detail(1.5)
+    assert swarm.active == 40
+    swarm.set_detail(-0.5)
+    assert swarm.active == 0
+
+
+def test_only_active_fireflies_fly():
+    swarm = FireflySwarm(40, seed=0)
+    swarm.set_detail(0.5)
+    x, y = swarm.x.copy(), swarm.y.copy()
+    for _ in range(100):
+        swarm.update()
+    assert not np.array_equal(swarm.x[:20], x[:20])
+    assert np.array_equal(swarm.x[20:], x[20:]) and np.array_equal(swarm.y[20:], y[20:])
+
+
+def test_fireflies_stay_in_their_range():
+    swarm = FireflySwarm(200, seed=0)
+    for _ in range(5000):
+        swarm.fly()
+    (x0, x1), (y0, y1) = FIREFLY_RANGE
+    # Headings turn back at the bounds, at most a step past them
+    slack = FIREFLY_SPEED_RANGE[1] + 1e-3
+    assert swarm.x.min() >= x0 - slack and swarm.x.max() <= x1 + slack
+    assert swarm.y.min() >= y0 - slack and swarm.y.max() <= y1 + slack
+
+
+def test_swarm_is_one_batch_of_active_quads():
+    swarm = FireflySwarm(40, seed=0)
+    backend = CountingBackend()
+    swarm.draw(backend)
+    assert backend.calls[QUADS] == 1 and backend.vertices[QUADS] == 4 * 40
+    swarm.set_detail(0.25)
+    backend.reset()
+    swarm.draw(backend)
+    assert backend.vertices[QUADS] == 4 * 10
+
+
+def test_hidden_swarm_draws_nothing():
+    swarm = FireflySwarm(40, seed=0)
+    swarm.switch_time("day")
+    backend = CountingBackend()
+    swarm.update()
+    swarm.draw(backend)
+    assert backend.total_calls == 0
+
+
+def test_seek_resets_flash_colors_and_sizes():
+    swarm = FireflySwarm(40, seed=0)
+    swarm.switch_time("night")
+    for _ in range(2000):
+        swarm.fly()
+    assert (swarm.pointsize != 2).any() or not np.allclose(swarm.color, swarm.color[0])
+    swarm.seek(500)
+
+    fresh = FireflySwarm(40, seed=0)
+    fresh.switch_time("night")
+    fresh.seek(500)
+    assert np.array_equal(swarm.color, fresh.color)
+    assert np.array_equal(swarm.pointsize, fresh.pointsize)
+    assert np.array_equal(swarm.x, fresh.x) and np.array_equal(swarm.y, fresh.y)
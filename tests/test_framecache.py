@@ -0,0 +1,66 @@
+"""FrameCache: frame lookups by clock time, wrapping around the day"""
+import numpy as np
+import pytest
+
+from src.framecache import FrameCache, MINUTES_PER_DAY, build_frame_cache
+from src.scene import ticks_since_midnight
+
+FRAMES = 24
+
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("framecache")
+    build_frame_cache("winter", str(directory), frames=FRAMES, size=(32, 18),
+                      workers=1, platform="software")
+    return str(directory)
+
+
+@pytest.fixture
+def cache(directory):
+    return FrameCache("winter", directory)
+
+
+def test_cube_holds_a_day_of_frames(cache):
+    assert cache.frames.shape == (FRAMES, 18, 32, 3)
+    assert cache.index["minute_step"] == MINUTES_PER_DAY / FRAMES
+    # Midnight and noon are not the same picture
+    assert not np.array_equal(cache.frame(0), cache.frame(FRAMES // 2))
+
+
+def test_offset_at_minute_wraps_around_the_day(cache):
+    step = MINUTES_PER_DAY // FRAMES
+    assert cache.offset_at_minute(0) == 0
+    assert cache.offset_at_minute(step - 1) == 0
+    assert cache.offset_at_minute(12 * 60) == FRAMES // 2
+    assert cache.offset_at_minute(MINUTES_PER_DAY - 1) == FRAMES - 1
+    assert cache.offset_at_minute(MINUTES_PER_DAY) == 0
+    assert cache.offset_at_minute(MINUTES_PER_DAY + 13 * 60) == 13 * 60 // step
+    assert cache.offset_at_minute(-1) == FRAMES - 1
+    assert cache.offset_at_minute(-MINUTES_PER_DAY) == 0
+
+
+def test_offset_at_ticks_wraps_around_the_day(cache):
+    day = cache.index["day_ticks"]
+    assert day == pytest.approx(ticks_since_midnight(24, "winter"))
+    for offset in (0, 5, FRAMES - 2):
+        # Halfway to the next frame, clear of rounding at the boundaries
+        ticks = (cache.ticks_of(offset) + cache.ticks_of(offset + 1)) / 2
+        for days in (0, 1, 3, -1):
+            assert cache.offset_at_ticks(ticks + days * day) == offset
+    assert cache.offset_at_ticks(day - 1e-3) == FRAMES - 1
+    # Midnight shows the first frame again, however many days have passed
+    for days in range(1, 50):
+        assert cache.offset_at_ticks(days * day) == 0
+
+
+def test_minute_and_ticks_agree(cache):
+    for offset in range(FRAMES):
+        minute = cache.minute_of(offset)
+        assert cache.offset_at_minute(minute) == offset
+        assert cache.ticks_of(offset) == pytest.approx(ticks_since_midnight(minute / 60, "winter"))
+
+
+def test_missing_cache_does_not_open(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FrameCache("summer", str(tmp_path))
@@ -0,0 +1,30 @@
+"""GL layers in a letterboxed window, recorded without a GL context"""
+from src.render import GLBackend, RetainedGeometry
+from src.render.commands import CommandBuffer
+from src.render.recorder import GLCallRecorder
+from src.scene import Scene
+
+# A 16:9 scene pillarboxed in a 4:3 window
+ORIGIN, SIZE = (160, 0), (1600, 900)
+
+
+def test_layer_renders_with_the_viewport_at_the_origin():
+    recorder = GLCallRecorder(viewport=SIZE, origin=ORIGIN)
+    seen = []
+    with recorder.installed():
+        GLBackend().layer(RetainedGeometry(), "static",
+                          lambda: seen.append((recorder.origin, recorder.viewport)))
+        assert seen == [((0, 0), SIZE)]
+        assert (recorder.origin, recorder.viewport) == (ORIGIN, SIZE)
+
+
+def test_scene_frame_restores_the_letterboxed_viewport():
+    scene = Scene(hour=12, seed=1)
+    recorder = GLCallRecorder(viewport=SIZE, origin=ORIGIN)
+    with recorder.installed():
+        recorder.record_frame(scene, CommandBuffer(GLBackend()))
+        # Every layer is new, and gets one reset and one restore
+        calls = recorder.by_call()
+        layers = calls["glFramebufferTexture2D"]
+        assert layers > 0 and calls["glViewport"] == 2 * layers
+        assert (recorder.origin, recorder.viewport) == (ORIGIN, SIZE)
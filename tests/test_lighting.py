@@ -0,0 +1,84 @@
+"""Lighting tables: lookups against the analytic curves they replaced"""
+import math
+
+import numpy as np
+import pytest
+
+from src.config import (
+    NIGHT_SKY, DAY_SKY, GRASS_DAY_COLOR, GRASS_NIGHT_COLOR, SUN_COLOR, MOON_COLOR,
+)
+from src.lighting import LightingTable, sample_keyframes
+from src.scene import Scene, day_schedule
+
+# Half a table step of angle moves a color by at most this much
+TOLERANCE = 1e-3
+
+
+def blend(start, end, weight):
+    return tuple(a + (b - a) * weight for a, b in zip(start, end))
+
+
+def keyframe_angles(season):
+    """Sun angle on every whole hour from sunrise to sunset"""
+    day_start, day_end = day_schedule(season)
+    span = day_end - day_start
+    return [math.pi * (hour - day_start) / span for hour in range(day_start, day_end + 1)]
+
+
+@pytest.mark.parametrize("season", ["summer", "winter"])
+def test_arc_lookups_match_the_analytic_curves(season):
+    table = LightingTable(sky_keyframes=None, ground_keyframes=None)
+    for angle in keyframe_angles(season):
+        daylight = max(0.0, math.sin(angle))
+        glow = daylight ** 1.5
+        assert table.daylight(angle) == pytest.approx(daylight, abs=TOLERANCE)
+        assert table.sky(angle) == pytest.approx(blend(NIGHT_SKY, DAY_SKY, daylight), abs=TOLERANCE)
+        assert table.ground(angle) == pytest.approx(
+            blend(GRASS_NIGHT_COLOR, GRASS_DAY_COLOR, daylight), abs=TOLERANCE)
+        assert table.sun(angle) == pytest.approx((*SUN_COLOR, glow), abs=TOLERANCE)
+        assert table.moon(angle) == pytest.approx((*MOON_COLOR, glow), abs=TOLERANCE)
+
+
+def test_dusk_lookups_match_the_linear_fade():
+    table = LightingTable()
+    for progress in np.linspace(0.0, 1.0, 11):
+        assert table.dusk_sky(progress) == pytest.approx(
+            blend(DAY_SKY, NIGHT_SKY, progress), abs=TOLERANCE)
+        assert table.dusk_ground(progress) == pytest.approx(
+            blend(GRASS_DAY_COLOR, GRASS_NIGHT_COLOR, progress), abs=TOLERANCE)
+
+
+def test_lookups_clamp_outside_the_arc():
+    table = LightingTable()
+    assert table.sky(-1.0) == table.sky(0.0)
+    assert table.sky(4.0) == table.sky(math.pi)
+    assert table.dusk_sky(2.0) == table.dusk_sky(1.0)
+
+
+@pytest.mark.parametrize("season", ["summer", "winter"])
+def test_scene_lighting_follows_the_sun_at_each_hour(season):
+    scene = Scene(season=season, seed=1)
+    day_start, day_end = day_schedule(season)
+    for hour in range(day_start, day_end):
+        scene.seek(hour, season=season)
+        daylight = max(0.0, math.sin(scene.sun.angle))
+        assert scene.background.color == pytest.approx(
+            blend(NIGHT_SKY, DAY_SKY, daylight), abs=TOLERANCE)
+        assert scene.ground.current_color == pytest.approx(
+            blend(GRASS_NIGHT_COLOR, GRASS_DAY_COLOR, daylight), abs=TOLERANCE)
+
+
+def test_keyframes_interpolate_and_hold_the_end_colors():
+    keyframes = ((0.0, (0.0, 0.0, 0.0)), (0.5, (1.0, 0.5, 0.0)), (1.0, (0.0, 1.0, 1.0)))
+    colors = sample_keyframes(keyframes, np.array([-0.5, 0.0, 0.25, 0.5, 0.75, 1.5]))
+    assert np.allclose(colors, [
+        (0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.5, 0.25, 0.0),
+        (1.0, 0.5, 0.0), (0.5, 0.75, 0.5), (0.0, 1.0, 1.0),
+    ])
+    table = LightingTable(sky_keyframes=keyframes)
+    assert table.sky(math.pi / 2) == pytest.approx((1.0, 0.5, 0.0), abs=TOLERANCE)
+
+
+def test_keyframes_must_be_in_order():
+    with pytest.raises(ValueError):
+        sample_keyframes(((0.5, (0, 0, 0)), (0.2, (1, 1, 1))), np.array([0.3]))
@@ -0,0 +1,104 @@
+"""QualityGovernor: stepping presets down fast, up slowly, with backoff"""
+from src.config import QUALITY_PRESETS
+from src.quality import QualityGovernor, MAX_BACKOFF, percentile
+
+LEVELS = list(QUALITY_PRESETS)
+WINDOW = 10
+FAST, MIDDLE, SLOW = 0.1, 0.7, 2.0
+
+
+class FakeScene:
+    """Just the quality state the governor reads and sets"""
+
+    def __init__(self, quality):
+        self.quality = quality
+        self.changes = []
+
+    def set_quality(self, quality):
+        self.quality = quality
+        self.changes.append(quality)
+
+
+def governor(level):
+    scene = FakeScene(LEVELS[level])
+    return scene, QualityGovernor(scene, budget=1.0, pct=90, window=WINDOW, headroom=0.5)
+
+
+def feed(governor, seconds, frames):
+    """Record frames until the preset changes; returns how many it took"""
+    for frame in range(1, frames + 1):
+        if governor.record(seconds) is not None:
+            return frame
+    return None
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 90) == 9
+    assert percentile(values, 95) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([5.0], 50) == 5.0
+
+
+def test_nothing_changes_before_the_window_fills():
+    scene, quality = governor(len(LEVELS) - 1)
+    assert feed(quality, SLOW, WINDOW - 1) is None
+    assert scene.changes == []
+
+
+def test_steps_down_as_soon_as_the_percentile_is_over_budget():
+    top = len(LEVELS) - 1
+    scene, quality = governor(top)
+    feed(quality, FAST, WINDOW)
+    # The 90th percentile of 10 frames is the second slowest
+    assert feed(quality, SLOW, WINDOW) == 2
+    assert scene.changes == [LEVELS[top - 1]]
+    assert len(quality._times) == 0
+
+
+def test_no_change_between_headroom_and_budget():
+    scene, quality = governor(1)
+    assert feed(quality, MIDDLE, 20 * WINDOW) is None
+    assert scene.changes == []
+
+
+def test_steps_up_after_a_calm_window():
+    scene, quality = governor(0)
+    assert feed(quality, FAST, 5 * WINDOW) == WINDOW
+    assert scene.changes == [LEVELS[1]]
+
+
+def test_calm_waits_for_slow_frames_to_leave_the_window():
+    scene, quality = governor(0)
+    feed(quality, FAST, WINDOW - 2)
+    # Two middling frames lift the percentile out of the headroom
+    assert feed(quality, MIDDLE, 2) is None
+    # Calm again once the first of them has left the window
+    assert feed(quality, FAST, WINDOW) == WINDOW - 1
+    assert scene.changes == [LEVELS[1]]
+
+
+def test_each_failure_doubles_the_wait_before_retrying():
+    top = len(LEVELS) - 1
+    scene, quality = governor(top)
+    waits = []
+    for _ in range(3):
+        feed(quality, FAST, WINDOW)
+        feed(quality, SLOW, WINDOW)
+        assert scene.quality == LEVELS[top - 1]
+        waits.append(feed(quality, FAST, 100 * WINDOW))
+        assert scene.quality == LEVELS[top]
+    assert waits == [2 * WINDOW, 4 * WINDOW, 8 * WINDOW]
+
+
+def test_backoff_is_capped():
+    top = len(LEVELS) - 1
+    scene, quality = governor(top - 1)
+    quality._failures[top] = MAX_BACKOFF + 3
+    assert feed(quality, FAST, 100 * WINDOW) == 2 ** MAX_BACKOFF * WINDOW
+
+
+def test_lowest_preset_stays_when_too_slow():
+    scene, quality = governor(0)
+    assert feed(quality, SLOW, 5 * WINDOW) is None
+    assert scene.changes == []
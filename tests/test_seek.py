@@ -0,0 +1,67 @@
+"""
+Scene.seek() guarantees
+
+seek() must give the same state whatever the scene went through before,
+and the state live stepping reaches from an earlier seek.
+"""
+import numpy as np
+import pytest
+
+from src.render.commands import CommandBuffer
+from src.render.software import SoftwareBackend
+from src.scene import Scene, ticks_since_midnight
+
+TIMES = [("summer", 9, 0), ("summer", 18, 20), ("winter", 22, 30), ("winter", 16, 10)]
+
+
+def state(scene):
+    """Everything seek() sets, as plain values for comparison"""
+    snapshot = {
+        "clock": (scene.current_hour, scene.current_minute, scene.time, scene.season),
+        "bodies": (scene.sun.angle, scene.moon.angle, scene.sun.color, scene.moon.color),
+        "transition": scene.transition_progress,
+        "stars": scene.stars.size.tolist(),
+        "fireflies": (scene.fireflies.x.tolist(), scene.fireflies.y.tolist()),
+        "clouds": [cloud.x for cloud in scene.clouds],
+    }
+    if scene.snowfall is not None:
+        snapshot["snow"] = (scene.snowfall.x.tolist(), scene.snowfall.y.tolist())
+    return snapshot
+
+
+def render(scene):
+    raster = SoftwareBackend((320, 180))
+    scene.render(CommandBuffer(raster), hud=False)
+    return raster.frame()
+
+
+@pytest.mark.parametrize("season, hour, minute", TIMES)
+def test_seek_is_independent_of_history(season, hour, minute):
+    fresh = Scene(season=season, seed=0)
+    fresh.seek(hour, minute)
+    travelled = Scene(hour=(hour + 7) % 24, season="winter" if season == "summer" else "summer",
+                      seed=0)
+    for _ in range(50):
+        travelled.time_elapse()
+    travelled.seek(3, 15)
+    travelled.seek(hour, minute, season)
+    assert state(travelled) == state(fresh)
+    assert np.array_equal(render(travelled), render(fresh))
+
+
+@pytest.mark.parametrize("start, end", [(3, 9), (5, 14), (17, 23)])
+def test_stepping_from_a_seek_matches_seek(start, end):
+    stepped = Scene(hour=0, season="summer", seed=0)
+    stepped.seek(start)
+    ticks = ticks_since_midnight(end, "summer") - ticks_since_midnight(start, "summer")
+    for _ in range(round(ticks)):
+        stepped.time_elapse()
+    target = Scene(hour=0, season="summer", seed=0)
+    target.seek(end)
+
+    # Whole ticks land within a minute of the target time
+    minutes = stepped.current_hour * 60 + stepped.current_minute
+    assert abs(minutes - end * 60) <= 1
+    assert stepped.time == target.time
+    for cloud, expected in zip(stepped.clouds, target.clouds):
+        assert cloud.x == pytest.approx(expected.x, abs=2 * cloud.speed)
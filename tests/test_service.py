@@ -0,0 +1,90 @@
+"""RenderService: cached frames, shared renders and failed requests"""
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.service import RenderService, make_server
+
+SIZE = (64, 36)
+
+
+def start(service):
+    server = make_server(service, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:%d" % server.server_address[1]
+
+
+@pytest.fixture(scope="module")
+def service():
+    with RenderService(workers=1, platform="software", size=SIZE) as service:
+        yield service
+
+
+def test_repeat_requests_are_cache_hits(service):
+    first, hit = service.frame("summer", 9, 0)
+    assert not hit and first.startswith(b"\x89PNG")
+    # Within the same time quantum
+    again, hit = service.frame("summer", 9, service.quantum - 1)
+    assert hit and again == first
+    assert service.frame("summer", 9, 0, fmt="raw")[0] != first
+
+
+def test_concurrent_requests_share_one_render(service):
+    renders = service.stats()["renders"]
+    # Keep the only worker busy so every request finds the render in flight
+    busy = service._pool.apply_async(time.sleep, (0.3,))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.frame("winter", 20, 0)))
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    busy.get()
+
+    assert service.stats()["renders"] == renders + 1
+    assert len({data for data, _ in results}) == 1
+    assert not any(hit for _, hit in results)
+
+
+def test_failed_render_is_counted_and_not_cached(service):
+    errors = service.stats()["errors"]
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            service.frame(size=(-5, 0))
+    assert service.stats()["errors"] == errors + 2
+    assert not service._pending
+
+
+def test_http_frames_and_stats(service):
+    server, url = start(service)
+    try:
+        with urllib.request.urlopen(url + "/frame?hour=6&season=winter&format=raw") as response:
+            assert response.headers["X-Frame-Width"] == str(SIZE[0])
+            assert len(response.read()) == SIZE[0] * SIZE[1] * 3
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(url + "/frame?hour=25")
+        assert raised.value.code == 400
+        with urllib.request.urlopen(url + "/stats") as response:
+            assert json.load(response)["requests"] >= 1
+    finally:
+        server.shutdown()
+
+
+def test_http_answers_500_when_rendering_fails():
+    service = RenderService(workers=1, platform="software", size=SIZE)
+    server, url = start(service)
+    try:
+        service._pool.terminate()
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(url + "/frame?hour=3")
+        assert raised.value.code == 500
+        assert json.load(raised.value)["error"].startswith("render failed")
+        assert service.stats()["errors"] == 1
+    finally:
+        server.shutdown()
+        service.close()
@@ -0,0 +1,66 @@
+"""Snowfall pool: active counts stay within the pool and buffers follow them"""
+import numpy as np
+
+from src.entities.snow import Snowfall
+from src.render import CountingBackend, TRIANGLES
+
+
+def test_intensity_is_capped_by_capacity():
+    snow = Snowfall(intensity_multiplier=1.0, capacity=100, seed=0)
+    assert snow.active == 100
+    snow.set_intensity(3.0)
+    assert snow.active == 100
+    snow.set_intensity(0.5)
+    assert snow.active == 50
+    snow.set_intensity(-1.0)
+    assert snow.active == 0
+
+
+def test_detail_scales_the_intensity_count():
+    snow = Snowfall(intensity_multiplier=0.5, capacity=100, seed=0)
+    snow.set_detail(0.5)
+    assert snow.active == 25
+    snow.set_detail(2.0)
+    assert snow.detail == 1.0 and snow.active == 50
+    snow.set_detail(-1.0)
+    assert snow.active == 0
+    # Intensity changes keep the preset's share
+    snow.set_detail(0.25)
+    snow.set_intensity(1.0)
+    assert snow.active == 25
+
+
+def test_reactivated_flakes_are_on_screen():
+    snow = Snowfall(intensity_multiplier=0.1, capacity=100, seed=0)
+    snow.set_intensity(1.0)
+    assert (snow.x >= 0).all() and (snow.x <= snow.width).all()
+    assert np.array_equal(snow.prev_y, snow.y)
+
+
+def test_vertex_buffer_grows_with_active_count():
+    snow = Snowfall(intensity_multiplier=1.0, capacity=1000, seed=0)
+    backend = CountingBackend()
+    snow.set_detail(0.1)
+    snow.draw(backend)
+    per_flake = backend.vertices[TRIANGLES] // 100
+    assert len(snow._vertices) == 100
+    snow.set_detail(0.5)
+    backend.reset()
+    snow.draw(backend)
+    assert len(snow._vertices) == 500
+    assert backend.vertices[TRIANGLES] == 500 * per_flake
+    # Lowering the count reuses the larger buffer
+    snow.set_detail(0.2)
+    snow.draw(backend)
+    assert len(snow._vertices) == 500
+
+
+def test_one_draw_call_for_every_active_flake():
+    snow = Snowfall(intensity_multiplier=1.0, capacity=200, seed=0)
+    backend = CountingBackend()
+    snow.draw(backend)
+    assert backend.calls[TRIANGLES] == 1
+    snow.set_intensity(0.0)
+    backend.reset()
+    snow.draw(backend)
+    assert backend.total_calls == 0
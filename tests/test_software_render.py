@@ -0,0 +1,150 @@
+"""
+Rendering invariants of the software backend
+
+The command buffer, cached layers and rasterizer all promise output
+identical to a plain, uncached draw. These checks render the same scenes
+both ways through SoftwareBackend and compare the pixels exactly.
+"""
+import numpy as np
+import pytest
+
+from src.render.backend import QUADS, POLYGON, TRIANGLES
+from src.render.commands import CommandBuffer
+from src.render.raster import rasterize, span_pixels, to_triangles
+from src.render.software import SoftwareBackend
+from src.scene import Scene
+
+SIZE = (320, 180)
+# A summer morning and evening, a winter night and a winter dusk mid-transition
+TIMES = [("summer", 9, 0), ("summer", 18, 20), ("winter", 22, 30), ("winter", 16, 10)]
+
+
+def render(scene, buffered=True):
+    """Render a scene's current state through SoftwareBackend, optionally batched"""
+    raster = SoftwareBackend(SIZE)
+    scene.render(CommandBuffer(raster) if buffered else raster, hud=False)
+    return raster.frame()
+
+
+def seeked(season, hour, minute, **options):
+    scene = Scene(season=season, seed=0, **options)
+    scene.seek(hour, minute)
+    return scene
+
+
+def coverage(triangles, width, height):
+    """How many times each pixel is covered by the triangles"""
+    _, rows, starts, ends = rasterize(triangles, width, height)
+    pixels, _ = span_pixels(rows, starts, ends, width)
+    return np.bincount(pixels, minlength=width * height).reshape(height, width)
+
+
+@pytest.mark.parametrize("season, hour, minute", TIMES)
+def test_command_buffer_matches_direct_draws(season, hour, minute):
+    scene = seeked(season, hour, minute, cache_layers=False)
+    assert np.array_equal(render(scene, buffered=True), render(scene, buffered=False))
+
+
+def test_command_buffer_keeps_order_of_overlapping_draws():
+    # The two red quads share a state, but the blended quad between them
+    # overlaps both, so they must not be merged past it
+    def draw(backend):
+        backend.begin_frame()
+        backend.draw(QUADS, [(10, 10), (60, 10), (60, 60), (10, 60)], color=(1.0, 0.0, 0.0))
+        backend.draw(QUADS, [(40, 40), (90, 40), (90, 90), (40, 90)],
+                     color=(0.0, 0.0, 1.0, 0.5), blend=True)
+        backend.draw(QUADS, [(70, 70), (120, 70), (120, 120), (70, 120)], color=(1.0, 0.0, 0.0))
+        # Disjoint from everything above, so free to merge
+        backend.draw(QUADS, [(200, 10), (250, 10), (250, 60), (200, 60)], color=(1.0, 0.0, 0.0))
+        backend.end_frame()
+
+    direct, batched = SoftwareBackend(SIZE, SIZE), SoftwareBackend(SIZE, SIZE)
+    draw(direct)
+    buffer = CommandBuffer(batched)
+    draw(buffer)
+    assert np.array_equal(batched.frame(), direct.frame())
+    assert buffer.stats["batches"] < buffer.stats["commands"]
+
+
+@pytest.mark.parametrize("season, hour, minute", TIMES)
+def test_cached_layers_match_uncached(season, hour, minute):
+    cached = seeked(season, hour, minute, cache_layers=True)
+    uncached = seeked(season, hour, minute, cache_layers=False)
+    expected = render(uncached)
+    assert np.array_equal(render(cached), expected)
+    # Replayed from the cache, not just built on the first frame
+    raster = SoftwareBackend(SIZE)
+    backend = CommandBuffer(raster)
+    for _ in range(2):
+        cached.render(backend, hud=False)
+    assert np.array_equal(raster.frame(), expected)
+
+
+def test_shared_edges_cover_pixels_once():
+    # A grid of quads with fractional corners; neighbouring quads and the
+    # two triangles of each quad share edges
+    xs, ys = np.linspace(0.3, 40.3, 9), np.linspace(0.7, 30.7, 7)
+    quads = [[(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+             for x0, x1 in zip(xs, xs[1:]) for y0, y1 in zip(ys, ys[1:])]
+    triangles, _ = to_triangles(QUADS, np.concatenate(quads))
+    counts = coverage(triangles, 48, 36)
+    assert counts.max() == 1
+    # Pixel centers from (0.5, 1.5) to (39.5, 30.5) lie inside the grid
+    assert counts.sum() == 40 * 30
+    assert counts[1:31, 0:40].all()
+
+
+def test_fan_covers_pixels_once():
+    angles = np.linspace(0, 2 * np.pi, 48, endpoint=False)
+    circle = np.column_stack((50.25 + 30.6 * np.cos(angles), 40.75 + 30.6 * np.sin(angles)))
+    triangles, _ = to_triangles(POLYGON, circle)
+    assert coverage(triangles, 100, 80).max() == 1
+
+
+def test_rasterizer_samples_pixel_centers():
+    # Covers the centers of columns 2..5 and rows 1..2 exactly
+    triangles, _ = to_triangles(TRIANGLES, [(2.5, 1.5), (6.5, 1.5), (2.5, 3.5),
+                                            (6.5, 1.5), (6.5, 3.5), (2.5, 3.5)])
+    counts = coverage(triangles, 10, 6)
+    expected = np.zeros((6, 10), dtype=counts.dtype)
+    expected[1:3, 2:6] = 1
+    assert np.array_equal(counts, expected)
+
+
+class RetainingBackend(SoftwareBackend):
+    """SoftwareBackend that keeps cached geometry as a recorded list, like
+    GLBackend's display lists, and counts how often it is built"""
+
+    retains_geometry = True
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.builds = 0
+        self.replays = 0
+
+    def cached(self, geometry, key, build):
+        calls = geometry.lookup(self, key)
+        if calls is None:
+            self.builds += 1
+            calls = []
+            draw, self.draw = self.draw, lambda *args, **kwargs: calls.append((args, kwargs))
+            try:
+                build()
+            finally:
+                del self.draw
+            geometry.store(self, key, calls)
+        self.replays += 1
+        for args, kwargs in calls:
+            self.draw(*args, **kwargs)
+
+
+def test_retained_geometry_reaches_a_retaining_target():
+    scene = seeked("summer", 10, 0, cache_layers=False)
+    expected = render(scene, buffered=False)
+    target = RetainingBackend(SIZE)
+    buffer = CommandBuffer(target)
+    for _ in range(3):
+        scene.render(buffer, hud=False)
+    assert np.array_equal(target.frame(), expected)
+    # Built once per geometry, replayed every frame
+    assert target.builds and target.replays == 3 * target.builds
@@ -0,0 +1,57 @@
+"""StarField: detail bounds, active-only animation and batched drawing"""
+import numpy as np
+
+from src.entities.celestial import StarField, STAR_MIN_SIZE, STAR_MAX_SIZE, STAR_SIZE_QUANTUM
+from src.render import CountingBackend, POINTS
+
+
+def test_detail_is_clamped_to_the_field():
+    stars = StarField(100, seed=0)
+    stars.set_detail(0.5)
+    assert stars.active == 50
+    stars.set_detail(2.0)
+    assert stars.active == 100
+    stars.set_detail(-1.0)
+    assert stars.active == 0
+
+
+def test_only_active_stars_twinkle():
+    stars = StarField(100, seed=0)
+    stars.set_detail(0.25)
+    before = stars.size.copy()
+    for _ in range(200):
+        stars.update()
+    assert not np.array_equal(stars.size[:25], before[:25])
+    assert np.array_equal(stars.size[25:], before[25:])
+
+
+def test_draws_active_stars_in_few_size_batches():
+    stars = StarField(1000, seed=0)
+    for _ in range(500):
+        stars.twinkle()
+    backend = CountingBackend()
+    stars.draw(backend)
+    assert backend.vertices[POINTS] == 1000
+    # One batch per quantized size, plus one for sizes a step past the maximum
+    assert backend.calls[POINTS] <= (STAR_MAX_SIZE - STAR_MIN_SIZE) / STAR_SIZE_QUANTUM + 2
+
+    stars.set_detail(0.1)
+    backend.reset()
+    stars.draw(backend)
+    assert backend.vertices[POINTS] == 100
+
+
+def test_hidden_or_empty_fields_draw_nothing():
+    backend = CountingBackend()
+    StarField(100, draw=False, seed=0).draw(backend)
+    empty = StarField(100, seed=0)
+    empty.set_detail(0.0)
+    empty.draw(backend)
+    assert backend.total_calls == 0
+
+
+def test_seek_keeps_sizes_in_range():
+    stars = StarField(500, seed=0)
+    for ticks in (0, 17.5, 1e3, 1e5):
+        stars.seek(ticks)
+        assert stars.size.min() >= STAR_MIN_SIZE and stars.size.max() <= STAR_MAX_SIZE
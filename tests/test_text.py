@@ -0,0 +1,63 @@
+"""HUD text: the per-string cache and the retained HUD overlay"""
+from src.render import CountingBackend, SoftwareBackend
+from src.render.commands import CommandBuffer
+from src.render.text import TextCache
+from src.scene import Scene
+
+
+class MeasuringBackend(CountingBackend):
+    """Counts text_width() calls, which only happen while the HUD is built"""
+
+    def __init__(self):
+        super().__init__()
+        self.measured = 0
+
+    def text_width(self, text):
+        self.measured += 1
+        return super().text_width(text)
+
+
+def test_cache_builds_each_key_once():
+    cache = TextCache(capacity=4)
+    builds = []
+    for text in ("12", "13", "12", "12"):
+        cache.get(text, lambda: builds.append(text) or text.upper())
+    assert builds == ["12", "13"] and len(cache) == 2
+
+
+def test_cache_evicts_and_releases_the_least_recently_used():
+    released = []
+    cache = TextCache(capacity=2, release=released.append)
+    cache.get("a", lambda: "A")
+    cache.get("b", lambda: "B")
+    cache.get("a", lambda: "A")  # "b" is now the oldest
+    cache.get("c", lambda: "C")
+    assert released == ["B"] and len(cache) == 2
+
+    cache.clear()
+    assert sorted(released) == ["A", "B", "C"] and len(cache) == 0
+
+
+def test_software_text_is_rendered_once_per_string():
+    backend = SoftwareBackend(size=(320, 180))
+    for _ in range(3):
+        backend.text(20, 60, "Time: 12", (1.0, 1.0, 1.0))
+    assert len(backend._masks) == 1
+    backend.text(20, 60, "Time: 13", (1.0, 1.0, 1.0))
+    assert len(backend._masks) == 2
+
+
+def test_hud_is_only_rebuilt_when_its_text_changes():
+    scene = Scene(hour=12, seed=1)
+    target = MeasuringBackend()
+    buffer = CommandBuffer(target)
+
+    for _ in range(3):
+        scene.render_hud(buffer)
+    assert target.measured == 1
+    # Retained, so the label and its shadow are still drawn every frame
+    assert target.texts == 3 * 2
+
+    scene.seek(13)
+    scene.render_hud(buffer)
+    assert target.measured == 2